@@ -3,6 +3,8 @@ import sqlite3
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
 import pandas as pd
 
@@ -12,9 +14,17 @@ sys.path.insert(
 
 from utils.compare_times import compare_execution_times
 from utils.log_decorator import log_execution, logger
+from utils.sqlite_pool import SQLiteReadPool
 
 DB_PATH = "data/inputs/simulated_datalakedb/sales_data.db"
 
+# Colunas numéricas das tabelas de vendas geradas pelo faker_create_datasets
+NUMERIC_COLUMNS = ("quantity", "price", "total")
+
+# Pool criado sob demanda para que importar o módulo não exija o banco pronto
+_pool: Optional[SQLiteReadPool] = None
+_pool_lock = threading.Lock()
+
 
 banner_exercicio_5 = """
 ================================================================================
@@ -28,6 +38,24 @@ banner_exercicio_5 = """
 logger.success(banner_exercicio_5)
 
 
+def get_pool() -> SQLiteReadPool:
+    """
+    Retorna o pool de conexões somente leitura do banco, criando-o se preciso.
+
+    A criação fica sob um lock: sem ele, threads que consultam ao mesmo tempo
+    podiam criar pools diferentes e deixar conexões abertas.
+
+    Returns:
+        SQLiteReadPool: Pool compartilhado pelas threads de consulta.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SQLiteReadPool(DB_PATH)
+    return _pool
+
+
 def get_tables_from_db(db_path: str) -> list[str]:
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
@@ -46,38 +74,151 @@ def query_table(nome_tabela: str):
     Args:
         nome_tabela (str): Nome da tabela a ser consultada.
     """
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query(f"SELECT * FROM {nome_tabela}", conn)
-    conn.close()
+    with get_pool().connection() as conn:
+        df = pd.read_sql_query(f"SELECT * FROM {nome_tabela}", conn)
 
     logger.info(f"📊 Resumo da tabela {nome_tabela}:\n{df.describe()}")
 
 
-tabelas = get_tables_from_db(DB_PATH)
+def build_summary_query(nome_tabela: str) -> str:
+    """
+    Monta a consulta de agregação que resume as colunas numéricas de uma tabela.
+
+    Todas as colunas são agregadas em uma única leitura da tabela (contagem,
+    soma, soma dos quadrados, mínimo e máximo), e média e variância amostral
+    são derivadas desses totais. Para evitar o cancelamento numérico da
+    fórmula soma dos quadrados, os valores são deslocados pelo primeiro valor
+    de cada coluna (algoritmo de dados deslocados), lido sem varrer a tabela.
+
+    Só valores INTEGER ou REAL entram nas estatísticas: bancos antigos
+    gravaram quantity como BLOB (bytes de um numpy.int64), que o SQLite
+    somaria como 0.
+
+    Args:
+        nome_tabela (str): Nome da tabela a ser resumida.
+
+    Returns:
+        str: Consulta SQL que devolve uma linha por coluna numérica.
+    """
+    numerico = "typeof({c}) IN ('integer', 'real')"
+    valores = ", ".join(
+        f"CASE WHEN {numerico.format(c=c)} THEN {c} END AS {c}" for c in NUMERIC_COLUMNS
+    )
+    deslocamentos = ", ".join(
+        f"COALESCE((SELECT {c} FROM {nome_tabela} "
+        f"WHERE {numerico.format(c=c)} LIMIT 1), 0) AS k_{c}"
+        for c in NUMERIC_COLUMNS
+    )
+    agregados = ", ".join(
+        f"COUNT({c}) AS n_{c}, SUM({c} - k_{c}) AS s_{c}, "
+        f"SUM(({c} - k_{c}) * ({c} - k_{c})) AS ss_{c}, "
+        f"MIN({c}) AS min_{c}, MAX({c}) AS max_{c}"
+        for c in NUMERIC_COLUMNS
+    )
+    linhas = " UNION ALL ".join(
+        f"""
+        SELECT
+            '{nome_tabela}' AS tabela,
+            '{c}' AS coluna,
+            n_{c} AS count,
+            s_{c} + n_{c} * k_{c} AS sum,
+            k_{c} + 1.0 * s_{c} / n_{c} AS mean,
+            min_{c} AS min,
+            max_{c} AS max,
+            (ss_{c} - 1.0 * s_{c} * s_{c} / n_{c}) / NULLIF(n_{c} - 1, 0) AS var
+        FROM agregados, deslocamentos
+        """
+        for c in NUMERIC_COLUMNS
+    )
+    return f"""
+        SELECT * FROM (
+            WITH
+                deslocamentos AS MATERIALIZED (SELECT {deslocamentos}),
+                agregados AS MATERIALIZED (
+                    SELECT {agregados}
+                    FROM (SELECT {valores} FROM {nome_tabela}), deslocamentos
+                )
+            {linhas}
+        )
+        """
+
+
+def query_table_summary(nome_tabela: str) -> pd.DataFrame:
+    """
+    Resume uma tabela calculando as estatísticas dentro do próprio SQLite.
+
+    Apenas o resultado agregado (uma linha por coluna numérica) volta para o
+    Python, em vez da tabela inteira como em query_table.
+
+    Args:
+        nome_tabela (str): Nome da tabela a ser consultada.
+
+    Returns:
+        pd.DataFrame: Estatísticas (count, sum, mean, min, max, var) por coluna.
+    """
+    with get_pool().connection() as conn:
+        summary = pd.read_sql_query(build_summary_query(nome_tabela), conn)
+
+    summary = summary.drop(columns="tabela").set_index("coluna").T
+    logger.info(f"📊 Resumo agregado da tabela {nome_tabela}:\n{summary}")
+    return summary
+
+
+def query_all_tables_summary(nomes_tabelas: list[str]) -> pd.DataFrame:
+    """
+    Resume todas as tabelas com uma única consulta de agregação.
+
+    Args:
+        nomes_tabelas (list[str]): Tabelas a serem resumidas.
+
+    Returns:
+        pd.DataFrame: Estatísticas indexadas por (tabela, coluna).
+    """
+    query = " UNION ALL ".join(build_summary_query(t) for t in nomes_tabelas)
+    with get_pool().connection() as conn:
+        summary = pd.read_sql_query(query, conn)
+
+    summary = summary.set_index(["tabela", "coluna"])
+    logger.info(f"📊 Resumo agregado de {len(nomes_tabelas)} tabelas:\n{summary}")
+    return summary
 
 
 @log_execution
-def query_sequencial():
+def query_sequencial(
+    tabelas: list[str], query_func: Callable[[str], object] = query_table
+):
     """
     Consulta todas as tabelas sequencialmente.
+
+    Args:
+        tabelas (list[str]): Tabelas a serem consultadas.
+        query_func (Callable[[str], object]): Função de consulta por tabela
+            (query_table ou query_table_summary).
     """
     start_time = time.time()
     for tabela in tabelas:
-        query_table(tabela)
+        query_func(tabela)
     end_time = time.time()
 
     return end_time - start_time
 
 
 @log_execution
-def query_parallel():
+def query_parallel(
+    tabelas: list[str], query_func: Callable[[str], object] = query_table
+):
     """
     Consulta todas as tabelas em paralelo usando threads.
+
+    Args:
+        tabelas (list[str]): Tabelas a serem consultadas.
+        query_func (Callable[[str], object]): Função de consulta por tabela
+            (query_table ou query_table_summary).
     """
     start_time = time.time()
     threads = []
     for tabela in tabelas:
-        thread = threading.Thread(target=query_table, args=(tabela,))
+        thread = threading.Thread(target=query_func, args=(tabela,))
         thread.start()
         threads.append(thread)
 
@@ -88,12 +229,74 @@ def query_parallel():
     return end_time - start_time
 
 
+@log_execution
+def query_parallel_pooled(
+    tabelas: list[str],
+    query_func: Callable[[str], object] = query_table,
+    n_workers: int = 4,
+    rounds: int = 5,
+):
+    """
+    Consulta as tabelas repetidas vezes com threads reaproveitadas.
+
+    Como as threads do executor vivem durante todas as rodadas, cada uma abre
+    uma única conexão no pool e a reutiliza nas consultas seguintes.
+
+    Args:
+        tabelas (list[str]): Tabelas a serem consultadas.
+        query_func (Callable[[str], object]): Função de consulta por tabela.
+        n_workers (int): Número de threads leitoras.
+        rounds (int): Quantas vezes cada tabela é consultada.
+    """
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        list(executor.map(query_func, tabelas * rounds))
+    end_time = time.time()
+
+    stats = get_pool().stats()
+    logger.info(
+        f"🔗 Pool SQLite: {stats['open_connections']} conexões abertas, "
+        f"{stats['reuses']} reutilizações, {stats['waits']} esperas "
+        f"({stats['wait_time']:.4f}s)"
+    )
+    return end_time - start_time
+
+
+@log_execution
+def query_summary_single(tabelas: list[str]):
+    """
+    Resume todas as tabelas com uma única consulta agregada.
+
+    Args:
+        tabelas (list[str]): Tabelas a serem resumidas.
+    """
+    start_time = time.time()
+    query_all_tables_summary(tabelas)
+    end_time = time.time()
+
+    return end_time - start_time
+
+
 def main():
+    tabelas = get_tables_from_db(DB_PATH)
 
-    tempo_paralelo = query_parallel()
-    tempo_sequencial = query_sequencial()
+    tempo_paralelo = query_parallel(tabelas)
+    tempo_sequencial = query_sequencial(tabelas)
     compare_execution_times(tempo_sequencial, tempo_paralelo)
 
+    logger.info("🧮 Modo resumo: agregação feita dentro do SQLite")
+    tempo_resumo_paralelo = query_parallel(tabelas, query_table_summary)
+    tempo_resumo_unico = query_summary_single(tabelas)
+    logger.info(
+        f"Resumo por tabela em paralelo: {tempo_resumo_paralelo:.4f}s | "
+        f"consulta única: {tempo_resumo_unico:.4f}s"
+    )
+    compare_execution_times(tempo_paralelo, tempo_resumo_paralelo)
+
+    logger.info("♻️  Consultas repetidas com conexões reaproveitadas por thread")
+    query_parallel_pooled(tabelas, query_table_summary)
+    get_pool().close()
+
 
 if __name__ == "__main__":
     main()
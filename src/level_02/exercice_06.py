@@ -1,7 +1,9 @@
 import concurrent.futures
+import mmap
 import os
 import sys
 import time
+from typing import List, NamedTuple, Optional, Tuple
 
 import numpy as np
 
@@ -11,9 +13,36 @@ sys.path.insert(
 
 from utils.compare_times import compare_execution_times
 from utils.log_decorator import logger
+from utils.running_stats import Moments, chunk_moments, combine_moments, moments_std
+from utils.shared_arrays import (
+    SharedArraySpec,
+    attach_shared_array,
+    create_shared_array,
+    peak_rss_mb,
+    release_shared_blocks,
+    share_array,
+)
+
+# Tamanho dos arrays simulados (gerados em main, não na importação)
+N_ARRAYS = 4
+N_ELEMENTS = 20_000_000
+
+MEMMAP_DIR = "./data/outputs/exercicio_06"
+
+
+class MemmapSpec(NamedTuple):
+    """
+    Descritor de um array gravado em arquivo e acessado via np.memmap.
+
+    Attributes:
+        path (str): Caminho do arquivo binário.
+        dtype (str): Tipo dos elementos.
+        length (int): Quantidade de elementos.
+    """
 
-# Simulando grandes arrays (listas) de números
-arrays = [np.random.randn(20_000_000) for _ in range(4)]  # 4 arrays grandes
+    path: str
+    dtype: str
+    length: int
 
 
 def normalize_array(arr: np.ndarray) -> np.ndarray:
@@ -31,6 +60,385 @@ def normalize_array(arr: np.ndarray) -> np.ndarray:
     return (arr - mean) / std
 
 
+def normalize_array_reporting_rss(arr: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Normaliza um array e devolve também o pico de RSS do worker.
+
+    Args:
+        arr (np.ndarray): Array de números.
+
+    Returns:
+        Tuple[np.ndarray, float]: Array normalizado e pico de RSS em MB.
+    """
+    return normalize_array(arr), peak_rss_mb()
+
+
+def normalize_shared_array(spec: SharedArraySpec) -> float:
+    """
+    Normaliza, no próprio bloco de memória compartilhada, o array descrito.
+
+    Apenas o descritor é serializado; média e desvio são calculados sobre a
+    visão do bloco e a normalização é feita in-place, sem arrays temporários
+    do tamanho da entrada.
+
+    Args:
+        spec (SharedArraySpec): Descritor do array compartilhado.
+
+    Returns:
+        float: Pico de RSS do worker em MB.
+    """
+    shm, arr = attach_shared_array(spec)
+    try:
+        mean = arr.mean()
+        std = arr.std()
+        arr -= mean
+        arr /= std
+    finally:
+        del arr
+        shm.close()
+    return peak_rss_mb()
+
+
+def chunk_bounds(length: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Divide o intervalo [0, length) em blocos contíguos de até chunk_size elementos.
+
+    Args:
+        length (int): Tamanho do array.
+        chunk_size (int): Tamanho máximo de cada bloco.
+
+    Returns:
+        List[Tuple[int, int]]: Pares (início, fim) de cada bloco.
+    """
+    return [
+        (start, min(start + chunk_size, length))
+        for start in range(0, length, chunk_size)
+    ]
+
+
+def shared_chunk_moments(spec: SharedArraySpec, start: int, stop: int) -> Moments:
+    """
+    Primeira passada: calcula (count, mean, M2) de um bloco do array compartilhado.
+
+    Args:
+        spec (SharedArraySpec): Descritor do array compartilhado.
+        start (int): Índice inicial do bloco.
+        stop (int): Índice final (exclusivo) do bloco.
+
+    Returns:
+        Moments: Estado parcial do bloco.
+    """
+    shm, arr = attach_shared_array(spec)
+    try:
+        return chunk_moments(arr[start:stop])
+    finally:
+        del arr
+        shm.close()
+
+
+def shared_chunk_normalize(
+    spec: SharedArraySpec, start: int, stop: int, mean: float, std: float
+) -> None:
+    """
+    Segunda passada: normaliza in-place um bloco do array compartilhado.
+
+    Args:
+        spec (SharedArraySpec): Descritor do array compartilhado.
+        start (int): Índice inicial do bloco.
+        stop (int): Índice final (exclusivo) do bloco.
+        mean (float): Média global do array.
+        std (float): Desvio padrão global do array.
+    """
+    shm, arr = attach_shared_array(spec)
+    try:
+        arr[start:stop] -= mean
+        arr[start:stop] /= std
+    finally:
+        del arr
+        shm.close()
+
+
+def chunked_normalize(
+    spec: SharedArraySpec,
+    n_workers: Optional[int] = None,
+    chunk_size: int = 4_000_000,
+) -> None:
+    """
+    Normaliza in-place um único array grande já em shared_memory, em duas passadas.
+
+    Na primeira passada cada worker calcula (count, mean, M2) de um bloco e os
+    estados são combinados pela fórmula de Chan; na segunda, cada worker
+    normaliza o seu bloco in-place. Além do próprio array, a única memória
+    extra são os estados parciais de cada bloco. O bloco compartilhado
+    pertence a quem chama, que lê o resultado e o libera.
+
+    Args:
+        spec (SharedArraySpec): Descritor do array compartilhado.
+        n_workers (int): Número de processos (padrão: núcleos disponíveis).
+        chunk_size (int): Elementos por bloco.
+    """
+    bounds = chunk_bounds(int(np.prod(spec.shape)), chunk_size)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+        partials = executor.map(
+            shared_chunk_moments,
+            [spec] * len(bounds),
+            *zip(*bounds),
+        )
+        moments = combine_moments(partials)
+        mean, std = moments.mean, moments_std(moments)
+
+        list(
+            executor.map(
+                shared_chunk_normalize,
+                [spec] * len(bounds),
+                *zip(*bounds),
+                [mean] * len(bounds),
+                [std] * len(bounds),
+            )
+        )
+
+
+def chunked_processing(arrays, dtype: str = "float64"):
+    """
+    Processa os arrays um a um, paralelizando cada array entre os núcleos.
+
+    Cada array é copiado uma vez para um bloco compartilhado (com dtype="float32"
+    o bloco ocupa metade da memória; os acumuladores continuam em float64),
+    normalizado in-place e liberado antes do próximo.
+
+    Args:
+        arrays (list[np.ndarray]): Lista de arrays para normalizar.
+        dtype (str): Tipo usado na normalização ("float64" ou "float32").
+
+    Returns:
+        float: Tempo total de execução em segundos (sem a cópia inicial).
+    """
+    total_time = 0.0
+    for arr in arrays:
+        shm, shared, spec = create_shared_array(arr.shape, dtype)
+        try:
+            shared[...] = arr
+            start_time = time.time()
+            chunked_normalize(spec)
+            total_time += time.time() - start_time
+        finally:
+            del shared
+            release_shared_blocks([shm])
+    total_mb = sum(arr.size for arr in arrays) * np.dtype(dtype).itemsize / 1024**2
+    logger.info(f"Tempo paralelo em blocos ({dtype}): {total_time:.2f} segundos")
+    logger.info(f"📈 Blocos em RAM ({dtype}): {total_mb / total_time:.1f} MB/s")
+    return total_time
+
+
+def page_aligned_chunk_size(chunk_size: int, dtype: str) -> int:
+    """
+    Arredonda o tamanho do bloco para um múltiplo da granularidade de mmap.
+
+    Assim cada worker lê e escreve páginas inteiras do arquivo, sem dividir
+    uma mesma página entre dois processos.
+
+    Args:
+        chunk_size (int): Tamanho desejado, em elementos.
+        dtype (str): Tipo dos elementos.
+
+    Returns:
+        int: Tamanho do bloco alinhado, em elementos.
+    """
+    page_elements = mmap.ALLOCATIONGRANULARITY // np.dtype(dtype).itemsize
+    return max(page_elements, chunk_size // page_elements * page_elements)
+
+
+def create_memmap_input(
+    path: str,
+    length: int,
+    dtype: str = "float64",
+    chunk_size: int = 4_000_000,
+    seed: int = 42,
+) -> MemmapSpec:
+    """
+    Gera um arquivo com valores aleatórios bloco a bloco, sem ocupar RAM inteira.
+
+    Args:
+        path (str): Caminho do arquivo de saída.
+        length (int): Quantidade de elementos.
+        dtype (str): Tipo dos elementos.
+        chunk_size (int): Elementos gerados por vez.
+        seed (int): Semente do gerador.
+
+    Returns:
+        MemmapSpec: Descritor do arquivo gerado.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rng = np.random.default_rng(seed)
+    data = np.memmap(path, dtype=dtype, mode="w+", shape=(length,))
+    for start, stop in chunk_bounds(length, chunk_size):
+        data[start:stop] = rng.standard_normal(stop - start)
+        data.flush()
+    del data
+    return MemmapSpec(path, np.dtype(dtype).str, length)
+
+
+def memmap_chunk_moments(spec: MemmapSpec, start: int, stop: int) -> Moments:
+    """
+    Primeira passada out-of-core: calcula (count, mean, M2) de um trecho do arquivo.
+
+    Args:
+        spec (MemmapSpec): Descritor do arquivo de entrada.
+        start (int): Índice inicial do trecho.
+        stop (int): Índice final (exclusivo) do trecho.
+
+    Returns:
+        Moments: Estado parcial do trecho.
+    """
+    data = np.memmap(spec.path, dtype=spec.dtype, mode="r", shape=(spec.length,))
+    try:
+        return chunk_moments(data[start:stop])
+    finally:
+        del data
+
+
+def memmap_chunk_normalize(
+    source: MemmapSpec,
+    target: MemmapSpec,
+    start: int,
+    stop: int,
+    mean: float,
+    std: float,
+) -> None:
+    """
+    Segunda passada out-of-core: normaliza um trecho direto no arquivo de saída.
+
+    Args:
+        source (MemmapSpec): Descritor do arquivo de entrada.
+        target (MemmapSpec): Descritor do arquivo de saída.
+        start (int): Índice inicial do trecho.
+        stop (int): Índice final (exclusivo) do trecho.
+        mean (float): Média global.
+        std (float): Desvio padrão global.
+    """
+    data = np.memmap(source.path, dtype=source.dtype, mode="r", shape=(source.length,))
+    out = np.memmap(target.path, dtype=target.dtype, mode="r+", shape=(target.length,))
+    try:
+        np.subtract(data[start:stop], mean, out=out[start:stop])
+        out[start:stop] /= std
+        out.flush()
+    finally:
+        del data, out
+
+
+def memmap_normalize(
+    source: MemmapSpec,
+    output_path: str,
+    n_workers: Optional[int] = None,
+    chunk_size: int = 4_000_000,
+) -> MemmapSpec:
+    """
+    Normaliza um array maior que a memória, lendo e escrevendo arquivos np.memmap.
+
+    Os workers recebem apenas descritores e processam trechos alinhados a
+    páginas; o RSS de cada processo fica limitado ao tamanho do trecho.
+
+    Args:
+        source (MemmapSpec): Descritor do arquivo de entrada.
+        output_path (str): Caminho do arquivo normalizado.
+        n_workers (int): Número de processos (padrão: núcleos disponíveis).
+        chunk_size (int): Elementos por trecho (arredondado para páginas).
+
+    Returns:
+        MemmapSpec: Descritor do arquivo normalizado.
+    """
+    target = MemmapSpec(output_path, source.dtype, source.length)
+    np.memmap(target.path, dtype=target.dtype, mode="w+", shape=(target.length,))
+
+    chunk_size = page_aligned_chunk_size(chunk_size, source.dtype)
+    bounds = chunk_bounds(source.length, chunk_size)
+    starts, stops = zip(*bounds)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+        moments = combine_moments(
+            executor.map(memmap_chunk_moments, [source] * len(bounds), starts, stops)
+        )
+        mean, std = moments.mean, moments_std(moments)
+
+        list(
+            executor.map(
+                memmap_chunk_normalize,
+                [source] * len(bounds),
+                [target] * len(bounds),
+                starts,
+                stops,
+                [mean] * len(bounds),
+                [std] * len(bounds),
+            )
+        )
+
+    return target
+
+
+def memmap_processing(n_arrays: int = N_ARRAYS, length: int = N_ELEMENTS):
+    """
+    Normaliza arrays gravados em disco via np.memmap e registra a vazão.
+
+    Os arquivos .bin de entrada e saída são apagados ao final, mesmo em caso
+    de erro.
+
+    Args:
+        n_arrays (int): Quantidade de arquivos de entrada.
+        length (int): Elementos por arquivo.
+
+    Returns:
+        float: Tempo total de execução em segundos (sem gerar as entradas).
+    """
+    input_paths = [os.path.join(MEMMAP_DIR, f"input_{i}.bin") for i in range(n_arrays)]
+    output_paths = [
+        os.path.join(MEMMAP_DIR, f"output_{i}.bin") for i in range(n_arrays)
+    ]
+    try:
+        sources = [
+            create_memmap_input(path, length, seed=42 + i)
+            for i, path in enumerate(input_paths)
+        ]
+
+        start_time = time.time()
+        for source, output_path in zip(sources, output_paths):
+            memmap_normalize(source, output_path)
+        end_time = time.time()
+    finally:
+        # Entradas e saídas só existem para a medição e ocupam GBs em disco
+        for path in input_paths + output_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    total_time = end_time - start_time
+    total_mb = n_arrays * length * np.dtype(sources[0].dtype).itemsize / 1024**2
+    logger.info(f"Tempo paralelo (np.memmap): {total_time:.2f} segundos")
+    logger.info(
+        f"📈 np.memmap: {total_mb / total_time:.1f} MB/s | pico RSS principal: "
+        f"{peak_rss_mb():.1f} MB | pico RSS workers: {peak_rss_mb(children=True):.1f} MB"
+    )
+    return total_time
+
+
+def log_throughput(label: str, arrays, total_time: float, worker_rss) -> None:
+    """
+    Registra vazão e pico de memória de um modo de processamento.
+
+    Args:
+        label (str): Nome do modo.
+        arrays (list[np.ndarray]): Arrays processados.
+        total_time (float): Tempo total em segundos.
+        worker_rss (list[float]): Pico de RSS de cada worker em MB.
+    """
+    total_mb = sum(arr.nbytes for arr in arrays) / (1024 * 1024)
+    throughput = total_mb / total_time if total_time else float("inf")
+    logger.info(
+        f"📈 {label}: {throughput:.1f} MB/s | pico RSS worker: "
+        f"{max(worker_rss, default=0.0):.1f} MB | pico RSS principal: "
+        f"{peak_rss_mb():.1f} MB"
+    )
+
+
 def sequential_processing(arrays):
     """
     Processa os arrays sequencialmente.
@@ -63,14 +471,55 @@ def parallel_processing(arrays):
     """
     start_time = time.time()
     with concurrent.futures.ProcessPoolExecutor() as executor:
-        results = list(executor.map(normalize_array, arrays))
+        results = list(executor.map(normalize_array_reporting_rss, arrays))
     end_time = time.time()
     total_time = end_time - start_time
     logger.info(f"Tempo paralelo: {total_time:.2f} segundos")
+    log_throughput("Pickle", arrays, total_time, [rss for _, rss in results])
+    return total_time
+
+
+def shared_memory_processing(arrays):
+    """
+    Processa os arrays em paralelo trafegando apenas descritores de shared_memory.
+
+    Os arrays são copiados uma única vez para blocos compartilhados e cada
+    worker normaliza o seu bloco in-place, sem pickle de ida nem de volta.
+
+    Args:
+        arrays (list[np.ndarray]): Lista de arrays para normalizar.
+
+    Returns:
+        float: Tempo total de execução em segundos (sem a cópia inicial).
+    """
+    staging_start = time.time()
+    blocks, views, specs = [], [], []
+    for arr in arrays:
+        shm, view, spec = share_array(arr)
+        blocks.append(shm)
+        views.append(view)
+        specs.append(spec)
+    logger.info(f"Cópia para shared_memory: {time.time() - staging_start:.2f} segundos")
+
+    try:
+        start_time = time.time()
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            worker_rss = list(executor.map(normalize_shared_array, specs))
+        end_time = time.time()
+    finally:
+        del views
+        release_shared_blocks(blocks)
+
+    total_time = end_time - start_time
+    logger.info(f"Tempo paralelo (shared_memory): {total_time:.2f} segundos")
+    log_throughput("Shared memory", arrays, total_time, worker_rss)
     return total_time
 
 
 def main():
+    # Simulando grandes arrays (listas) de números
+    arrays = [np.random.randn(N_ELEMENTS) for _ in range(N_ARRAYS)]
+
     logger.info("Iniciando processamento sequencial...")
     seq_time = sequential_processing(arrays)
 
@@ -79,6 +528,22 @@ def main():
 
     compare_execution_times(seq_time, parallel_time)
 
+    logger.info("Iniciando processamento paralelo com shared_memory...")
+    shared_time = shared_memory_processing(arrays)
+
+    compare_execution_times(parallel_time, shared_time)
+
+    logger.info("Iniciando normalização em blocos dentro de cada array...")
+    chunked_time = chunked_processing(arrays)
+    chunked_processing(arrays, dtype="float32")
+
+    compare_execution_times(seq_time, chunked_time)
+
+    logger.info("Iniciando normalização out-of-core com np.memmap...")
+    memmap_time = memmap_processing()
+
+    compare_execution_times(chunked_time, memmap_time)
+
 
 if __name__ == "__main__":
     main()
@@ -1,17 +1,21 @@
 import os
 import sys
 import time
+import tracemalloc
 from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import Callable, List
+from typing import Callable, List, Optional
 
+import numpy as np
 import pandas as pd
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 )
 
+from utils.column_expressions import evaluate_columns
 from utils.compare_times import compare_execution_times
 from utils.log_decorator import logger
+from utils.parallel_apply import parallel_apply
 
 banner_exercise_7 = """
 ================================================================================
@@ -24,6 +28,12 @@ função de transformação em cada parte.
 
 logger.success(banner_exercise_7)
 
+# Mesmas colunas de complex_function, declaradas para o avaliador em blocos
+COMPLEX_EXPRESSIONS = {"sum": "A + B", "product": "A * B"}
+
+# Expressão com vários operadores, onde pandas cria um temporário por operação
+SCORE_EXPRESSIONS = {"score": "sqrt(A * A + B * B) * 0.5 - A / (abs(B) + 1)"}
+
 
 def complex_function(df_part: pd.DataFrame) -> pd.DataFrame:
     """
@@ -43,6 +53,39 @@ def complex_function(df_part: pd.DataFrame) -> pd.DataFrame:
     return df_part
 
 
+def complex_function_fused(df_part: pd.DataFrame) -> pd.DataFrame:
+    """
+    Versão de complex_function que calcula as colunas com o avaliador em blocos,
+    sem temporários do tamanho da partição.
+
+    Args:
+        df_part (pd.DataFrame): Partição do DataFrame.
+
+    Returns:
+        pd.DataFrame: DataFrame transformado.
+    """
+    time.sleep(1)  # Simula processamento custoso
+
+    return evaluate_columns(df_part, COMPLEX_EXPRESSIONS)
+
+
+def wide_function(df_part: pd.DataFrame) -> pd.DataFrame:
+    """
+    Transformação vetorizada para DataFrames largos: agrega todas as colunas
+    numéricas de cada linha e cria colunas derivadas.
+
+    Args:
+        df_part (pd.DataFrame): Partição do DataFrame.
+
+    Returns:
+        pd.DataFrame: DataFrame transformado.
+    """
+    values = df_part.to_numpy()
+    df_part["row_sum"] = values.sum(axis=1)
+    df_part["row_norm"] = np.sqrt((values * values).sum(axis=1))
+    return df_part
+
+
 def split_dataframe(df: pd.DataFrame, n_parts: int) -> List[pd.DataFrame]:
     """
     Divide um DataFrame em n partes aproximadamente iguais.
@@ -97,6 +140,37 @@ def apply_in_parallel(
     return total_time
 
 
+def apply_with_engine(
+    df: pd.DataFrame,
+    func: Callable[[pd.DataFrame], pd.DataFrame],
+    n_partitions: Optional[int] = None,
+) -> float:
+    """
+    Aplica a função em paralelo com o motor parallel_apply (memória compartilhada).
+
+    Fora da medição, o resultado é conferido com a aplicação sequencial de
+    func sobre uma cópia do DataFrame.
+
+    Args:
+        df (pd.DataFrame): DataFrame original.
+        func (Callable[[pd.DataFrame], pd.DataFrame]): Função a ser aplicada.
+        n_partitions (int): Número de partições (None = automático).
+
+    Returns:
+        float: Tempo total de execução em segundos.
+    """
+    start_time = time.time()
+    df_result, _ = parallel_apply(df, func, n_partitions=n_partitions)
+    end_time = time.time()
+    total_time = end_time - start_time
+
+    if df_result.equals(func(df.copy())):
+        logger.info("✅ parallel_apply: resultado igual ao sequencial")
+    else:
+        logger.error("❌ parallel_apply: resultado diferente do sequencial")
+    return total_time
+
+
 def apply_sequentially(
     df: pd.DataFrame, func: Callable[[pd.DataFrame], pd.DataFrame]
 ) -> float:
@@ -117,6 +191,52 @@ def apply_sequentially(
     return total_time
 
 
+def compare_fused_transform(n_rows: int = 10_000_000) -> None:
+    """
+    Compara operações pandas encadeadas com o avaliador de expressões em blocos.
+
+    O pico de memória de cada modo é medido com tracemalloc (o NumPy registra
+    suas alocações nele), descontando a memória já ocupada pelo DataFrame.
+
+    Args:
+        n_rows (int): Linhas do DataFrame de teste.
+    """
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(
+        {"A": rng.standard_normal(n_rows), "B": rng.standard_normal(n_rows)}
+    )
+    tracemalloc.start()
+
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    start_time = time.time()
+    df_fused = evaluate_columns(df.copy(), {**COMPLEX_EXPRESSIONS, **SCORE_EXPRESSIONS})
+    fused_time = time.time() - start_time
+    fused_peak = tracemalloc.get_traced_memory()[1] - baseline
+    del df_fused
+
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    start_time = time.time()
+    df_pandas = df.copy()
+    df_pandas["sum"] = df_pandas["A"] + df_pandas["B"]
+    df_pandas["product"] = df_pandas["A"] * df_pandas["B"]
+    df_pandas["score"] = np.sqrt(
+        df_pandas["A"] * df_pandas["A"] + df_pandas["B"] * df_pandas["B"]
+    ) * 0.5 - df_pandas["A"] / (df_pandas["B"].abs() + 1)
+    pandas_time = time.time() - start_time
+    pandas_peak = tracemalloc.get_traced_memory()[1] - baseline
+    del df_pandas
+
+    tracemalloc.stop()
+    logger.info(
+        f"🧮 {n_rows:,} linhas | pandas: {pandas_time:.2f}s "
+        f"(pico {pandas_peak / 1024**2:.0f} MB) | blocos: {fused_time:.2f}s "
+        f"(pico {fused_peak / 1024**2:.0f} MB)"
+    )
+    compare_execution_times(pandas_time, fused_time)
+
+
 def main() -> None:
     df = pd.DataFrame({"A": range(1000), "B": range(1000, 2000)})
 
@@ -124,6 +244,24 @@ def main() -> None:
     sequential_time = apply_sequentially(df, complex_function)
     compare_execution_times(sequential_time, parallel_time)
 
+    logger.info("🚀 Motor parallel_apply com memória compartilhada...")
+    engine_time = apply_with_engine(df, complex_function, n_partitions=4)
+    compare_execution_times(parallel_time, engine_time)
+
+    logger.info("📐 DataFrame largo: pickle + sort_index vs parallel_apply...")
+    rng = np.random.default_rng(42)
+    df_wide = pd.DataFrame(
+        rng.standard_normal((2_000_000, 20)), columns=[f"c{i}" for i in range(20)]
+    )
+    wide_parallel_time = apply_in_parallel(df_wide, wide_function)
+    wide_engine_time = apply_with_engine(df_wide, wide_function)
+    compare_execution_times(wide_parallel_time, wide_engine_time)
+
+    logger.info("🧮 Expressões de colunas avaliadas em blocos...")
+    fused_time = apply_sequentially(df, complex_function_fused)
+    compare_execution_times(sequential_time, fused_time)
+    compare_fused_transform()
+
 
 if __name__ == "__main__":
     main()
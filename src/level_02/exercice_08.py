@@ -1,10 +1,15 @@
 import os
+import shutil
 import sys
 import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
@@ -41,6 +46,136 @@ def convert_parquet_to_csv(parquet_path: str, csv_path: str) -> str:
     return csv_path
 
 
+def convert_parquet_to_csv_streaming(
+    parquet_path: str, csv_path: str, batch_size: int = 65_536
+) -> str:
+    """
+    Converte Parquet para CSV lote a lote, com memória constante.
+
+    Em vez de carregar o arquivo inteiro num DataFrame, lê record batches e os
+    grava com o escritor CSV do pyarrow; o consumo de memória depende do
+    tamanho do lote, não do arquivo.
+
+    Args:
+        parquet_path (str): Caminho do arquivo Parquet.
+        csv_path (str): Caminho onde o arquivo CSV será salvo.
+        batch_size (int): Linhas por lote.
+
+    Returns:
+        str: Caminho do arquivo CSV gerado.
+    """
+    parquet_file = pq.ParquetFile(parquet_path)
+    with pa_csv.CSVWriter(csv_path, parquet_file.schema_arrow) as writer:
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            writer.write_batch(batch)
+    return csv_path
+
+
+def convert_row_groups_to_csv(
+    parquet_path: str,
+    csv_path: str,
+    row_groups: List[int],
+    include_header: bool,
+    batch_size: int = 65_536,
+) -> str:
+    """
+    Converte apenas alguns row groups de um Parquet para um pedaço de CSV.
+
+    Args:
+        parquet_path (str): Caminho do arquivo Parquet.
+        csv_path (str): Caminho do pedaço CSV.
+        row_groups (List[int]): Row groups a converter, em ordem.
+        include_header (bool): Se o pedaço deve começar com o cabeçalho.
+        batch_size (int): Linhas por lote.
+
+    Returns:
+        str: Caminho do pedaço CSV gerado.
+    """
+    parquet_file = pq.ParquetFile(parquet_path)
+    options = pa_csv.WriteOptions(include_header=include_header)
+    with pa_csv.CSVWriter(
+        csv_path, parquet_file.schema_arrow, write_options=options
+    ) as writer:
+        for batch in parquet_file.iter_batches(
+            batch_size=batch_size, row_groups=row_groups
+        ):
+            writer.write_batch(batch)
+    return csv_path
+
+
+def convert_large_parquet_parallel(
+    parquet_path: str, csv_path: str, n_workers: int = 4
+) -> str:
+    """
+    Converte um único Parquet grande dividindo seus row groups entre processos.
+
+    Cada processo grava um pedaço CSV com um intervalo contíguo de row groups;
+    os pedaços são concatenados na ordem original, e só o primeiro leva o
+    cabeçalho. Se algum processo falhar, os pedaços e o CSV parcial são
+    apagados antes de o erro ser propagado.
+
+    Args:
+        parquet_path (str): Caminho do arquivo Parquet.
+        csv_path (str): Caminho onde o arquivo CSV será salvo.
+        n_workers (int): Número de processos paralelos.
+
+    Returns:
+        str: Caminho do arquivo CSV gerado.
+    """
+    num_row_groups = pq.ParquetFile(parquet_path).num_row_groups
+    groups = [
+        chunk.tolist()
+        for chunk in np.array_split(np.arange(num_row_groups), n_workers)
+        if chunk.size
+    ]
+    part_paths = [f"{csv_path}.part{i:04d}" for i in range(len(groups))]
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(
+                    convert_row_groups_to_csv, parquet_path, part_path, group, i == 0
+                )
+                for i, (part_path, group) in enumerate(zip(part_paths, groups))
+            ]
+            for future in futures:
+                future.result()
+
+        with open(csv_path, "wb") as output:
+            for part_path in part_paths:
+                with open(part_path, "rb") as part:
+                    shutil.copyfileobj(part, output, length=1024 * 1024)
+                os.remove(part_path)
+    except BaseException:
+        for path in part_paths + [csv_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    return csv_path
+
+
+def build_large_parquet(
+    parquet_files: List[str], output_path: str, repeat: int = 200
+) -> str:
+    """
+    Gera um Parquet grande, com vários row groups, repetindo os arquivos de entrada.
+
+    Args:
+        parquet_files (List[str]): Arquivos Parquet de origem.
+        output_path (str): Caminho do arquivo gerado.
+        repeat (int): Quantas vezes cada arquivo é repetido.
+
+    Returns:
+        str: Caminho do arquivo gerado.
+    """
+    table = pa.concat_tables([pq.read_table(path) for path in parquet_files])
+    with pq.ParquetWriter(output_path, table.schema) as writer:
+        for _ in range(repeat):
+            writer.write_table(table)
+    return output_path
+
+
 def parallel_conversion(
     parquet_files: List[str], output_dir: str, n_workers: int = 4
 ) -> float:
@@ -74,6 +209,38 @@ def parallel_conversion(
     return end_time - start_time
 
 
+def streaming_conversion(parquet_files: List[str], output_dir: str) -> float:
+    """
+    Converte arquivos Parquet para CSV em paralelo com a conversão por lotes.
+
+    Args:
+        parquet_files (List[str]): Lista de caminhos de arquivos Parquet.
+        output_dir (str): Diretório onde os CSVs serão salvos.
+
+    Returns:
+        float: Tempo total de execução em segundos.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start_time = time.time()
+
+    with ProcessPoolExecutor() as executor:
+        futures = []
+        for parquet_file in parquet_files:
+            filename = os.path.splitext(os.path.basename(parquet_file))[0] + ".csv"
+            csv_path = os.path.join(output_dir, filename)
+            futures.append(
+                executor.submit(
+                    convert_parquet_to_csv_streaming, parquet_file, csv_path
+                )
+            )
+
+        for future in as_completed(futures):
+            future.result()
+
+    end_time = time.time()
+    return end_time - start_time
+
+
 def sequential_conversion(parquet_files: List[str], output_dir: str) -> float:
     """
     Converte arquivos Parquet para CSV de forma sequencial.
@@ -117,6 +284,34 @@ def main() -> None:
 
     compare_execution_times(sequential_time, parallel_time)
 
+    logger.info("🌊 Convertendo arquivos Parquet para CSV em lotes (pyarrow)...")
+    streaming_time = streaming_conversion(
+        parquet_files, "./data/outputs/exercicio_08/output_csv_streaming"
+    )
+    compare_execution_times(parallel_time, streaming_time)
+
+    logger.info("🧩 Dividindo os row groups de um único Parquet grande...")
+    large_dir = "./data/outputs/exercicio_08/large"
+    os.makedirs(large_dir, exist_ok=True)
+    try:
+        large_parquet = build_large_parquet(
+            parquet_files, os.path.join(large_dir, "sales_large.parquet")
+        )
+
+        start_time = time.time()
+        convert_parquet_to_csv(large_parquet, os.path.join(large_dir, "pandas.csv"))
+        pandas_time = time.time() - start_time
+
+        start_time = time.time()
+        convert_large_parquet_parallel(
+            large_parquet, os.path.join(large_dir, "row_groups.csv"), n_workers
+        )
+        row_groups_time = time.time() - start_time
+    finally:
+        # O Parquet grande e os dois CSVs só existem para a medição
+        shutil.rmtree(large_dir, ignore_errors=True)
+    compare_execution_times(pandas_time, row_groups_time)
+
 
 if __name__ == "__main__":
     main()
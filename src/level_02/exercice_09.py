@@ -1,5 +1,5 @@
 import os
-import string
+import shutil
 import sys
 import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
@@ -7,13 +7,21 @@ from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 )
 
 from utils.compare_times import compare_execution_times
+from utils.grouped_bincount import bincount_groupby
 from utils.log_decorator import logger
+from utils.running_stats import (
+    combine_group_states,
+    finalize_group_states,
+    partial_group_states,
+)
+from utils.synthetic_data import generate_synthetic_data, write_synthetic_partitions
 
 banner_exercise_9 = """
 ================================================================================
@@ -26,36 +34,33 @@ calcular soma, média e desvio padrão por grupo.
 
 logger.info(banner_exercise_9)
 
+PARTITIONS_DIR = "./data/outputs/exercicio_09/partitions"
+
 
-def generate_synthetic_data(n_rows: int = 10_000_000) -> pd.DataFrame:
+def aggregate_group(df_part: pd.DataFrame) -> pd.DataFrame:
     """
-    Gera um DataFrame com dados sintéticos para simular agregações pesadas.
+    Realiza agregações de soma, média e desvio padrão por grupo em uma partição.
 
     Args:
-        n_rows (int): Número de linhas do DataFrame.
+        df_part (pd.DataFrame): Parte do DataFrame original.
 
     Returns:
-        pd.DataFrame: DataFrame com colunas de grupo e valores numéricos.
+        pd.DataFrame: Resultados agregados da partição.
     """
-    np.random.seed(42)  # Para reprodutibilidade
-    group_labels = np.random.choice(list(string.ascii_uppercase[:5]), size=n_rows)
-    values = np.random.rand(n_rows) * 100
-
-    df = pd.DataFrame({"group": group_labels, "value": values})
-    return df
+    return df_part.groupby("group", observed=True)["value"].agg(["sum", "mean", "std"])
 
 
-def aggregate_group(df_part: pd.DataFrame) -> pd.DataFrame:
+def aggregate_group_state(df_part: pd.DataFrame) -> pd.DataFrame:
     """
-    Realiza agregações de soma, média e desvio padrão por grupo em uma partição.
+    Calcula o estado parcial combinável (count, sum, mean, M2, min, max) por grupo.
 
     Args:
         df_part (pd.DataFrame): Parte do DataFrame original.
 
     Returns:
-        pd.DataFrame: Resultados agregados da partição.
+        pd.DataFrame: Estado parcial por grupo da partição.
     """
-    return df_part.groupby("group")["value"].agg(["sum", "mean", "std"])
+    return partial_group_states(df_part, "group", "value")
 
 
 def split_dataframe(df: pd.DataFrame, n_parts: int) -> List[pd.DataFrame]:
@@ -96,22 +101,54 @@ def apply_aggregation_parallel(
     results = []
 
     with ProcessPoolExecutor(max_workers=n_workers) as executor:
-        futures = [executor.submit(aggregate_group, part) for part in parts]
+        futures = [executor.submit(aggregate_group_state, part) for part in parts]
         for future in as_completed(futures):
             results.append(future.result())
 
-    df_result = (
-        pd.concat(results)
-        .groupby("group")
-        .agg(
-            {
-                "sum": "sum",
-                "mean": "mean",
-                "std": "mean",  # média dos desvios padrão por grupo
-            }
-        )
-        .reset_index()
-    )
+    # Combina os estados parciais (Chan/Welford) em vez de tirar média de médias
+    states = combine_group_states(results)
+    df_result = finalize_group_states(states).rename_axis("group").reset_index()
+
+    end_time = time.time()
+    return df_result, end_time - start_time
+
+
+def aggregate_partition_file(path: str) -> pd.DataFrame:
+    """
+    Lê uma partição Parquet e calcula o seu estado parcial por grupo.
+
+    Args:
+        path (str): Arquivo da partição.
+
+    Returns:
+        pd.DataFrame: Estado parcial por grupo da partição.
+    """
+    return aggregate_group_state(pq.read_table(path).to_pandas())
+
+
+def apply_aggregation_partitions(
+    partition_paths: List[str], n_workers: int = 4
+) -> Tuple[pd.DataFrame, float]:
+    """
+    Agrega partições Parquet sem carregar o conjunto inteiro na memória.
+
+    Cada worker lê uma partição por vez e devolve só o estado parcial por
+    grupo, combinado ao final como em apply_aggregation_parallel.
+
+    Args:
+        partition_paths (List[str]): Arquivos das partições.
+        n_workers (int): Número de processos paralelos.
+
+    Returns:
+        Tuple[pd.DataFrame, float]: DataFrame agregado e tempo de execução.
+    """
+    start_time = time.time()
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(aggregate_partition_file, partition_paths))
+
+    states = combine_group_states(results)
+    df_result = finalize_group_states(states).rename_axis("group").reset_index()
 
     end_time = time.time()
     return df_result, end_time - start_time
@@ -128,14 +165,71 @@ def apply_aggregation_sequential(df: pd.DataFrame) -> Tuple[pd.DataFrame, float]
         Tuple[pd.DataFrame, float]: DataFrame agregado e tempo de execução.
     """
     start_time = time.time()
-    df_result = df.groupby("group")["value"].agg(["sum", "mean", "std"]).reset_index()
+    df_result = (
+        df.groupby("group", observed=True)["value"]
+        .agg(["sum", "mean", "std"])
+        .reset_index()
+    )
+    end_time = time.time()
+    return df_result, end_time - start_time
+
+
+def apply_aggregation_bincount(
+    df: pd.DataFrame, n_workers: int = 4
+) -> Tuple[pd.DataFrame, float]:
+    """
+    Agrega por grupo com códigos inteiros e np.bincount, em blocos paralelos.
+
+    Args:
+        df (pd.DataFrame): DataFrame original (coluna group preferencialmente categórica).
+        n_workers (int): Número de processos paralelos.
+
+    Returns:
+        Tuple[pd.DataFrame, float]: DataFrame agregado e tempo de execução.
+    """
+    start_time = time.time()
+    df_result = bincount_groupby(df["group"], df["value"], n_workers=n_workers)
+    df_result = df_result[["sum", "mean", "std"]].reset_index()
     end_time = time.time()
     return df_result, end_time - start_time
 
 
+def check_results_match(
+    parallel_result: pd.DataFrame,
+    sequential_result: pd.DataFrame,
+    rtol: float = 1e-9,
+) -> bool:
+    """
+    Confere se as agregações paralela e sequencial coincidem, com tolerância numérica.
+
+    Args:
+        parallel_result (pd.DataFrame): Resultado de apply_aggregation_parallel.
+        sequential_result (pd.DataFrame): Resultado de apply_aggregation_sequential.
+        rtol (float): Tolerância relativa.
+
+    Returns:
+        bool: True se grupos, somas, médias e desvios coincidem.
+    """
+    left = parallel_result.sort_values("group").reset_index(drop=True)
+    right = sequential_result.sort_values("group").reset_index(drop=True)
+    same_groups = left["group"].astype(str).equals(right["group"].astype(str))
+    same_values = same_groups and all(
+        np.allclose(left[col], right[col], rtol=rtol, equal_nan=True)
+        for col in ("sum", "mean", "std")
+    )
+
+    if same_values:
+        logger.success("✅ Agregação paralela coincide com groupby().agg()")
+    else:
+        logger.error("❌ Agregação paralela diverge de groupby().agg()")
+    return same_values
+
+
 def main() -> None:
-    logger.info("🔧 Gerando dados sintéticos...")
+    logger.info("🔧 Gerando dados sintéticos em paralelo...")
+    start_time = time.time()
     df = generate_synthetic_data()
+    logger.info(f"Dados gerados em {time.time() - start_time:.2f} segundos")
 
     logger.info("⚙️  Agregando com multiprocessing...")
     parallel_result, parallel_time = apply_aggregation_parallel(df)
@@ -144,6 +238,29 @@ def main() -> None:
     sequential_result, sequential_time = apply_aggregation_sequential(df)
 
     compare_execution_times(sequential_time, parallel_time)
+    check_results_match(parallel_result, sequential_result)
+
+    logger.info("⚙️  Agregando com np.bincount sobre os códigos categóricos...")
+    bincount_result, bincount_time = apply_aggregation_bincount(df)
+
+    compare_execution_times(sequential_time, bincount_time)
+    check_results_match(bincount_result, sequential_result)
+
+    # Mesmos streams de generate_synthetic_data: as partições reproduzem df,
+    # e o mesmo caminho escala até 1 bilhão de linhas
+    logger.info("🗂️  Gerando os mesmos dados em partições Parquet e agregando...")
+    try:
+        partition_paths = write_synthetic_partitions(
+            PARTITIONS_DIR, n_rows=len(df), rows_per_partition=2_000_000
+        )
+        partitions_result, partitions_time = apply_aggregation_partitions(
+            partition_paths
+        )
+    finally:
+        shutil.rmtree(PARTITIONS_DIR, ignore_errors=True)
+
+    compare_execution_times(sequential_time, partitions_time)
+    check_results_match(partitions_result, sequential_result)
 
 
 if __name__ == "__main__":
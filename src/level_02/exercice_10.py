@@ -1,9 +1,9 @@
 import multiprocessing as mp
 import os
-import string
+import queue as queue_module
 import sys
 import time
-from typing import Tuple
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
@@ -14,105 +14,465 @@ sys.path.insert(
 
 from utils.compare_times import compare_execution_times
 from utils.log_decorator import logger
+from utils.running_stats import (
+    GROUP_STATE_COLUMNS,
+    combine_group_states,
+    finalize_group_states,
+    partial_group_states,
+)
+from utils.shared_arrays import (
+    SharedArraySpec,
+    attach_shared_array,
+    create_shared_array,
+    peak_rss_mb,
+    release_shared_blocks,
+)
+from utils.shm_ring import RECORD_DTYPE, RingSpec, ShmRingChannel
+from utils.synthetic_data import (
+    chunk_streams,
+    generate_chunk,
+    generate_synthetic_data,
+    group_categories,
+)
 
 banner_exercise_10 = """
 ================================================================================
 🔄  Multiprocessamento em pipelines: transformação + persistência
 --------------------------------------------------------------------------------
-🚀  Transformação em um processo, escrita em disco em outro (multiprocessing.Queue)
+🚀  Fonte -> N transformadores -> persistidor, com filas limitadas (mp.Queue)
 ================================================================================
 """
 
 logger.info(banner_exercise_10)
 
 
-def generate_synthetic_data(n_rows: int = 10_000_000) -> pd.DataFrame:
+# Linhas por bloco emitido pela fonte
+CHUNK_SIZE = 500_000
+# Capacidade das filas entre estágios: limita quantos blocos ficam em trânsito
+QUEUE_MAXSIZE = 4
+# Mensagens enviadas em cada modo do benchmark de canais
+BENCHMARK_MESSAGES = 500_000
+# Registros por operação nos modos em lote
+BENCHMARK_BATCH = 4096
+# Intervalo, em segundos, entre as verificações dos estágios durante esperas
+POLL_INTERVAL = 0.1
+
+
+def queue_depth(queue: mp.Queue) -> Optional[int]:
     """
-    Gera um DataFrame com dados sintéticos para simular transformações pesadas.
+    Lê o tamanho aproximado de uma fila.
 
     Args:
-        n_rows (int): Número de linhas do DataFrame.
+        queue (mp.Queue): Fila entre estágios.
 
     Returns:
-        pd.DataFrame: DataFrame com colunas de grupo e valores numéricos.
+        Optional[int]: Itens na fila, ou None onde qsize() não é suportado (macOS).
     """
-    np.random.seed(42)
-    group_labels = np.random.choice(list(string.ascii_uppercase[:5]), size=n_rows)
-    values = np.random.rand(n_rows) * 100
+    try:
+        return queue.qsize()
+    except NotImplementedError:
+        return None
 
-    return pd.DataFrame({"group": group_labels, "value": values})
 
-
-def transform_data(df: pd.DataFrame, queue: mp.Queue) -> None:
+def partials_path_for(output_path: str) -> str:
     """
-    Realiza transformação pesada nos dados e envia o resultado para a fila.
+    Caminho do CSV incremental de parciais ao lado da saída final.
 
     Args:
-        df (pd.DataFrame): DataFrame de entrada.
-        queue (mp.Queue): Fila de comunicação entre processos.
+        output_path (str): Caminho do CSV final.
+
+    Returns:
+        str: Caminho do CSV de parciais.
     """
-    logger.info("⚙️  Transformando dados...")
-    result = df.groupby("group")["value"].agg(["sum", "mean", "std"]).reset_index()
-    queue.put(result)
-    logger.info("✅ Transformação concluída")
+    root, extension = os.path.splitext(output_path)
+    return f"{root}_partials{extension}"
 
 
-def persist_data(queue: mp.Queue, output_path: str) -> None:
+def check_stages(processes: List[mp.Process]) -> None:
     """
-    Persiste os dados transformados em disco.
+    Levanta erro se algum estágio terminou com falha.
 
     Args:
-        queue (mp.Queue): Fila contendo os dados transformados.
-        output_path (str): Caminho para salvar o arquivo CSV.
+        processes (List[mp.Process]): Processos dos estágios.
+
+    Raises:
+        RuntimeError: Se algum processo saiu com código diferente de 0.
     """
-    logger.info("💾 Aguardando dados para persistência...")
-    result_df = queue.get()
-    result_df.to_csv(output_path, index=False)
-    logger.info(f"✅ Dados salvos em: {output_path}")
+    for process in processes:
+        if process.exitcode not in (None, 0):
+            raise RuntimeError(
+                f"Estágio {process.name} falhou (exitcode {process.exitcode})"
+            )
 
 
-def pipeline_with_multiprocessing(df: pd.DataFrame, output_path: str) -> float:
+def get_checked(queue: mp.Queue, processes: List[mp.Process]) -> Any:
     """
-    Executa uma pipeline com dois processos: transformação e persistência.
+    queue.get() que desiste se algum estágio morrer durante a espera.
 
     Args:
-        df (pd.DataFrame): DataFrame original.
-        output_path (str): Caminho do arquivo de saída.
+        queue (mp.Queue): Fila lida.
+        processes (List[mp.Process]): Processos dos estágios.
 
     Returns:
-        float: Tempo total de execução.
+        Any: Item lido.
+    """
+    while True:
+        try:
+            return queue.get(timeout=POLL_INTERVAL)
+        except queue_module.Empty:
+            check_stages(processes)
+
+
+def put_checked(queue: mp.Queue, item: Any, processes: List[mp.Process]) -> None:
+    """
+    queue.put() que desiste se algum estágio morrer com a fila cheia.
+
+    Args:
+        queue (mp.Queue): Fila de destino.
+        item (Any): Item enviado.
+        processes (List[mp.Process]): Processos dos estágios.
     """
+    while True:
+        try:
+            queue.put(item, timeout=POLL_INTERVAL)
+            return
+        except queue_module.Full:
+            check_stages(processes)
+
+
+def transform_worker(
+    codes_spec: SharedArraySpec,
+    values_spec: SharedArraySpec,
+    task_queue: mp.Queue,
+    free_slots: mp.Queue,
+    result_queue: mp.Queue,
+    stats_queue: mp.Queue,
+) -> None:
+    """
+    Estágio de transformação: calcula o estado parcial por grupo de cada bloco.
+
+    Os blocos chegam como índices de slots em memória compartilhada; depois
+    de agregado, o slot é devolvido à fonte e apenas o estado parcial (poucas
+    linhas) segue para o persistidor. Ao terminar, envia ao persistidor a
+    sentinela None ou, em caso de falha, a própria exceção.
+
+    Args:
+        codes_spec (SharedArraySpec): Slots com os códigos de grupo.
+        values_spec (SharedArraySpec): Slots com os valores.
+        task_queue (mp.Queue): Fila de entrada (chunk_id, slot, n_linhas).
+        free_slots (mp.Queue): Fila de slots livres da fonte.
+        result_queue (mp.Queue): Fila de saída para o persistidor.
+        stats_queue (mp.Queue): Fila de métricas do estágio.
+    """
+    codes_shm, codes = attach_shared_array(codes_spec)
+    values_shm, values = attach_shared_array(values_spec)
+    rows = 0
+    busy = 0.0
+    error = None
     start_time = time.time()
-    queue = mp.Queue()
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            chunk_id, slot, n_rows = task
+
+            busy_start = time.time()
+            chunk = pd.DataFrame(
+                {"group": codes[slot, :n_rows], "value": values[slot, :n_rows]}
+            )
+            states = partial_group_states(chunk, "group", "value")
+            del chunk
+            busy += time.time() - busy_start
+
+            free_slots.put(slot)
+            result_queue.put((chunk_id, states))
+            rows += n_rows
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        del codes, values
+        codes_shm.close()
+        values_shm.close()
+        result_queue.put(error)
+        stats_queue.put(
+            ("transform", os.getpid(), rows, busy, time.time() - start_time)
+        )
+
+
+def persist_worker(
+    result_queue: mp.Queue,
+    stats_queue: mp.Queue,
+    output_path: str,
+    n_transformers: int,
+    n_groups: int,
+) -> None:
+    """
+    Estágio de persistência: grava cada estado parcial assim que chega.
 
-    p1 = mp.Process(target=transform_data, args=(df, queue))
-    p2 = mp.Process(target=persist_data, args=(queue, output_path))
+    Os parciais são anexados a um CSV incremental e combinados em um estado
+    acumulado de tamanho fixo; ao final o agregado é gravado em output_path.
+    Se algum transformador falhar, nada é gravado e o CSV de parciais é
+    removido.
+
+    Args:
+        result_queue (mp.Queue): Fila com (chunk_id, estado parcial).
+        stats_queue (mp.Queue): Fila de métricas do estágio.
+        output_path (str): Caminho do CSV final (sum, mean, std por grupo).
+        n_transformers (int): Quantidade de sentinelas esperadas.
+        n_groups (int): Quantidade de grupos.
+
+    Raises:
+        RuntimeError: Se algum transformador enviou uma exceção.
+    """
+    labels = group_categories(n_groups)
+    partials_path = partials_path_for(output_path)
+    failure: Optional[BaseException] = None
+    rows = 0
+    busy = 0.0
+    depths = []
+    state = None
+    finished = 0
+    start_time = time.time()
 
-    p1.start()
-    p2.start()
+    with open(partials_path, "w", newline="") as partials_file:
+        partials_file.write("chunk_id,group," + ",".join(GROUP_STATE_COLUMNS) + "\n")
+        while finished < n_transformers:
+            item = result_queue.get()
+            if item is None or isinstance(item, BaseException):
+                finished += 1
+                failure = failure or item
+                continue
+            depth = queue_depth(result_queue)
+            if depth is not None:
+                depths.append(depth)
+
+            busy_start = time.time()
+            chunk_id, states = item
+            partial = states.rename(index=lambda code: labels[code])
+            partial.insert(0, "chunk_id", chunk_id)
+            partial.to_csv(partials_file, header=False)
+            partials_file.flush()
+
+            state = states if state is None else combine_group_states([state, states])
+            rows += int(states["count"].sum())
+            busy += time.time() - busy_start
+
+    if failure is not None:
+        os.remove(partials_path)
+        raise RuntimeError("Um transformador falhou; nada foi gravado") from failure
+
+    if state is None:
+        # Nenhum bloco chegou (n_rows=0): grava o agregado vazio
+        state = pd.DataFrame(columns=list(GROUP_STATE_COLUMNS), dtype="float64")
+    result = finalize_group_states(state).rename(index=lambda code: labels[code])
+    result.index.name = "group"
+    result.sort_index().reset_index().to_csv(output_path, index=False)
+    logger.info(f"✅ Dados salvos em: {output_path} (parciais em {partials_path})")
+    stats_queue.put(("persist", os.getpid(), rows, busy, time.time() - start_time))
+    stats_queue.put(("result_queue", depths))
+
+
+def log_pipeline_stats(
+    stats: List[tuple], source_stats: Dict[str, Any], elapsed: float
+) -> None:
+    """
+    Registra a vazão de cada estágio e a profundidade das filas.
 
-    p1.join()
-    p2.join()
+    Args:
+        stats (List[tuple]): Métricas enviadas pelos estágios.
+        source_stats (Dict[str, Any]): Métricas da fonte.
+        elapsed (float): Tempo total da pipeline.
+    """
+    busy = source_stats["busy"]
+    rate = source_stats["rows"] / busy / 1e6 if busy else float("inf")
+    logger.info(
+        f"📤 Fonte: {source_stats['rows']:,} linhas em {source_stats['chunks']} "
+        f"blocos, {rate:.1f} M linhas/s "
+        f"(ocupada {source_stats['busy']:.2f}s, bloqueada por slots "
+        f"{source_stats['blocked']:.2f}s)"
+    )
+    for stat in stats:
+        if stat[0] not in ("transform", "persist"):
+            continue
+        stage, pid, rows, busy, wall = stat
+        rate = rows / busy / 1e6 if busy else float("inf")
+        logger.info(
+            f"⚙️  {stage} [pid {pid}]: {rows:,} linhas, {rate:.1f} M linhas/s, "
+            f"ocupado {busy:.2f}s de {wall:.2f}s ({busy / wall:.0%})"
+        )
+
+    depths = {"task_queue": source_stats["depths"]}
+    depths.update({stat[0]: stat[1] for stat in stats if stat[0] == "result_queue"})
+    for name, values in depths.items():
+        if values:
+            logger.info(
+                f"📊 {name}: profundidade média {sum(values) / len(values):.1f}, "
+                f"máxima {max(values)} (limite {QUEUE_MAXSIZE})"
+            )
+
+    logger.info(
+        f"🏁 Pipeline: {source_stats['rows'] / elapsed / 1e6:.1f} M linhas/s "
+        f"de ponta a ponta ({elapsed:.2f}s)"
+    )
+
+
+def pipeline_with_multiprocessing(
+    output_path: str,
+    n_rows: int = 10_000_000,
+    n_groups: int = 5,
+    seed: int = 42,
+    n_transformers: int = 2,
+    chunk_size: int = CHUNK_SIZE,
+    queue_maxsize: int = QUEUE_MAXSIZE,
+) -> float:
+    """
+    Executa uma pipeline em fluxo: fonte -> N transformadores -> persistidor.
 
-    end_time = time.time()
-    return end_time - start_time
+    A fonte gera os mesmos dados de generate_synthetic_data, bloco a bloco,
+    direto em slots de memória compartilhada; pelas filas passam apenas
+    índices de slots e estados parciais. Filas limitadas e o conjunto fixo
+    de slots aplicam contrapressão, então a memória não depende de n_rows e
+    os três estágios trabalham ao mesmo tempo. As esperas da fonte verificam
+    os estágios: se algum falhar, os demais são encerrados, as saídas
+    parciais removidas e o erro levantado.
 
+    Args:
+        output_path (str): Caminho do arquivo de saída.
+        n_rows (int): Linhas geradas pela fonte.
+        n_groups (int): Quantidade de grupos.
+        seed (int): Semente raiz dos dados.
+        n_transformers (int): Processos de transformação.
+        chunk_size (int): Linhas por bloco.
+        queue_maxsize (int): Capacidade das filas entre estágios.
+
+    Returns:
+        float: Tempo total de execução.
 
-def pipeline_sequential(df: pd.DataFrame, output_path: str) -> float:
+    Raises:
+        RuntimeError: Se algum estágio falhar.
     """
-    Executa a pipeline sequencialmente (transforma e salva).
+    start_time = time.time()
+    n_slots = queue_maxsize + n_transformers
+    codes_shm, codes_slots, codes_spec = create_shared_array(
+        (n_slots, chunk_size), "int8"
+    )
+    values_shm, values_slots, values_spec = create_shared_array((n_slots, chunk_size))
+
+    task_queue = mp.Queue(maxsize=queue_maxsize)
+    result_queue = mp.Queue(maxsize=queue_maxsize)
+    free_slots = mp.Queue()
+    stats_queue = mp.Queue()
+    for slot in range(n_slots):
+        free_slots.put(slot)
+
+    transformers = [
+        mp.Process(
+            target=transform_worker,
+            args=(
+                codes_spec,
+                values_spec,
+                task_queue,
+                free_slots,
+                result_queue,
+                stats_queue,
+            ),
+        )
+        for _ in range(n_transformers)
+    ]
+    persister = mp.Process(
+        target=persist_worker,
+        args=(result_queue, stats_queue, output_path, n_transformers, n_groups),
+    )
+    processes = transformers + [persister]
+    for process in processes:
+        process.start()
+
+    source_stats = {"rows": 0, "chunks": 0, "busy": 0.0, "blocked": 0.0, "depths": []}
+    try:
+        streams = chunk_streams(seed, n_rows, chunk_size)
+        for chunk_id, stream in enumerate(streams):
+            wait_start = time.time()
+            slot = get_checked(free_slots, processes)
+            source_stats["blocked"] += time.time() - wait_start
+
+            busy_start = time.time()
+            length = min(chunk_size, n_rows - chunk_id * chunk_size)
+            codes, values = generate_chunk(stream, length, n_groups)
+            codes_slots[slot, :length] = codes
+            values_slots[slot, :length] = values
+            source_stats["busy"] += time.time() - busy_start
+
+            put_checked(task_queue, (chunk_id, slot, length), processes)
+            depth = queue_depth(task_queue)
+            if depth is not None:
+                source_stats["depths"].append(depth)
+            source_stats["rows"] += length
+            source_stats["chunks"] += 1
+
+        for _ in transformers:
+            put_checked(task_queue, None, processes)
+        stats = [get_checked(stats_queue, processes) for _ in range(n_transformers + 2)]
+        for process in processes:
+            process.join()
+        check_stages(processes)
+    except BaseException:
+        # Um estágio que falhou deixa os outros presos nas filas: encerra
+        # todos e descarta as saídas parciais
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        for path in (output_path, partials_path_for(output_path)):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    finally:
+        del codes_slots, values_slots
+        release_shared_blocks([codes_shm, values_shm])
+
+    elapsed = time.time() - start_time
+    log_pipeline_stats(stats, source_stats, elapsed)
+    return elapsed
+
+
+def pipeline_sequential(
+    output_path: str,
+    n_rows: int = 10_000_000,
+    n_groups: int = 5,
+    seed: int = 42,
+    chunk_size: int = CHUNK_SIZE,
+) -> float:
+    """
+    Executa a pipeline sequencialmente (gera, transforma e salva).
+
+    Os parâmetros de geração devem ser os mesmos da pipeline em fluxo para
+    que check_outputs_match compare os mesmos dados.
 
     Args:
-        df (pd.DataFrame): DataFrame original.
         output_path (str): Caminho do arquivo de saída.
+        n_rows (int): Linhas geradas.
+        n_groups (int): Quantidade de grupos.
+        seed (int): Semente raiz dos dados.
+        chunk_size (int): Linhas por bloco (define os streams aleatórios).
 
     Returns:
         float: Tempo total de execução.
     """
     start_time = time.time()
 
+    logger.info("🔧 Gerando dados sintéticos (sequencial)...")
+    df = generate_synthetic_data(
+        n_rows, n_groups, seed, n_workers=1, chunk_size=chunk_size
+    )
+
     logger.info("⚙️  Transformando dados (sequencial)...")
-    result = df.groupby("group")["value"].agg(["sum", "mean", "std"]).reset_index()
+    result = (
+        df.groupby("group", observed=True)["value"]
+        .agg(["sum", "mean", "std"])
+        .reset_index()
+    )
 
     logger.info("💾 Salvando dados (sequencial)...")
     result.to_csv(output_path, index=False)
@@ -121,22 +481,177 @@ def pipeline_sequential(df: pd.DataFrame, output_path: str) -> float:
     return end_time - start_time
 
 
+def check_outputs_match(parallel_path: str, sequential_path: str) -> None:
+    """
+    Confere se as duas pipelines gravaram o mesmo agregado.
+
+    Args:
+        parallel_path (str): Saída da pipeline em fluxo.
+        sequential_path (str): Saída da pipeline sequencial.
+    """
+    parallel = pd.read_csv(parallel_path).set_index("group").sort_index()
+    sequential = pd.read_csv(sequential_path).set_index("group").sort_index()
+    if np.allclose(parallel.to_numpy(), sequential[parallel.columns].to_numpy()):
+        logger.success("✅ Pipeline em fluxo coincide com a sequencial")
+    else:
+        logger.error("❌ Pipeline em fluxo diverge da sequencial")
+
+
+def queue_consumer(queue: mp.Queue, result_queue: mp.Queue) -> None:
+    """
+    Consumidor do benchmark sobre mp.Queue (mensagens avulsas ou em lote).
+
+    Args:
+        queue (mp.Queue): Fila de entrada; None encerra o consumidor.
+        result_queue (mp.Queue): Recebe (mensagens, soma das sequências).
+    """
+    count = checksum = 0
+    while True:
+        item = queue.get()
+        if item is None:
+            break
+        if isinstance(item, np.ndarray):
+            count += len(item)
+            checksum += int(item["seq"].sum())
+        else:
+            count += 1
+            checksum += item[1]
+    result_queue.put((count, checksum))
+
+
+def ring_consumer(spec: RingSpec, result_queue: mp.Queue, max_items: int) -> None:
+    """
+    Consumidor do benchmark sobre o anel em memória compartilhada.
+
+    Args:
+        spec (RingSpec): Descritor do canal.
+        result_queue (mp.Queue): Recebe (mensagens, soma das sequências).
+        max_items (int): Registros retirados por operação.
+    """
+    channel = ShmRingChannel.attach(spec)
+    count = checksum = 0
+    try:
+        while True:
+            records = channel.get_many(max_items)
+            if records is None:
+                break
+            count += len(records)
+            checksum += int(records["seq"].sum())
+    finally:
+        channel.release()
+    result_queue.put((count, checksum))
+
+
+def benchmark_channels(
+    n_messages: int = BENCHMARK_MESSAGES,
+    n_consumers: int = 2,
+    batch: int = BENCHMARK_BATCH,
+) -> Dict[str, float]:
+    """
+    Compara mensagens/s entre mp.Queue e o anel em memória compartilhada.
+
+    Um produtor (este processo) envia n_messages registros de largura fixa
+    (produtor, sequência, valor, instante) a n_consumers processos, uma
+    mensagem por vez e em lotes de batch registros. A contagem e a soma das
+    sequências recebidas conferem que nada foi perdido ou duplicado.
+
+    Args:
+        n_messages (int): Mensagens por modo.
+        n_consumers (int): Processos consumidores.
+        batch (int): Registros por operação nos modos em lote.
+
+    Returns:
+        Dict[str, float]: Mensagens por segundo de cada modo.
+    """
+    records = np.zeros(n_messages, dtype=RECORD_DTYPE)
+    records["seq"] = np.arange(n_messages)
+    records["value"] = records["seq"] * 0.5
+    expected = n_messages * (n_messages - 1) // 2
+
+    def send_queue(queue: mp.Queue, batched: bool) -> None:
+        if batched:
+            for start in range(0, n_messages, batch):
+                chunk = records[start : start + batch].copy()
+                chunk["timestamp"] = time.time()
+                queue.put(chunk)
+        else:
+            for i in range(n_messages):
+                queue.put((0, i, i * 0.5, time.time()))
+        for _ in range(n_consumers):
+            queue.put(None)
+
+    def send_ring(channel: ShmRingChannel, batched: bool) -> None:
+        if batched:
+            for start in range(0, n_messages, batch):
+                chunk = records[start : start + batch].copy()
+                chunk["timestamp"] = time.time()
+                channel.put_many(chunk)
+        else:
+            for i in range(n_messages):
+                channel.put((0, i, i * 0.5, time.time()))
+        channel.close()
+
+    rates = {}
+    for name, batched in [
+        ("mp.Queue (1 por vez)", False),
+        ("anel shm (1 por vez)", False),
+        ("mp.Queue (lotes)", True),
+        ("anel shm (lotes)", True),
+    ]:
+        result_queue = mp.Queue()
+        if name.startswith("mp.Queue"):
+            channel = mp.Queue(maxsize=1024)
+            target, args = queue_consumer, (channel, result_queue)
+            send = send_queue
+        else:
+            channel = ShmRingChannel.create()
+            target = ring_consumer
+            args = (channel.spec, result_queue, batch if batched else 1)
+            send = send_ring
+        consumers = [mp.Process(target=target, args=args) for _ in range(n_consumers)]
+        for process in consumers:
+            process.start()
+
+        start_time = time.time()
+        send(channel, batched)
+        results = [result_queue.get() for _ in consumers]
+        elapsed = time.time() - start_time
+        for process in consumers:
+            process.join()
+        if isinstance(channel, ShmRingChannel):
+            channel.release()
+
+        count = sum(c for c, _ in results)
+        checksum = sum(s for _, s in results)
+        if count != n_messages or checksum != expected:
+            logger.error(f"❌ {name}: {count:,} de {n_messages:,} mensagens recebidas")
+        rates[name] = n_messages / elapsed
+        logger.info(
+            f"📨 {name}: {rates[name]:,.0f} mensagens/s "
+            f"({elapsed:.2f}s, {n_consumers} consumidores)"
+        )
+    return rates
+
+
 def main() -> None:
-    logger.info("🔧 Gerando dados sintéticos...")
-    df = generate_synthetic_data()
     output_path_parallel = "./data/outputs/exercicio_10/output_parallel.csv"
     output_path_sequential = "./data/outputs/exercicio_10/output_sequential.csv"
     os.makedirs(os.path.dirname(output_path_parallel), exist_ok=True)
     os.makedirs(os.path.dirname(output_path_sequential), exist_ok=True)
 
-    logger.info("🚀 Executando pipeline com multiprocessing...")
-    parallel_time = pipeline_with_multiprocessing(df, output_path_parallel)
+    logger.info("🚀 Executando pipeline em fluxo com multiprocessing...")
+    parallel_time = pipeline_with_multiprocessing(output_path_parallel)
+    logger.info(f"🧠 Pico de RSS dos estágios: {peak_rss_mb(children=True):.0f} MB")
 
     logger.info("🚀 Executando pipeline sequencial...")
-    sequential_time = pipeline_sequential(df, output_path_sequential)
+    sequential_time = pipeline_sequential(output_path_sequential)
 
+    check_outputs_match(output_path_parallel, output_path_sequential)
     compare_execution_times(sequential_time, parallel_time)
 
+    logger.info("🚀 Comparando canais entre processos: mp.Queue x anel shm...")
+    benchmark_channels()
+
 
 if __name__ == "__main__":
     main()
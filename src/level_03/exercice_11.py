@@ -1,10 +1,14 @@
+import io
 import os
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
@@ -12,9 +16,31 @@ sys.path.insert(
 
 from utils.compare_times import compare_execution_times
 from utils.log_decorator import log_execution, logger
+from utils.parquet_compaction import (
+    ParquetWriterSettings,
+    benchmark_scan,
+    compact_parquet_files,
+    write_parquet_atomic,
+)
+from utils.partition_manifest import PartitionManifest, file_fingerprint
+from utils.partition_scheduler import log_schedule_stats, run_scheduled
 
 input_dir = "data/inputs/simulated_datalake_files"
 output_dir = "data/outputs/exercicio_11"
+manifest_path = os.path.join(output_dir, "_manifest.json")
+parts_dir = os.path.join(output_dir, "_parts")
+compacted_dir = "data/outputs/exercicio_11_compacted"
+
+# Opções de escrita das saídas (codec, row groups, dicionário, estatísticas)
+PARQUET_SETTINGS = ParquetWriterSettings(
+    compression="zstd",
+    row_group_size=1_000_000,
+    use_dictionary=True,
+    write_statistics=True,
+)
+
+# Incrementar sempre que a transformação mudar, para reprocessar tudo
+TRANSFORM_VERSION = "1"
 
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
@@ -33,18 +59,108 @@ banner_etl = """
 logger.success(banner_etl)
 
 
-def process_partition(file_path: str) -> str:
+class CsvSlice(NamedTuple):
+    """
+    Faixa de bytes de um CSV, alinhada em quebras de linha.
+
+    Attributes:
+        path (str): Arquivo CSV de origem.
+        start (int): Primeiro byte da faixa (após o cabeçalho).
+        stop (int): Byte final (exclusivo) da faixa.
+        part (int): Índice da parte dentro do arquivo.
+    """
+
+    path: str
+    start: int
+    stop: int
+    part: int
+
+
+def split_csv(file_path: str, n_parts: int) -> List[CsvSlice]:
+    """
+    Divide um CSV grande em faixas de bytes de tamanho parecido.
+
+    Cada fronteira é avançada até a próxima quebra de linha, então nenhuma
+    linha é cortada; o cabeçalho fica de fora e é relido por cada parte.
+
+    Args:
+        file_path (str): Arquivo CSV.
+        n_parts (int): Quantidade desejada de partes.
+
+    Returns:
+        List[CsvSlice]: Partes do arquivo, em ordem.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as file:
+        file.readline()
+        data_start = file.tell()
+        boundaries = [data_start]
+        step = max(1, (size - data_start) // n_parts)
+        for i in range(1, n_parts):
+            file.seek(max(data_start + i * step, boundaries[-1]))
+            file.readline()
+            if file.tell() >= size:
+                break
+            boundaries.append(file.tell())
+    boundaries.append(size)
+    return [
+        CsvSlice(file_path, start, stop, part)
+        for part, (start, stop) in enumerate(zip(boundaries, boundaries[1:]))
+        if stop > start
+    ]
+
+
+def partition_weight(task: Union[str, CsvSlice]) -> int:
+    """
+    Estima o custo de uma tarefa pelo número de bytes a ler.
+
+    Args:
+        task (Union[str, CsvSlice]): Arquivo inteiro ou faixa de um arquivo.
+
+    Returns:
+        int: Bytes da tarefa.
+    """
+    if isinstance(task, CsvSlice):
+        return task.stop - task.start
+    return os.path.getsize(task)
+
+
+def read_partition(task: Union[str, CsvSlice]) -> pd.DataFrame:
+    """
+    Lê um CSV inteiro ou apenas uma faixa de bytes dele.
+
+    Args:
+        task (Union[str, CsvSlice]): Arquivo inteiro ou faixa de um arquivo.
+
+    Returns:
+        pd.DataFrame: Dados lidos.
+    """
+    if not isinstance(task, CsvSlice):
+        return pd.read_csv(task)
+
+    with open(task.path, "rb") as file:
+        header = file.readline()
+        file.seek(task.start)
+        body = file.read(task.stop - task.start)
+    return pd.read_csv(io.BytesIO(header + body))
+
+
+def process_partition(task: Union[str, CsvSlice]) -> str:
     """
-    Processa um arquivo CSV: lê, transforma e salva parquet.
+    Processa um arquivo CSV (ou uma faixa dele): lê, transforma e salva parquet.
+
+    Faixas de um arquivo dividido são gravadas em parts_dir e depois juntadas
+    por merge_split_outputs.
 
     Args:
-        file_path (str): Caminho do arquivo CSV de entrada.
+        task (Union[str, CsvSlice]): Caminho do CSV de entrada ou faixa dele.
 
     Returns:
         str: Caminho do arquivo parquet gerado.
     """
+    file_path = task.path if isinstance(task, CsvSlice) else task
     try:
-        df = pd.read_csv(file_path)
+        df = read_partition(task)
 
         # Exemplo simples de transformação: criar uma coluna total (quantidade * preço)
         if {"quantity", "price"}.issubset(df.columns):
@@ -52,9 +168,18 @@ def process_partition(file_path: str) -> str:
 
         # Nome do arquivo parquet correspondente
         base_name = os.path.splitext(os.path.basename(file_path))[0]
-        parquet_path = os.path.join(output_dir, f"{base_name}.parquet")
-
-        df.to_parquet(parquet_path, index=False)
+        if isinstance(task, CsvSlice):
+            os.makedirs(parts_dir, exist_ok=True)
+            parquet_path = os.path.join(
+                parts_dir, f"{base_name}-part{task.part:03d}.parquet"
+            )
+        else:
+            parquet_path = os.path.join(output_dir, f"{base_name}.parquet")
+
+        # Grava em arquivo temporário e troca atomicamente: leitores nunca
+        # veem um parquet pela metade, e cópias especulativas não colidem
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        write_parquet_atomic(table, parquet_path, PARQUET_SETTINGS)
 
         logger.info(f"Arquivo processado e salvo: {parquet_path}")
 
@@ -65,6 +190,64 @@ def process_partition(file_path: str) -> str:
         raise
 
 
+def merge_split_outputs(results: Dict[Any, str]) -> List[str]:
+    """
+    Junta as partes de arquivos divididos em um parquet por partição.
+
+    Se alguma faixa de um arquivo falhou, o arquivo não é publicado (um
+    parquet com linhas faltando pareceria completo): suas partes são
+    descartadas e o erro é registrado para que ele seja reprocessado.
+
+    Args:
+        results (Dict[Any, str]): Tarefa -> parquet gerado (de run_scheduled).
+
+    Returns:
+        List[str]: Um parquet por arquivo de origem concluído por inteiro.
+    """
+    outputs = []
+    parts_by_file: Dict[str, List[Tuple[int, str]]] = {}
+    failed_files = set()
+    for task, parquet_path in results.items():
+        if isinstance(task, CsvSlice):
+            if parquet_path is None:
+                failed_files.add(task.path)
+            else:
+                parts_by_file.setdefault(task.path, []).append(
+                    (task.part, parquet_path)
+                )
+        elif parquet_path is not None:
+            outputs.append(parquet_path)
+
+    for file_path in sorted(failed_files):
+        for _, part_path in parts_by_file.pop(file_path, []):
+            os.remove(part_path)
+        logger.error(
+            f"❌ {file_path} não foi publicado: alguma faixa falhou; "
+            "reprocesse o arquivo"
+        )
+
+    for file_path, parts in parts_by_file.items():
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        parquet_path = os.path.join(output_dir, f"{base_name}.parquet")
+        tmp_path = f"{parquet_path}.tmp"
+        parts.sort()
+
+        schema = pq.read_schema(parts[0][1])
+        options = PARQUET_SETTINGS.writer_options()
+        with pq.ParquetWriter(tmp_path, schema, **options) as writer:
+            for _, part_path in parts:
+                writer.write_table(
+                    pq.read_table(part_path, schema=schema),
+                    row_group_size=PARQUET_SETTINGS.row_group_size,
+                )
+        os.replace(tmp_path, parquet_path)
+        for _, part_path in parts:
+            os.remove(part_path)
+        outputs.append(parquet_path)
+
+    return outputs
+
+
 @log_execution
 def etl_sequential() -> List[str]:
     """
@@ -108,6 +291,156 @@ def etl_parallel() -> List[str]:
     return processed_files
 
 
+@log_execution
+def etl_scheduled(
+    kind: str = "process",
+    max_workers: Optional[int] = None,
+    max_part_bytes: Optional[int] = None,
+) -> List[str]:
+    """
+    Processa todos os CSVs com o escalonador de partições.
+
+    As partições são despachadas da maior para a menor, arquivos acima da
+    fatia justa (bytes totais / workers, ou max_part_bytes) são divididos em
+    faixas de linhas e tarefas lentas ganham uma cópia especulativa. Assim o
+    tempo total acompanha bytes totais / núcleos, e não a maior partição.
+
+    Args:
+        kind (str): "process" (parse de CSV segura o GIL) ou "thread".
+        max_workers (Optional[int]): Workers (padrão: núcleos disponíveis).
+        max_part_bytes (Optional[int]): Tamanho máximo de uma tarefa.
+
+    Returns:
+        List[str]: Lista de arquivos parquet gerados.
+    """
+    sources = [os.path.join(input_dir, file) for file in files]
+    results, stats = run_scheduled(
+        process_partition,
+        sources,
+        kind=kind,
+        max_workers=max_workers,
+        weight=partition_weight,
+        split=split_csv,
+        max_task_weight=max_part_bytes,
+    )
+    log_schedule_stats(stats, max_workers)
+    return merge_split_outputs(results)
+
+
+@log_execution
+def etl_incremental(max_workers: int = 5) -> List[str]:
+    """
+    Processa apenas as partições novas ou alteradas desde a última execução.
+
+    O manifesto guarda tamanho, mtime e hash de cada CSV já processado e a
+    versão da saída correspondente; partições inalteradas são puladas com um
+    simples os.stat. Cada partição concluída é registrada com a impressão
+    digital capturada antes da leitura, e o manifesto é gravado de forma
+    atômica mesmo se alguma partição falhar.
+
+    Args:
+        max_workers (int): Threads usadas no processamento.
+
+    Returns:
+        List[str]: Arquivos parquet gerados nesta execução.
+    """
+    manifest = PartitionManifest(manifest_path, TRANSFORM_VERSION)
+    sources = [os.path.join(input_dir, file) for file in files]
+    manifest.prune(sources)
+    pending = manifest.plan(sources)
+    logger.info(
+        f"📋 {len(pending)} de {len(sources)} partições novas ou alteradas "
+        f"({len(sources) - len(pending)} puladas)"
+    )
+
+    def process_and_fingerprint(file_path: str) -> tuple:
+        fingerprint = file_fingerprint(file_path)
+        return process_partition(file_path), fingerprint
+
+    processed_files = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(process_and_fingerprint, path): path for path in pending
+            }
+            for future in as_completed(futures):
+                source_path = futures[future]
+                try:
+                    parquet_file, fingerprint = future.result()
+                except Exception as e:
+                    logger.error(f"Erro ao processar {source_path}: {e}")
+                    continue
+                entry = manifest.record(source_path, parquet_file, fingerprint)
+                logger.debug(f"{parquet_file} -> versão {entry['output_version']}")
+                processed_files.append(parquet_file)
+    finally:
+        manifest.save()
+
+    return processed_files
+
+
+@log_execution
+def compact_outputs(target_bytes: int = 64 * 1024 * 1024) -> List[str]:
+    """
+    Compacta as saídas mensais em poucos arquivos ordenados por data.
+
+    As saídas originais são mantidas, pois o manifesto incremental aponta
+    para elas; os arquivos compactados vão para compacted_dir e substituem
+    a versão anterior da compactação.
+
+    Args:
+        target_bytes (int): Tamanho alvo de cada arquivo compactado.
+
+    Returns:
+        List[str]: Arquivos compactados.
+    """
+    sources = sorted(
+        os.path.join(output_dir, file)
+        for file in os.listdir(output_dir)
+        if file.endswith(".parquet")
+    )
+    if os.path.isdir(compacted_dir):
+        for file in os.listdir(compacted_dir):
+            if file.endswith(".parquet"):
+                os.remove(os.path.join(compacted_dir, file))
+    return compact_parquet_files(
+        sources,
+        compacted_dir,
+        target_bytes=target_bytes,
+        sort_by="date",
+        settings=PARQUET_SETTINGS,
+    )
+
+
+def benchmark_compaction(compacted: List[str]) -> None:
+    """
+    Compara a leitura das saídas antes e depois da compactação.
+
+    Args:
+        compacted (List[str]): Arquivos compactados.
+    """
+    small_files = sorted(
+        os.path.join(output_dir, file)
+        for file in os.listdir(output_dir)
+        if file.endswith(".parquet")
+    )
+    june_onwards = ds.field("date") >= "2024-06-01"
+    for label, filter_expression in (
+        ("leitura completa", None),
+        ("date >= 2024-06", june_onwards),
+    ):
+        before = benchmark_scan(small_files, filter_expression)
+        after = benchmark_scan(compacted, filter_expression)
+        logger.info(
+            f"📊 {label}: {before['files']} arquivos em "
+            f"{before['seconds'] * 1000:.1f} ms -> {after['files']} arquivos em "
+            f"{after['seconds'] * 1000:.1f} ms "
+            f"({before['seconds'] / after['seconds']:.1f}x, "
+            f"{before['rows']:,} / {after['rows']:,} linhas, "
+            f"{before['bytes'] / 1024:.0f} KB -> {after['bytes'] / 1024:.0f} KB)"
+        )
+
+
 def main():
     logger.info("Início do ETL sequencial")
     time_seq_start = time.time()
@@ -124,8 +457,31 @@ def main():
 
     compare_execution_times(seq_duration, par_duration)
 
+    logger.info("Início do ETL com escalonador (processos, maior primeiro)")
+    time_sched_start = time.time()
+    processed_sched = etl_scheduled()
+    sched_duration = time.time() - time_sched_start
+
+    compare_execution_times(seq_duration, sched_duration)
+
     logger.info(f"Arquivos processados sequencialmente: {processed_seq}")
     logger.info(f"Arquivos processados paralelamente: {processed_par}")
+    logger.info(f"Arquivos processados com escalonador: {processed_sched}")
+
+    logger.info("Compactando saídas pequenas em arquivos ordenados por data")
+    compacted = compact_outputs()
+    benchmark_compaction(compacted)
+
+    # A primeira execução incremental processa o que o manifesto ainda não
+    # conhece; a segunda encontra o datalake inalterado e não faz nada
+    for run in (1, 2):
+        logger.info(f"Início do ETL incremental (execução {run})")
+        time_inc_start = time.time()
+        processed_inc = etl_incremental()
+        logger.info(
+            f"ETL incremental {run}: {len(processed_inc)} partições em "
+            f"{time.time() - time_inc_start:.2f} segundos"
+        )
 
 
 if __name__ == "__main__":
@@ -1,29 +1,51 @@
+import asyncio
+import csv
 import os
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 )
 
+from utils.async_pager import (
+    AIMDLimiter,
+    PageSink,
+    create_session,
+    fetch_pages_async,
+    log_extraction_stats,
+)
 from utils.compare_times import compare_execution_times
 from utils.log_decorator import log_execution, logger
+from utils.parquet_compaction import ParquetWriterSettings
 
 BANNER = """
 ================================================================================
 🌐  EXERCÍCIO: EXTRAÇÃO CONCORRENTE DE API PAGINADA
 --------------------------------------------------------------------------------
-🔄  Consulta uma API paginada usando múltiplas threads
+🔄  Consulta uma API paginada usando múltiplas threads e asyncio (AIMD)
 📊  Junta todos os dados em uma única estrutura de saída
 ================================================================================
 """
 
 logger.success(BANNER)
 
+SALES_SCHEMA = pa.schema(
+    [
+        ("date", pa.string()),
+        ("product", pa.string()),
+        ("quantity", pa.int64()),
+        ("price", pa.float64()),
+        ("total", pa.float64()),
+    ]
+)
+
 
 def fetch_page(base_url: str, year: int, month: int, page: int, per_page: int) -> Dict:
     """
@@ -110,6 +132,274 @@ def fetch_all_sales_concurrent(
     return all_data
 
 
+@log_execution
+def fetch_all_sales_async(
+    base_url: str,
+    year: int,
+    month: int,
+    per_page: int = 10,
+    sink: Optional[PageSink] = None,
+    max_concurrency: int = 64,
+) -> List[Dict]:
+    """
+    Consulta todas as páginas com asyncio e concorrência adaptativa (AIMD).
+
+    Uma única sessão keep-alive atende todas as requisições; o número de
+    requisições simultâneas cresce enquanto a latência se mantém e cai em
+    respostas 429/5xx, então não há quantidade de workers a ajustar. As
+    primeiras páginas são pedidas sem esperar a página 1.
+
+    Args:
+        base_url (str): URL base da API.
+        year (int): Ano desejado.
+        month (int): Mês desejado.
+        per_page (int): Quantidade de registros por página.
+        sink (Optional[PageSink]): Recebe (página, registros) em ordem de página.
+        max_concurrency (int): Teto do limite adaptativo.
+
+    Returns:
+        List[Dict]: Lista de todos os dados da API, em ordem de página.
+    """
+    limiter = AIMDLimiter(maximum=max_concurrency)
+    records, stats = asyncio.run(
+        fetch_pages_async(
+            base_url,
+            {"year": year, "month": month},
+            per_page=per_page,
+            sink=sink,
+            limiter=limiter,
+        )
+    )
+    log_extraction_stats(stats)
+    return records
+
+
+class CsvPageSink:
+    """
+    Sink que anexa cada página a um CSV assim que ela chega, em ordem.
+    """
+
+    def __init__(self, output_path: str) -> None:
+        """
+        Args:
+            output_path (str): Caminho do CSV de saída.
+        """
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self.output_path = output_path
+        self._file = open(output_path, "w", newline="", encoding="utf-8")
+        self._writer: Optional[csv.DictWriter] = None
+
+    def __call__(self, page: int, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(records[0]))
+            self._writer.writeheader()
+        self._writer.writerows(records)
+
+    def close(self) -> None:
+        """
+        Fecha o arquivo de saída.
+        """
+        self._file.close()
+
+
+class ParquetPageSink:
+    """
+    Sink que converte páginas em batches Arrow e grava um Parquet incremental.
+
+    Os registros de cada página viram um RecordBatch na hora; os batches são
+    acumulados só até row_group_size linhas e então gravados como um row
+    group, então o mês nunca fica inteiro em memória como dicionários
+    Python. O arquivo é gravado com nome temporário e só aparece no
+    destino em close().
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        schema: pa.Schema = SALES_SCHEMA,
+        settings: ParquetWriterSettings = ParquetWriterSettings(row_group_size=50_000),
+    ) -> None:
+        """
+        Args:
+            output_path (str): Caminho final do Parquet.
+            schema (pa.Schema): Esquema dos registros.
+            settings (ParquetWriterSettings): Opções do writer.
+        """
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self.output_path = output_path
+        self.schema = schema
+        self.settings = settings
+        self.rows = 0
+        self._tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        self._writer = pq.ParquetWriter(
+            self._tmp_path, schema, **settings.writer_options()
+        )
+        self._batches: List[pa.RecordBatch] = []
+        self._buffered = 0
+
+    def __call__(self, page: int, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        batch = pa.RecordBatch.from_pylist(records, schema=self.schema)
+        self._batches.append(batch)
+        self._buffered += batch.num_rows
+        self.rows += batch.num_rows
+        if self._buffered >= self.settings.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """
+        Grava os batches acumulados como um row group.
+        """
+        if self._batches:
+            self._writer.write_table(pa.Table.from_batches(self._batches))
+            self._batches, self._buffered = [], 0
+
+    def close(self, commit: bool = True) -> None:
+        """
+        Finaliza o arquivo e o move para o destino.
+
+        Args:
+            commit (bool): Se False (ex: extração falhou), descarta o arquivo.
+        """
+        if commit:
+            self._flush()
+        self._writer.close()
+        if commit:
+            os.replace(self._tmp_path, self.output_path)
+        elif os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+async def backfill_shard_async(
+    base_url: str, keys: List[Tuple[int, int]], per_page: int, output_dir: str
+) -> List[Dict[str, Any]]:
+    """
+    Extrai, em sequência, os meses de um shard direto para Parquet.
+
+    Cada mês usa o extrator assíncrono (páginas concorrentes, AIMD); a sessão
+    keep-alive é compartilhada entre os meses do shard.
+
+    Args:
+        base_url (str): URL base da API.
+        keys (List[Tuple[int, int]]): Pares (ano, mês) do shard.
+        per_page (int): Quantidade de registros por página.
+        output_dir (str): Raiz do dataset particionado (year=/month=).
+
+    Returns:
+        List[Dict[str, Any]]: Estatísticas de cada mês.
+    """
+    session = create_session(AIMDLimiter().maximum)
+    results = []
+    try:
+        for year, month in keys:
+            output_path = os.path.join(
+                output_dir, f"year={year}", f"month={month:02d}", "part-0.parquet"
+            )
+            sink = ParquetPageSink(output_path)
+            start_time = time.time()
+            try:
+                _, stats = await fetch_pages_async(
+                    base_url,
+                    {"year": year, "month": month},
+                    per_page=per_page,
+                    sink=sink,
+                    collect=False,
+                    session=session,
+                )
+            except Exception:
+                sink.close(commit=False)
+                raise
+            sink.close()
+            stats.update(
+                {
+                    "year": year,
+                    "month": month,
+                    "path": output_path,
+                    "end_to_end": time.time() - start_time,
+                    "pid": os.getpid(),
+                }
+            )
+            results.append(stats)
+    finally:
+        session.close()
+    return results
+
+
+def backfill_shard(
+    base_url: str, keys: List[Tuple[int, int]], per_page: int, output_dir: str
+) -> List[Dict[str, Any]]:
+    """
+    Ponto de entrada de cada processo: roda o shard em um loop de eventos próprio.
+
+    Args:
+        base_url (str): URL base da API.
+        keys (List[Tuple[int, int]]): Pares (ano, mês) do shard.
+        per_page (int): Quantidade de registros por página.
+        output_dir (str): Raiz do dataset particionado.
+
+    Returns:
+        List[Dict[str, Any]]: Estatísticas de cada mês.
+    """
+    return asyncio.run(backfill_shard_async(base_url, keys, per_page, output_dir))
+
+
+@log_execution
+def backfill_sales(
+    base_url: str,
+    keys: List[Tuple[int, int]],
+    per_page: int = 100,
+    output_dir: str = "data/outputs/exercicio_12/backfill",
+    n_processes: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Extrai muitos meses em paralelo, gravando um Parquet particionado por mês.
+
+    As chaves são distribuídas em round-robin entre os processos; dentro de
+    cada processo, as páginas de um mês são buscadas de forma assíncrona e
+    convertidas em batches Arrow, sem acumular o resultado como dicionários.
+
+    Args:
+        base_url (str): URL base da API.
+        keys (List[Tuple[int, int]]): Pares (ano, mês) a extrair.
+        per_page (int): Quantidade de registros por página.
+        output_dir (str): Raiz do dataset particionado (year=/month=).
+        n_processes (Optional[int]): Processos (padrão: núcleos disponíveis).
+
+    Returns:
+        List[Dict[str, Any]]: Estatísticas de cada mês, em ordem de chave.
+    """
+    n_processes = min(n_processes or os.cpu_count() or 1, len(keys)) or 1
+    shards = [keys[i::n_processes] for i in range(n_processes)]
+    start_time = time.time()
+
+    with ProcessPoolExecutor(max_workers=n_processes) as executor:
+        futures = [
+            executor.submit(backfill_shard, base_url, shard, per_page, output_dir)
+            for shard in shards
+            if shard
+        ]
+        results = [stats for future in futures for stats in future.result()]
+
+    results.sort(key=lambda stats: (stats["year"], stats["month"]))
+    for stats in results:
+        logger.info(
+            f"📅 {stats['year']}-{stats['month']:02d} [pid {stats['pid']}]: "
+            f"{stats['records']:,} registros, {stats['records_per_second']:,.0f} "
+            f"registros/s, {stats['end_to_end']:.2f}s de ponta a ponta"
+        )
+
+    elapsed = time.time() - start_time
+    total = sum(stats["records"] for stats in results)
+    logger.info(
+        f"🏁 Backfill: {len(results)} meses, {total:,} registros em {elapsed:.2f}s "
+        f"({total / elapsed:,.0f} registros/s, {n_processes} processos)"
+    )
+    return results
+
+
 def main():
     base_url = "http://localhost:8574/sales/"
     year = 2024
@@ -128,8 +418,26 @@ def main():
 
     compare_execution_times(end_seq - start_seq, end_conc - start_conc)
 
+    logger.info("Início da execução assíncrona (AIMD, gravando páginas em CSV)")
+    sink = CsvPageSink(f"data/outputs/exercicio_12/sales_{year}_{month:02d}.csv")
+    start_async = time.time()
+    try:
+        sales_async = fetch_all_sales_async(base_url, year, month, per_page, sink)
+    finally:
+        sink.close()
+    end_async = time.time()
+
+    compare_execution_times(end_seq - start_seq, end_async - start_async)
+
     logger.info(f"Total de registros sequencial: {len(sales_seq)}")
     logger.info(f"Total de registros concorrente: {len(sales_conc)}")
+    logger.info(f"Total de registros assíncrono: {len(sales_async)}")
+    if sales_async != sales_seq:
+        logger.error("❌ Extração assíncrona fora de ordem ou incompleta")
+
+    logger.info("Início do backfill de 2024 (um Parquet por mês)")
+    backfill_keys = [(year, m) for m in range(1, 13)]
+    backfill_sales(base_url, backfill_keys, per_page)
 
     logger.info("Exemplo de registros:")
     for sale in sales_conc[:5]:
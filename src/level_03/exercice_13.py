@@ -1,18 +1,26 @@
 import asyncio
+import glob
 import os
+import queue as queue_module
 import random
+import sqlite3
 import sys
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 from aiomultiprocess import Pool
+from aiomultiprocess.core import get_context
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 )
 
+from utils.adaptive_batcher import AdaptiveBatcher, BatchPolicy
 from utils.compare_times import compare_execution_times
 from utils.log_decorator import log_execution, logger
+from utils.sqlite_writer import SQLiteBatchWriter
 
 banner = """
 ================================================================================
@@ -26,6 +34,38 @@ logger.success(banner)
 
 SENTINEL: Dict[str, Any] = {"type": "SENTINEL"}
 
+ITEMS_DB_PATH = "./data/outputs/exercicio_13/items.db"
+
+CREATE_ITEMS_SQL = """
+CREATE TABLE IF NOT EXISTS items (
+    producer INTEGER,
+    value REAL,
+    timestamp REAL
+)
+"""
+INSERT_ITEM_SQL = "INSERT INTO items (producer, value, timestamp) VALUES (?, ?, ?)"
+
+# Começa com lotes de 5 itens e deixa a latência de escrita guiar o tamanho
+CONSUMER_POLICY = BatchPolicy(max_items=5, max_linger=0.2, target_latency=0.2)
+
+# Item trafegado entre processos: (produtor, sequência, valor, timestamp)
+Item = Tuple[int, int, float, float]
+
+ITEM_SCHEMA = pa.schema(
+    [
+        ("producer", pa.int32()),
+        ("sequence", pa.int64()),
+        ("value", pa.float64()),
+        ("timestamp", pa.float64()),
+    ]
+)
+
+# Bytes de um item (int32 + int64 + 2 × float64) na saída Parquet
+ITEM_BYTES = 28
+
+# Fila entre os processos produtores e consumidores, recebida no initializer
+_transport = None
+
 
 async def generate_item(producer_id: int) -> Dict[str, Any]:
     """
@@ -63,64 +103,78 @@ async def produce_data(
     logger.info(f"[PRODUCER {producer_id}] Finalizado.")
 
 
-async def batch_insert(batch: List[Dict[str, Any]]) -> None:
+async def batch_insert(writer: SQLiteBatchWriter, batch: List[Dict[str, Any]]) -> None:
     """
-    Simula escrita em lote.
+    Grava um lote no SQLite e aguarda a confirmação do COMMIT.
 
     Args:
+        writer (SQLiteBatchWriter): Escritor compartilhado pelos consumidores.
         batch (List[Dict[str, Any]]): Lista de itens.
     """
     logger.info(f"[BATCH] Persistindo {len(batch)} itens...")
-    await asyncio.sleep(0.1)
+    rows = [(item["producer"], item["value"], item["timestamp"]) for item in batch]
+    await writer.write(INSERT_ITEM_SQL, rows)
 
 
 async def consume_data(
-    queue: asyncio.Queue, consumer_id: int, batch_size: int = 5
+    queue: asyncio.Queue,
+    consumer_id: int,
+    writer: SQLiteBatchWriter,
+    policy: BatchPolicy = CONSUMER_POLICY,
 ) -> None:
     """
-    Consumidor assíncrono com persistência em lote.
+    Consumidor assíncrono com persistência em lote adaptativo.
+
+    O lote é gravado ao atingir o limite de itens, de bytes ou o tempo máximo
+    de espera, o que vier primeiro; o limite de itens se ajusta à latência
+    observada de batch_insert.
 
     Args:
         queue (asyncio.Queue): Fila compartilhada.
         consumer_id (int): ID do consumidor.
-        batch_size (int): Tamanho do lote.
+        writer (SQLiteBatchWriter): Escritor SQLite compartilhado.
+        policy (BatchPolicy): Limites de descarga do lote.
     """
-    batch: List[Dict[str, Any]] = []
+    batcher = AdaptiveBatcher(lambda batch: batch_insert(writer, batch), policy)
     while True:
         item = await queue.get()
         if item is SENTINEL:
-            if batch:
-                await batch_insert(batch)
-                batch.clear()
+            await batcher.close()
             queue.task_done()
             break
 
-        batch.append(item)
-        if len(batch) >= batch_size:
-            await batch_insert(batch)
-            batch.clear()
-
+        await batcher.add(item)
         queue.task_done()
 
+    batcher.log_report(f"CONSUMER {consumer_id}")
     logger.info(f"[CONSUMER {consumer_id}] Finalizado.")
 
 
 @log_execution
 async def run_asyncio(
-    num_producers: int = 5, num_consumers: int = 5, num_items: int = 10
+    num_producers: int = 5,
+    num_consumers: int = 5,
+    num_items: int = 10,
+    db_path: str = ITEMS_DB_PATH,
 ) -> float:
     """
     Orquestra execução assíncrona dos produtores e consumidores.
 
+    Todos os consumidores gravam pelo mesmo SQLiteBatchWriter, cuja thread
+    junta os lotes concorrentes em poucas transações.
+
     Args:
         num_producers (int): Número de produtores.
         num_consumers (int): Número de consumidores.
         num_items (int): Itens por produtor.
+        db_path (str): Banco SQLite de saída.
 
     Returns:
         float: Tempo de execução.
     """
     start = time.time()
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    writer = SQLiteBatchWriter(db_path, setup_script=CREATE_ITEMS_SQL)
     queue: asyncio.Queue = asyncio.Queue()
 
     producers = [
@@ -128,7 +182,8 @@ async def run_asyncio(
         for pid in range(num_producers)
     ]
     consumers = [
-        asyncio.create_task(consume_data(queue, cid)) for cid in range(num_consumers)
+        asyncio.create_task(consume_data(queue, cid, writer))
+        for cid in range(num_consumers)
     ]
 
     await asyncio.gather(*producers)
@@ -138,10 +193,411 @@ async def run_asyncio(
 
     await queue.join()
     await asyncio.gather(*consumers)
+    writer.close()
 
     return time.time() - start
 
 
+def init_transport(queue) -> None:
+    """
+    Guarda, em cada processo do pool, a fila de transporte entre processos.
+
+    Filas de multiprocessing só podem ser herdadas na criação do processo,
+    por isso chegam pelo initializer e não como argumento das tarefas.
+
+    Args:
+        queue: Fila de multiprocessing compartilhada.
+    """
+    global _transport
+    _transport = queue
+
+
+def cpu_bound_item(producer_id: int, sequence: int, work: int) -> Item:
+    """
+    Gera um item fazendo trabalho de CPU (em Python puro, segurando o GIL).
+
+    Args:
+        producer_id (int): Identificador global do produtor.
+        sequence (int): Número do item dentro do produtor.
+        work (int): Iterações de cálculo por item.
+
+    Returns:
+        Item: Tupla (produtor, sequência, valor, timestamp).
+    """
+    accumulator = producer_id * 1_000_003 + sequence
+    for i in range(work):
+        accumulator = (accumulator * 6_364_136_223 + i) % 2_147_483_647
+    return producer_id, sequence, accumulator / 2_147_483_647 * 100, time.time()
+
+
+async def transport_put(batch: Any) -> None:
+    """
+    Envia um lote (ou sentinela) pela fila entre processos sem bloquear o loop.
+
+    Args:
+        batch (Any): Lote de itens ou None.
+    """
+    await asyncio.get_running_loop().run_in_executor(None, _transport.put, batch)
+
+
+async def transport_get() -> Any:
+    """
+    Recebe um lote da fila entre processos sem bloquear o loop.
+
+    Returns:
+        Any: Lote de itens ou None (sentinela).
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, _transport.get)
+
+
+async def producer_process(
+    process_id: int,
+    producers: int,
+    num_items: int,
+    work: int,
+    transport_batch: int,
+) -> int:
+    """
+    Roda, em um processo do pool, vários produtores assíncronos.
+
+    Os itens são agrupados em lotes de transport_batch antes de cruzar a
+    fila entre processos, de modo que o custo de pickle e do pipe é pago por
+    lote, e não por item.
+
+    Args:
+        process_id (int): Índice do processo produtor.
+        producers (int): Produtores assíncronos neste processo.
+        num_items (int): Itens por produtor.
+        work (int): Iterações de CPU por item.
+        transport_batch (int): Itens por lote enviado.
+
+    Returns:
+        int: Itens produzidos pelo processo.
+    """
+
+    async def produce(producer_id: int) -> int:
+        batch: List[Item] = []
+        for sequence in range(num_items):
+            batch.append(cpu_bound_item(producer_id, sequence, work))
+            if len(batch) >= transport_batch:
+                await transport_put(batch)
+                batch = []
+            elif sequence % 64 == 0:
+                await asyncio.sleep(0)  # deixa os outros produtores avançarem
+        if batch:
+            await transport_put(batch)
+        return num_items
+
+    first_id = process_id * producers
+    counts = await asyncio.gather(*(produce(first_id + i) for i in range(producers)))
+
+    # put() só entrega o lote à thread alimentadora da fila; antes de
+    # reportar o fim (e o pai enviar as sentinelas), espera o envio de tudo
+    _transport.close()
+    await asyncio.get_running_loop().run_in_executor(None, _transport.join_thread)
+    return sum(counts)
+
+
+class ParquetBatchSink:
+    """
+    Destino de escrita em lote: cada lote vira um row group em um Parquet.
+    """
+
+    def __init__(self, output_path: str) -> None:
+        """
+        Args:
+            output_path (str): Arquivo Parquet do consumidor.
+        """
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self.output_path = output_path
+        self._tmp_path = f"{output_path}.tmp"
+        self._writer = pq.ParquetWriter(self._tmp_path, ITEM_SCHEMA)
+
+    async def write(self, items: List[Item]) -> None:
+        """
+        Grava um lote de itens (em uma thread, sem bloquear o loop).
+
+        Args:
+            items (List[Item]): Itens do lote.
+        """
+        columns = list(zip(*items))
+        table = pa.Table.from_arrays(
+            [pa.array(column) for column in columns], schema=ITEM_SCHEMA
+        )
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._writer.write_table, table
+        )
+
+    async def close(self) -> None:
+        """
+        Fecha o arquivo e o publica no caminho final.
+        """
+        self._writer.close()
+        os.replace(self._tmp_path, self.output_path)
+
+
+async def consumer_process(
+    process_id: int, consumers: int, output_dir: str, write_batch: int
+) -> int:
+    """
+    Roda, em um processo do pool, vários consumidores assíncronos.
+
+    Cada consumidor lê lotes da fila entre processos e os repassa a um
+    AdaptiveBatcher que grava no seu Parquet; termina ao receber a
+    sentinela None.
+
+    Args:
+        process_id (int): Índice do processo consumidor.
+        consumers (int): Consumidores assíncronos neste processo.
+        output_dir (str): Diretório dos arquivos Parquet.
+        write_batch (int): Itens por escrita no início (o batcher ajusta).
+
+    Returns:
+        int: Itens gravados pelo processo.
+    """
+
+    async def consume(consumer_id: int) -> int:
+        name = f"consumer-{process_id:02d}-{consumer_id:02d}"
+        sink = ParquetBatchSink(os.path.join(output_dir, f"{name}.parquet"))
+        batcher = AdaptiveBatcher(
+            sink.write,
+            BatchPolicy(
+                max_items=write_batch,
+                max_bytes=64 * 1024 * 1024,
+                max_linger=0.5,
+                target_latency=0.25,
+                max_items_limit=200_000,
+            ),
+            item_size=lambda item: ITEM_BYTES,
+        )
+        while True:
+            batch = await transport_get()
+            if batch is None:
+                break
+            await batcher.add_many(batch)
+        await batcher.close()
+        await sink.close()
+        batcher.log_report(name)
+        return int(sum(batcher.batch_sizes.values))
+
+    counts = await asyncio.gather(*(consume(i) for i in range(consumers)))
+    return sum(counts)
+
+
+def clear_consumer_outputs(output_dir: str) -> None:
+    """
+    Remove os Parquets de consumidores de execuções anteriores.
+
+    Cada execução grava consumer-PP-CC.parquet; com outra quantidade de
+    consumidores, arquivos antigos ficariam misturados aos novos.
+
+    Args:
+        output_dir (str): Diretório dos arquivos Parquet.
+    """
+    for path in glob.glob(os.path.join(output_dir, "consumer-*.parquet*")):
+        os.remove(path)
+
+
+async def wait_or_fail(
+    required: List[asyncio.Future], watched: List[asyncio.Future]
+) -> None:
+    """
+    Espera as tarefas required terminarem, desistindo no primeiro erro.
+
+    Erros das tarefas watched também interrompem a espera: se um consumidor
+    falha, os produtores ficariam presos para sempre na fila cheia.
+
+    Args:
+        required (List[asyncio.Future]): Tarefas que precisam concluir.
+        watched (List[asyncio.Future]): Tarefas acompanhadas só por erros.
+
+    Raises:
+        Exception: O primeiro erro encontrado; as demais tarefas são canceladas.
+    """
+    pending = set(required) | set(watched)
+    while not all(future.done() for future in required):
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            if future.cancelled() or future.exception() is not None:
+                for other in pending:
+                    other.cancel()
+                future.result()  # levanta o erro (ou CancelledError)
+
+
+async def send_sentinels(queue: Any, count: int) -> None:
+    """
+    Envia uma sentinela por consumidor sem bloquear uma thread.
+
+    Com a fila cheia, tenta de novo em vez de usar put() bloqueante: se os
+    consumidores morrerem, a tarefa pode ser cancelada.
+
+    Args:
+        queue (Any): Fila entre processos.
+        count (int): Quantidade de sentinelas.
+    """
+    for _ in range(count):
+        while True:
+            try:
+                queue.put_nowait(None)
+                break
+            except queue_module.Full:
+                await asyncio.sleep(0.01)
+
+
+@log_execution
+async def run_multiprocess(
+    producer_processes: int = 2,
+    consumer_processes: int = 1,
+    producers_per_process: int = 4,
+    consumers_per_process: int = 2,
+    num_items: int = 5_000,
+    work: int = 200,
+    transport_batch: int = 256,
+    write_batch: int = 10_000,
+    output_dir: str = "data/outputs/exercicio_13",
+) -> float:
+    """
+    Motor produtor/consumidor com vários processos, cada um com seu loop.
+
+    Produtores e consumidores rodam em pools separados do aiomultiprocess;
+    cada processo executa várias corrotinas. Os itens cruzam processos em
+    lotes por uma fila limitada (contrapressão) e os consumidores fazem
+    escritas reais em Parquet. Se algum processo falhar, as demais tarefas
+    são canceladas e os pools encerrados, em vez de os produtores esperarem
+    para sempre pela fila cheia.
+
+    Args:
+        producer_processes (int): Processos produtores.
+        consumer_processes (int): Processos consumidores.
+        producers_per_process (int): Produtores assíncronos por processo.
+        consumers_per_process (int): Consumidores assíncronos por processo.
+        num_items (int): Itens por produtor.
+        work (int): Iterações de CPU por item.
+        transport_batch (int): Itens por lote entre processos.
+        write_batch (int): Itens por escrita no Parquet.
+        output_dir (str): Diretório dos arquivos Parquet.
+
+    Returns:
+        float: Tempo de execução.
+    """
+    clear_consumer_outputs(output_dir)
+    start = time.time()
+    queue = get_context().Queue(maxsize=64)
+    n_consumers = consumer_processes * consumers_per_process
+
+    async with Pool(
+        processes=producer_processes,
+        initializer=init_transport,
+        initargs=(queue,),
+        childconcurrency=1,
+        maxtasksperchild=1,  # cada tarefa fecha a fila do seu processo
+    ) as producer_pool, Pool(
+        processes=consumer_processes,
+        initializer=init_transport,
+        initargs=(queue,),
+        childconcurrency=1,
+    ) as consumer_pool:
+        # Os consumidores precisam estar rodando antes de os produtores encherem a fila
+        consumers = [
+            asyncio.ensure_future(
+                consumer_pool.apply(
+                    consumer_process,
+                    (i, consumers_per_process, output_dir, write_batch),
+                )
+            )
+            for i in range(consumer_processes)
+        ]
+        producers = [
+            asyncio.ensure_future(
+                producer_pool.apply(
+                    producer_process,
+                    (i, producers_per_process, num_items, work, transport_batch),
+                )
+            )
+            for i in range(producer_processes)
+        ]
+        # Ao sair do bloco com erro, os pools terminam os processos restantes
+        await wait_or_fail(producers, consumers)
+        sentinels = asyncio.ensure_future(send_sentinels(queue, n_consumers))
+        await wait_or_fail([sentinels] + consumers, [])
+        produced = [producer.result() for producer in producers]
+        written = [consumer.result() for consumer in consumers]
+
+    elapsed = time.time() - start
+    logger.info(
+        f"🏭 {sum(produced):,} itens produzidos e {sum(written):,} gravados em "
+        f"{elapsed:.2f}s ({sum(written) / elapsed:,.0f} itens/s, "
+        f"{producer_processes} processos produtores)"
+    )
+    return elapsed
+
+
+async def benchmark_sqlite_writer(
+    db_path: str,
+    n_rows: int = 500_000,
+    n_tasks: int = 50,
+    n_threads: int = 4,
+    rows_per_submit: int = 500,
+) -> float:
+    """
+    Mede a vazão do SQLiteBatchWriter com muitas corrotinas e threads.
+
+    n_tasks corrotinas (via write) e n_threads threads (via submit) enviam
+    lotes pequenos ao mesmo tempo; no fim, a contagem da tabela confere que
+    todas as linhas confirmadas foram gravadas.
+
+    Args:
+        db_path (str): Banco SQLite do benchmark (recriado).
+        n_rows (int): Total de linhas enviadas.
+        n_tasks (int): Corrotinas escritoras.
+        n_threads (int): Threads escritoras.
+        rows_per_submit (int): Linhas por submissão.
+
+    Returns:
+        float: Linhas gravadas por segundo.
+    """
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+    senders = n_tasks + n_threads
+    rows_per_sender = n_rows // senders
+    row = (0, 42.0, time.time())
+
+    def chunks() -> List[List[Tuple[int, float, float]]]:
+        full, rest = divmod(rows_per_sender, rows_per_submit)
+        sizes = [rows_per_submit] * full + ([rest] if rest else [])
+        return [[row] * size for size in sizes]
+
+    async def coroutine_sender() -> None:
+        for rows in chunks():
+            await writer.write(INSERT_ITEM_SQL, rows)
+
+    def thread_sender() -> None:
+        for rows in chunks():
+            writer.submit(INSERT_ITEM_SQL, rows).result()
+
+    start = time.time()
+    with SQLiteBatchWriter(db_path, setup_script=CREATE_ITEMS_SQL) as writer:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(coroutine_sender() for _ in range(n_tasks)),
+            *(loop.run_in_executor(None, thread_sender) for _ in range(n_threads)),
+        )
+        elapsed = time.time() - start
+
+    with sqlite3.connect(db_path) as conn:
+        stored = conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    expected = rows_per_sender * senders
+    if stored != expected:
+        logger.error(f"❌ {stored:,} linhas no banco, {expected:,} confirmadas")
+    logger.info(
+        f"🗄️  {expected:,} linhas de {senders} escritores concorrentes em "
+        f"{elapsed:.2f}s ({expected / elapsed:,.0f} linhas/s)"
+    )
+    return expected / elapsed
+
+
 def main() -> None:
     logger.info("Executando versão asyncio + aiomultiprocess...")
     async_time = asyncio.run(
@@ -149,6 +605,22 @@ def main() -> None:
     )
     logger.info(f"Tempo asyncio: {async_time:.3f}s")
 
+    logger.info("Medindo a vazão do escritor SQLite compartilhado...")
+    asyncio.run(
+        benchmark_sqlite_writer("./data/outputs/exercicio_13/writer_benchmark.db")
+    )
+
+    # Com produtores que usam CPU, a vazão cresce com os processos
+    single_time = asyncio.run(run_multiprocess(producer_processes=1))
+    n_processes = max(2, os.cpu_count() or 1)
+    multi_time = asyncio.run(
+        run_multiprocess(
+            producer_processes=n_processes,
+            num_items=5_000 // n_processes,
+        )
+    )
+    compare_execution_times(single_time, multi_time)
+
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,30 @@
 import os
+import queue
+import shutil
 import sys
 import threading
 import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 )
 
+from utils.column_expressions import evaluate_columns
 from utils.compare_times import compare_execution_times
+from utils.file_ingest import (
+    ColumnType,
+    arrow_types,
+    ingest_folder,
+    list_input_files,
+    read_table,
+)
 from utils.log_decorator import log_execution, logger
 
 banner_exercicio_14 = """
@@ -25,20 +40,42 @@ banner_exercicio_14 = """
 
 logger.success(banner_exercicio_14)
 
-
-def ingest_data(folder_path: str) -> pd.DataFrame:
+# Tipos fixos das colunas de vendas: as datas continuam texto, como no
+# pd.read_csv, e nenhum arquivo depende da inferência de tipos
+SALES_DTYPES: Dict[str, ColumnType] = {
+    "date": "string",
+    "product": "string",
+    "quantity": "int64",
+    "price": "float64",
+    "total": "float64",
+}
+
+# Blocos em trânsito entre dois estágios da pipeline em fluxo
+STAGE_QUEUE_MAXSIZE = 4
+
+
+def ingest_data(
+    folder_path: str,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Dict[str, ColumnType]] = SALES_DTYPES,
+    pattern: str = "*.csv",
+) -> pd.DataFrame:
     """
-    Função que recebe uma pasta e devolve um dataframe
+    Função que recebe uma pasta e devolve um dataframe.
+
+    Os arquivos são lidos em paralelo pelo Arrow e concatenados uma única
+    vez, então o tempo cresce de forma linear com o número de arquivos.
+
     Args:
         folder_path (str): Caminho da pasta contendo os arquivos CSV.
+        columns (Optional[Sequence[str]]): Colunas a ler (padrão: todas).
+        dtypes (Optional[Dict[str, ColumnType]]): Tipos das colunas.
+        pattern (str): Filtro de nome dos arquivos.
 
     Returns:
         pd.DataFrame: DataFrame contendo os dados dos arquivos CSV.
     """
-    df = pd.DataFrame()
-    for file in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, file)
-        df = pd.concat([df, pd.read_csv(file_path)], ignore_index=True)
+    df = ingest_folder(folder_path, pattern, columns, dtypes).to_pandas()
 
     logger.info("Arquivos lidos com sucesso.")
     return df
@@ -71,6 +108,33 @@ def transform_data(
     return df
 
 
+def transform_data_fused(
+    df: pd.DataFrame,
+    discount_threshold: int = 10,
+    discount_rate: float = 0.10,
+) -> pd.DataFrame:
+    """
+    Mesmas regras de transform_data, avaliadas em blocos pelo avaliador de
+    expressões, sem um temporário do tamanho do DataFrame por operação.
+
+    Args:
+        df (pd.DataFrame): DataFrame original.
+        discount_threshold (int, opcional): Quantidade mínima para aplicar desconto. Default é 10.
+        discount_rate (float, opcional): Percentual de desconto. Default é 0.10 (10%).
+
+    Returns:
+        pd.DataFrame: DataFrame transformado.
+    """
+    return evaluate_columns(
+        df,
+        {
+            "discount_applied": "quantity >= threshold",
+            "discounted_total": "where(discount_applied, round(total * (1 - rate), 2), total)",
+        },
+        params={"threshold": discount_threshold, "rate": discount_rate},
+    )
+
+
 def save_dataframe_to_parquet(df: pd.DataFrame, output_path: str) -> None:
     """
     Salva o DataFrame em um arquivo parquet.
@@ -86,6 +150,105 @@ def save_dataframe_to_parquet(df: pd.DataFrame, output_path: str) -> None:
     logger.info(f"DataFrame salvo em: {output_path}")
 
 
+def iter_csv_chunks(
+    folder_path: str,
+    chunksize: Optional[int] = None,
+    dtypes: Optional[Dict[str, ColumnType]] = SALES_DTYPES,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê os CSVs de uma pasta em ordem de nome, um DataFrame por vez.
+
+    A leitura usa os mesmos tipos e o mesmo parser Arrow de ingest_data, então
+    todos os blocos, e as saídas das pipelines sequencial e em fluxo, têm o
+    mesmo schema.
+
+    Args:
+        folder_path (str): Caminho da pasta contendo os arquivos CSV.
+        chunksize (Optional[int]): Linhas por bloco; None emite um bloco por
+            arquivo.
+        dtypes (Optional[Dict[str, ColumnType]]): Tipos das colunas.
+
+    Yields:
+        pd.DataFrame: Próximo bloco de dados.
+    """
+    convert_options = pa_csv.ConvertOptions(column_types=arrow_types(dtypes))
+    for file_path in list_input_files(folder_path, formats=["csv"]):
+        if chunksize is None:
+            yield read_table(file_path, dtypes=dtypes).to_pandas()
+            continue
+
+        pending: List[pa.RecordBatch] = []
+        pending_rows = 0
+        for batch in pa_csv.open_csv(file_path, convert_options=convert_options):
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            while pending_rows >= chunksize:
+                table = pa.Table.from_batches(pending)
+                yield table.slice(0, chunksize).to_pandas()
+                rest = table.slice(chunksize)
+                pending, pending_rows = rest.to_batches(), rest.num_rows
+        if pending_rows:
+            yield pa.Table.from_batches(pending).to_pandas()
+
+
+def log_stage_stats(stats: Dict[str, Dict[str, Any]], elapsed: float) -> None:
+    """
+    Registra a ocupação de cada estágio da pipeline em fluxo.
+
+    "esperando" é o tempo parado sem entrada; "bloqueado" é o tempo parado
+    porque a fila seguinte estava cheia.
+
+    Args:
+        stats (Dict[str, Dict[str, Any]]): Métricas por estágio.
+        elapsed (float): Tempo total da pipeline.
+    """
+    for stage, stat in stats.items():
+        # Estágios com vários workers somam o tempo de todos eles
+        capacity = elapsed * stat["workers"]
+        logger.info(
+            f"⚙️  {stage} ({stat['workers']} worker(s)): {stat['chunks']} blocos, "
+            f"{stat['rows']:,} linhas, ocupado {stat['busy']:.2f}s "
+            f"({stat['busy'] / capacity:.0%}), esperando {stat['idle']:.2f}s, "
+            f"bloqueado {stat['blocked']:.2f}s"
+        )
+    rows = stats["escrita"]["rows"]
+    logger.info(
+        f"🏁 Pipeline: {rows:,} linhas em {elapsed:.2f}s "
+        f"({rows / elapsed:,.0f} linhas/s de ponta a ponta)"
+    )
+
+
+def compare_transforms(input_dir: str) -> None:
+    """
+    Compara transform_data com transform_data_fused sobre os mesmos dados.
+
+    Confere se as duas produzem o mesmo DataFrame e registra o tempo de cada
+    uma.
+
+    Args:
+        input_dir (str): Diretório dos arquivos CSV.
+    """
+    df = ingest_data(input_dir)
+
+    start_time = time.time()
+    df_pandas = transform_data(df.copy())
+    pandas_time = time.time() - start_time
+
+    start_time = time.time()
+    df_fused = transform_data_fused(df.copy())
+    fused_time = time.time() - start_time
+
+    logger.info(
+        f"🧮 {len(df):,} linhas | pandas: {pandas_time:.4f}s | "
+        f"blocos: {fused_time:.4f}s"
+    )
+    if df_fused.equals(df_pandas):
+        logger.success("✅ transform_data_fused coincide com transform_data")
+    else:
+        logger.error("❌ transform_data_fused diverge de transform_data")
+    compare_execution_times(pandas_time, fused_time)
+
+
 @log_execution
 def run_pipeline_sequential(input_dir: str, output_path: str) -> float:
     """
@@ -106,38 +269,167 @@ def run_pipeline_sequential(input_dir: str, output_path: str) -> float:
 
 
 @log_execution
-def run_pipeline_parallel(input_dir: str, output_path: str) -> float:
+def run_pipeline_parallel(
+    input_dir: str,
+    output_path: str,
+    n_transformers: int = 2,
+    chunksize: Optional[int] = None,
+    queue_maxsize: int = STAGE_QUEUE_MAXSIZE,
+) -> float:
     """
-    Executa a pipeline com paralelismo entre as etapas usando threading.
+    Executa a pipeline em fluxo: ingestão -> N transformadores -> escrita.
+
+    A ingestão emite um DataFrame por arquivo (ou por bloco de chunksize
+    linhas), os transformadores processam cada bloco assim que ele chega e a
+    escrita grava cada bloco como um row group em um único ParquetWriter,
+    na ordem de leitura. Filas limitadas ligam os estágios, então os três
+    trabalham ao mesmo tempo e a memória não depende do tamanho da entrada.
 
     Args:
         input_dir (str): Diretório dos arquivos CSV.
         output_path (str): Caminho de saída do parquet.
+        n_transformers (int): Threads de transformação.
+        chunksize (Optional[int]): Linhas por bloco (None = um por arquivo).
+        queue_maxsize (int): Capacidade das filas entre estágios.
 
     Returns:
         float: Tempo de execução.
+
+    Raises:
+        Exception: O primeiro erro ocorrido em qualquer estágio.
     """
     start_time = time.time()
-    shared_data = {}
-
-    def ingest():
-        shared_data["df"] = ingest_data(input_dir)
-
-    def transform():
-        while "df" not in shared_data:
-            time.sleep(0.1)  # espera ativa (não ideal para produção)
-        shared_data["df_transformed"] = transform_data(shared_data["df"])
-
-    def save():
-        while "df_transformed" not in shared_data:
-            time.sleep(0.1)
-        save_dataframe_to_parquet(shared_data["df_transformed"], output_path)
-
-    threads = [
-        threading.Thread(target=ingest),
-        threading.Thread(target=transform),
-        threading.Thread(target=save),
+    chunk_queue: queue.Queue = queue.Queue(maxsize=queue_maxsize)
+    result_queue: queue.Queue = queue.Queue(maxsize=queue_maxsize)
+    errors = []
+    saved = []
+    stats_lock = threading.Lock()
+    stats = {
+        stage: {
+            "workers": workers,
+            "chunks": 0,
+            "rows": 0,
+            "busy": 0.0,
+            "idle": 0.0,
+            "blocked": 0.0,
+        }
+        for stage, workers in [
+            ("ingestão", 1),
+            ("transformação", n_transformers),
+            ("escrita", 1),
+        ]
+    }
+
+    def record(stage: str, **values: float) -> None:
+        with stats_lock:
+            for key, value in values.items():
+                stats[stage][key] += value
+
+    def ingest() -> None:
+        chunks = iter_csv_chunks(input_dir, chunksize)
+        sequence = 0
+        try:
+            while not errors:
+                busy_start = time.perf_counter()
+                df = next(chunks, None)
+                if df is None:
+                    break
+                put_start = time.perf_counter()
+                chunk_queue.put((sequence, df))
+                record(
+                    "ingestão",
+                    chunks=1,
+                    rows=len(df),
+                    busy=put_start - busy_start,
+                    blocked=time.perf_counter() - put_start,
+                )
+                sequence += 1
+        except Exception as e:
+            errors.append(e)
+        finally:
+            for _ in range(n_transformers):
+                chunk_queue.put(None)
+
+    def transform() -> None:
+        while True:
+            wait_start = time.perf_counter()
+            item = chunk_queue.get()
+            busy_start = time.perf_counter()
+            record("transformação", idle=busy_start - wait_start)
+            if item is None:
+                break
+            if errors:
+                continue  # outro estágio falhou: só esvazia a fila
+            sequence, df = item
+            try:
+                df = transform_data(df)
+            except Exception as e:
+                errors.append(e)
+                continue
+            put_start = time.perf_counter()
+            result_queue.put((sequence, df))
+            record(
+                "transformação",
+                chunks=1,
+                rows=len(df),
+                busy=put_start - busy_start,
+                blocked=time.perf_counter() - put_start,
+            )
+        result_queue.put(None)
+
+    def save() -> None:
+        tmp_path = f"{output_path}.tmp"
+        writer = None
+        pending = {}
+        next_sequence = 0
+        finished = 0
+        try:
+            while finished < n_transformers:
+                wait_start = time.perf_counter()
+                item = result_queue.get()
+                busy_start = time.perf_counter()
+                record("escrita", idle=busy_start - wait_start)
+                if item is None:
+                    finished += 1
+                    continue
+                if errors:
+                    continue
+                sequence, df = item
+                pending[sequence] = df
+                # Os transformadores terminam fora de ordem; grava em ordem
+                while next_sequence in pending:
+                    df = pending.pop(next_sequence)
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp_path, table.schema)
+                    writer.write_table(table.cast(writer.schema))
+                    record("escrita", chunks=1, rows=len(df))
+                    next_sequence += 1
+                record("escrita", busy=time.perf_counter() - busy_start)
+        except Exception as e:
+            errors.append(e)
+            while finished < n_transformers:
+                finished += result_queue.get() is None
+        finally:
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception as e:
+                    errors.append(e)
+            if errors:
+                # Nada é publicado; o parquet parcial não deve ficar para trás
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            elif writer is not None:
+                os.replace(tmp_path, output_path)
+                saved.append(output_path)
+
+    threads = [threading.Thread(target=ingest, name="ingest")]
+    threads += [
+        threading.Thread(target=transform, name=f"transform-{i}")
+        for i in range(n_transformers)
     ]
+    threads.append(threading.Thread(target=save, name="save"))
 
     for thread in threads:
         thread.start()
@@ -145,7 +437,75 @@ def run_pipeline_parallel(input_dir: str, output_path: str) -> float:
     for thread in threads:
         thread.join()
 
-    return time.time() - start_time
+    if errors:
+        raise errors[0]
+
+    elapsed = time.time() - start_time
+    if saved:
+        logger.info(f"DataFrame salvo em: {output_path}")
+    else:
+        logger.warning(f"⚠️ Nenhum arquivo de entrada em {input_dir}; nada foi salvo")
+    log_stage_stats(stats, elapsed)
+    return elapsed
+
+
+def benchmark_ingest_scaling(
+    input_dir: str,
+    work_dir: str,
+    file_counts: Sequence[int] = (250, 500, 1000, 2000),
+    rows_per_file: int = 100,
+) -> List[Dict[str, float]]:
+    """
+    Mede como o tempo de ingestão cresce com o número de arquivos.
+
+    Os dados de input_dir são repetidos em N arquivos de rows_per_file
+    linhas; para cada N, compara ingest_data com o laço antigo que chamava
+    pd.concat a cada arquivo (custo quadrático). Cada pasta de partições é
+    apagada assim que sua medição termina.
+
+    Args:
+        input_dir (str): Pasta com os CSVs de origem.
+        work_dir (str): Pasta onde as partições são geradas.
+        file_counts (Sequence[int]): Quantidades de arquivos testadas.
+        rows_per_file (int): Linhas por arquivo gerado.
+
+    Returns:
+        List[Dict[str, float]]: files, concat_loop e ingest (segundos).
+    """
+    source = ingest_data(input_dir)
+    results = []
+    for n_files in file_counts:
+        partition_dir = os.path.join(work_dir, f"partitions_{n_files}")
+        os.makedirs(partition_dir, exist_ok=True)
+        try:
+            for i in range(n_files):
+                rows = np.arange(i * rows_per_file, (i + 1) * rows_per_file)
+                part = source.iloc[rows % len(source)]
+                part.to_csv(
+                    os.path.join(partition_dir, f"part-{i:05d}.csv"), index=False
+                )
+
+            start_time = time.time()
+            df = pd.DataFrame()
+            for file_path in list_input_files(partition_dir):
+                df = pd.concat([df, pd.read_csv(file_path)], ignore_index=True)
+            concat_loop = time.time() - start_time
+
+            start_time = time.time()
+            ingested = ingest_data(partition_dir)
+            ingest = time.time() - start_time
+        finally:
+            shutil.rmtree(partition_dir, ignore_errors=True)
+
+        if len(ingested) != len(df):
+            logger.error(f"❌ {n_files} arquivos: {len(ingested)} != {len(df)} linhas")
+        logger.info(
+            f"📂 {n_files} arquivos ({len(df):,} linhas): pd.concat a cada arquivo "
+            f"{concat_loop:.2f}s, ingest_data {ingest:.2f}s "
+            f"({ingest / n_files * 1000:.2f} ms/arquivo)"
+        )
+        results.append({"files": n_files, "concat_loop": concat_loop, "ingest": ingest})
+    return results
 
 
 def main():
@@ -160,6 +520,9 @@ def main():
     time_parallel = run_pipeline_parallel(input_dir, output_path)
     compare_execution_times(time_sequential, time_parallel)
 
+    compare_transforms(input_dir)
+    benchmark_ingest_scaling(input_dir, output_dir)
+
 
 if __name__ == "__main__":
     main()
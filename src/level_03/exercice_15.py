@@ -9,11 +9,26 @@ sys.path.insert(
 
 from utils.compare_times import compare_execution_times
 from utils.log_decorator import log_execution, logger
+from utils.mmap_scanner import scan_files
 
 LOGS_DIR = "logs"
 
 pattern = "error"
 
+# Tamanho do log sintético usado para medir a vazão do scanner
+LARGE_LOG_BYTES = 2 * 1024**3
+
+# Limite da amostra lida dos logs existentes para montar o log sintético
+LOG_SAMPLE_BYTES = 16 * 1024**2
+
+# Linhas fixas do log sintético: caixas e finais de linha variados
+SAMPLE_LINES = (
+    b"2024-01-01 12:00:00 | ERROR | falha ao gravar lote\n"
+    b"2024-01-01 12:00:01 | INFO | lote gravado\n"
+    b"2024-01-01 12:00:02 | WARNING | Error transitorio, repetindo\r\n"
+    b"2024-01-01 12:00:03 | INFO | sem erros\n"
+)
+
 
 @log_execution
 def analyze_log_file(file_path: str) -> int:
@@ -74,6 +89,97 @@ def analyze_logs_parallel(log_files: list[str]) -> float:
     return end_time - start_time
 
 
+def analyze_logs_mmap(log_files: list[str]) -> float:
+    """
+    Analisa arquivos de log com o scanner mmap, dividindo cada arquivo em
+    faixas processadas em paralelo.
+
+    Args:
+        log_files (list[str]): Lista de caminhos dos arquivos.
+
+    Returns:
+        float: Tempo total de execução em segundos.
+    """
+    counts, stats = scan_files(log_files, pattern)
+    for file_path, count in counts.items():
+        logger.info(
+            f"{os.path.basename(file_path)} - Encontrados {count} erros críticos."
+        )
+    logger.info(
+        f"🔎 {stats['bytes'] / 1e9:.2f} GB em {stats['ranges']} faixas, "
+        f"{stats['seconds']:.2f}s ({stats['gb_per_second']:.2f} GB/s)"
+    )
+    return stats["seconds"]
+
+
+def build_large_log(
+    log_files: list[str], output_path: str, target_bytes: int = LARGE_LOG_BYTES
+) -> str:
+    """
+    Gera um log grande repetindo os logs existentes e SAMPLE_LINES.
+
+    Args:
+        log_files (list[str]): Logs usados como amostra (até LOG_SAMPLE_BYTES).
+        output_path (str): Caminho do log gerado.
+        target_bytes (int): Tamanho mínimo do arquivo.
+
+    Returns:
+        str: Caminho do log gerado.
+    """
+    sample = bytearray(SAMPLE_LINES)
+    for file_path in log_files:
+        remaining = LOG_SAMPLE_BYTES - len(sample)
+        if remaining <= 0:
+            break
+        with open(file_path, "rb") as file:
+            sample += file.read(remaining)
+        if not sample.endswith(b"\n"):
+            sample += b"\n"
+
+    block = bytes(sample) * max(1, (64 * 1024 * 1024) // len(sample))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "wb") as file:
+        written = 0
+        while written < target_bytes:
+            written += file.write(block)
+    return output_path
+
+
+def benchmark_large_log(log_files: list[str], output_path: str) -> None:
+    """
+    Compara a leitura linha a linha com o scanner mmap em um único log grande.
+
+    O log gerado (LARGE_LOG_BYTES) é apagado ao final, mesmo em caso de erro.
+
+    Args:
+        log_files (list[str]): Logs usados como amostra.
+        output_path (str): Caminho do log grande.
+    """
+    try:
+        build_large_log(log_files, output_path)
+        size_gb = os.path.getsize(output_path) / 1e9
+
+        start_time = time.time()
+        expected = analyze_log_file(output_path)
+        line_time = time.time() - start_time
+
+        counts, stats = scan_files([output_path], pattern)
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+    if counts[output_path] == expected:
+        logger.success(f"✅ Contagens idênticas: {expected:,} linhas")
+    else:
+        logger.error(f"❌ mmap contou {counts[output_path]:,}, esperado {expected:,}")
+
+    logger.info(
+        f"📏 {size_gb:.2f} GB: linha a linha {size_gb / line_time:.2f} GB/s, "
+        f"mmap em {stats['ranges']} faixas {stats['gb_per_second']:.2f} GB/s"
+    )
+    compare_execution_times(line_time, stats["seconds"])
+
+
 def main():
     log_files = [
         os.path.join(LOGS_DIR, f) for f in os.listdir(LOGS_DIR) if f.endswith(".log")
@@ -85,6 +191,9 @@ def main():
 
     compare_execution_times(time_sequential, time_parallel)
 
+    analyze_logs_mmap(log_files)
+    benchmark_large_log(log_files, "data/outputs/exercicio_15/large.log")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,288 @@
+import asyncio
+import inspect
+import sys
+import time
+from collections import Counter
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Set
+
+from utils.log_decorator import logger
+
+
+class BatchPolicy(NamedTuple):
+    """
+    Regras de descarga de um AdaptiveBatcher: vale o limite atingido primeiro.
+
+    Attributes:
+        max_items (int): Itens por lote no início (ajustado em execução).
+        max_bytes (int): Bytes estimados por lote.
+        max_linger (float): Segundos máximos que um item espera no buffer.
+        target_latency (float): Latência de escrita desejada por lote; abaixo
+            dela o lote cresce, acima dela encolhe.
+        min_items (int): Menor limite de itens permitido na adaptação.
+        max_items_limit (int): Maior limite de itens permitido na adaptação.
+    """
+
+    max_items: int = 500
+    max_bytes: int = 4 * 1024 * 1024
+    max_linger: float = 0.05
+    target_latency: float = 0.05
+    min_items: int = 1
+    max_items_limit: int = 50_000
+
+
+class Histogram:
+    """
+    Histograma com baldes em potências de 2, para tamanhos e latências.
+    """
+
+    def __init__(self, unit: str = "", scale: float = 1.0) -> None:
+        """
+        Args:
+            unit (str): Unidade exibida no relatório (ex: "ms").
+            scale (float): Fator aplicado aos valores antes do registro.
+        """
+        self.unit = unit
+        self.scale = scale
+        self.values: List[float] = []
+
+    def record(self, value: float) -> None:
+        """
+        Registra um valor.
+
+        Args:
+            value (float): Valor observado (antes da escala).
+        """
+        self.values.append(value * self.scale)
+
+    def percentile(self, q: float) -> float:
+        """
+        Calcula um percentil dos valores registrados.
+
+        Args:
+            q (float): Percentil entre 0 e 100.
+
+        Returns:
+            float: Valor do percentil (0.0 se vazio).
+        """
+        if not self.values:
+            return 0.0
+        ordered = sorted(self.values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    def buckets(self) -> Counter:
+        """
+        Conta os valores por balde [2^k, 2^(k+1)).
+
+        Returns:
+            Counter: Limite superior do balde -> quantidade.
+        """
+        counts: Counter = Counter()
+        for value in self.values:
+            upper = 1.0
+            while value >= upper:
+                upper *= 2
+            counts[upper] += 1
+        return counts
+
+    def summary(self) -> str:
+        """
+        Resume a distribuição em uma linha (p50/p95/p99/máx e baldes).
+
+        Returns:
+            str: Texto do resumo.
+        """
+        if not self.values:
+            return "sem amostras"
+        buckets = ", ".join(
+            f"<{upper:g}{self.unit}: {count}"
+            for upper, count in sorted(self.buckets().items())
+        )
+        return (
+            f"n={len(self.values)} p50={self.percentile(50):.1f}{self.unit} "
+            f"p95={self.percentile(95):.1f}{self.unit} "
+            f"p99={self.percentile(99):.1f}{self.unit} "
+            f"máx={max(self.values):.1f}{self.unit} | {buckets}"
+        )
+
+
+class AdaptiveBatcher:
+    """
+    Acumula itens e os entrega a um destino em lotes.
+
+    O lote é descarregado quando atinge o limite de itens, o limite de bytes
+    ou o tempo máximo de espera do item mais antigo, o que vier primeiro.
+    Depois de cada escrita o limite de itens é ajustado: lotes cheios que
+    gravaram abaixo de target_latency fazem o limite crescer 50%; escritas
+    acima dela o reduzem em 30%. Serve para qualquer destino que aceite uma
+    lista de itens (função comum ou corrotina).
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[Any]], Any],
+        policy: BatchPolicy = BatchPolicy(),
+        item_size: Callable[[Any], int] = sys.getsizeof,
+    ) -> None:
+        """
+        Args:
+            write (Callable[[List[Any]], Any]): Destino dos lotes.
+            policy (BatchPolicy): Limites de descarga e adaptação.
+            item_size (Callable[[Any], int]): Estimativa de bytes por item.
+        """
+        self.write = write
+        self.policy = policy
+        self.item_size = item_size
+        self.batch_limit = policy.max_items
+
+        self.batch_sizes = Histogram()
+        self.item_latency = Histogram(unit="ms", scale=1000)
+        self.write_latency = Histogram(unit="ms", scale=1000)
+        self.flush_reasons: Counter = Counter()
+
+        self._buffer: List[Any] = []
+        self._arrivals: List[float] = []
+        self._bytes = 0
+        self._timer: Optional[asyncio.Task] = None
+        self._timer_flushes: Set[asyncio.Task] = set()
+        self._timer_error: Optional[Exception] = None
+        self._write_lock = asyncio.Lock()
+
+    async def add(self, item: Any) -> None:
+        """
+        Adiciona um item, descarregando o lote se algum limite for atingido.
+
+        Args:
+            item (Any): Item a gravar.
+
+        Raises:
+            Exception: Erro de uma descarga anterior feita pelo temporizador.
+        """
+        if self._timer_error is not None:
+            raise self._timer_error
+        self._buffer.append(item)
+        self._arrivals.append(time.monotonic())
+        self._bytes += self.item_size(item)
+
+        if len(self._buffer) >= self.batch_limit:
+            await self.flush("itens")
+        elif self._bytes >= self.policy.max_bytes:
+            await self.flush("bytes")
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._linger())
+
+    async def add_many(self, items: Iterable[Any]) -> None:
+        """
+        Adiciona vários itens em sequência.
+
+        Args:
+            items (Iterable[Any]): Itens a gravar.
+        """
+        for item in items:
+            await self.add(item)
+
+    async def _linger(self) -> None:
+        """
+        Descarrega o buffer quando o item mais antigo atinge max_linger.
+
+        Ninguém aguarda esta tarefa, então um erro de escrita é guardado e
+        levantado no próximo add() ou em close(), em vez de se perder.
+        """
+        await asyncio.sleep(self.policy.max_linger)
+        # A partir daqui a tarefa não é mais cancelada por flush(): a escrita
+        # já começou e close() espera por ela
+        self._timer = None
+        task = asyncio.current_task()
+        self._timer_flushes.add(task)
+        try:
+            await self.flush("tempo")
+        except Exception as e:
+            logger.error(f"❌ Falha ao gravar lote por tempo: {e}")
+            if self._timer_error is None:
+                self._timer_error = e
+        finally:
+            self._timer_flushes.discard(task)
+
+    async def flush(self, reason: str = "manual") -> None:
+        """
+        Grava o conteúdo atual do buffer como um lote.
+
+        O buffer é trocado antes da escrita, então novos itens continuam
+        chegando enquanto o lote anterior é gravado.
+
+        Args:
+            reason (str): Motivo da descarga (para as estatísticas).
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+
+        batch, arrivals = self._buffer, self._arrivals
+        self._buffer, self._arrivals, self._bytes = [], [], 0
+        filled = len(batch) >= self.batch_limit
+
+        async with self._write_lock:
+            start = time.monotonic()
+            result = self.write(batch)
+            if inspect.isawaitable(result):
+                await result
+            done = time.monotonic()
+
+        latency = done - start
+        self.flush_reasons[reason] += 1
+        self.batch_sizes.record(len(batch))
+        self.write_latency.record(latency)
+        for arrival in arrivals:
+            self.item_latency.record(done - arrival)
+        self._adapt(latency, filled)
+
+    def _adapt(self, latency: float, filled: bool) -> None:
+        """
+        Ajusta o limite de itens pela latência da última escrita.
+
+        Args:
+            latency (float): Duração da escrita do lote.
+            filled (bool): Se o lote atingiu o limite de itens.
+        """
+        policy = self.policy
+        if latency > policy.target_latency:
+            self.batch_limit = max(policy.min_items, int(self.batch_limit * 0.7))
+        elif filled:
+            self.batch_limit = min(
+                policy.max_items_limit,
+                max(self.batch_limit + 1, int(self.batch_limit * 1.5)),
+            )
+
+    async def close(self) -> None:
+        """
+        Descarrega os itens restantes e encerra o temporizador.
+
+        Só retorna depois que as escritas disparadas pelo temporizador
+        terminam, então o destino pode ser fechado em seguida.
+
+        Raises:
+            Exception: Erro de uma descarga feita pelo temporizador.
+        """
+        try:
+            await self.flush("fim")
+        finally:
+            if self._timer_flushes:
+                await asyncio.gather(*self._timer_flushes)
+        if self._timer_error is not None:
+            raise self._timer_error
+
+    def log_report(self, name: str = "batcher") -> None:
+        """
+        Registra os histogramas e os motivos de descarga.
+
+        Args:
+            name (str): Identificação do batcher no log.
+        """
+        reasons = ", ".join(f"{k}: {v}" for k, v in self.flush_reasons.most_common())
+        logger.info(
+            f"📦 [{name}] lotes ({reasons}), limite final {self.batch_limit} itens"
+        )
+        logger.info(f"📦 [{name}] tamanho do lote: {self.batch_sizes.summary()}")
+        logger.info(f"⏱️  [{name}] latência por item: {self.item_latency.summary()}")
+        logger.info(f"⏱️  [{name}] latência de escrita: {self.write_latency.summary()}")
@@ -0,0 +1,292 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.log_decorator import logger
+
+# Status que indicam sobrecarga do servidor: reduzem o limite e são repetidos
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Falhas de rede tratadas como sobrecarga: sem conexão ou sem resposta a tempo
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+PageSink = Callable[[int, List[Dict[str, Any]]], Any]
+
+
+class AIMDLimiter:
+    """
+    Limite de concorrência adaptativo (aumento aditivo, redução multiplicativa).
+
+    Cada resposta rápida soma 1/limite ao limite, o que equivale a +1 por
+    "janela" de requisições; uma resposta 429/5xx, um timeout, ou uma latência média
+    acima de latency_tolerance × a menor latência observada, multiplica o
+    limite por backoff_factor. As reduções respeitam um intervalo mínimo de uma
+    latência, para que uma rajada de erros conte como um único sinal.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        backoff_factor: float = 0.5,
+        latency_tolerance: float = 3.0,
+    ) -> None:
+        """
+        Args:
+            initial (int): Limite inicial de requisições simultâneas.
+            minimum (int): Limite mínimo.
+            maximum (int): Limite máximo.
+            backoff_factor (float): Fator aplicado ao limite em cada redução.
+            latency_tolerance (float): Múltiplo da menor latência aceito antes
+                de considerar o servidor congestionado.
+        """
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.min_latency: Optional[float] = None
+        self.smoothed_latency: Optional[float] = None
+        self.peak_limit = float(initial)
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """
+        Aguarda até haver vaga dentro do limite atual.
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, overloaded: bool = False) -> None:
+        """
+        Libera a vaga e ajusta o limite conforme o resultado da requisição.
+
+        Args:
+            latency (float): Duração da requisição, em segundos.
+            overloaded (bool): True se a resposta indicou sobrecarga (429/5xx)
+                ou a requisição falhou por conexão ou timeout.
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            if not overloaded:
+                self.min_latency = min(self.min_latency or latency, latency)
+                # Média móvel: um pico isolado de latência não reduz o limite
+                self.smoothed_latency = (
+                    latency
+                    if self.smoothed_latency is None
+                    else 0.8 * self.smoothed_latency + 0.2 * latency
+                )
+            baseline = self.min_latency or latency
+            slow = (self.smoothed_latency or 0.0) > self.latency_tolerance * baseline
+
+            now = time.monotonic()
+            if overloaded or slow:
+                if now - self._last_decrease > (self.min_latency or latency):
+                    self.limit = max(self.minimum, self.limit * self.backoff_factor)
+                    self.decreases += 1
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+            self._condition.notify_all()
+
+
+def create_session(pool_size: int) -> requests.Session:
+    """
+    Cria uma sessão HTTP com um único pool de conexões keep-alive.
+
+    Args:
+        pool_size (int): Conexões mantidas abertas para o host.
+
+    Returns:
+        requests.Session: Sessão configurada.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+async def fetch_pages_async(
+    base_url: str,
+    params: Dict[str, Any],
+    per_page: int = 100,
+    sink: Optional[PageSink] = None,
+    collect: bool = True,
+    limiter: Optional[AIMDLimiter] = None,
+    max_retries: int = 5,
+    session: Optional[requests.Session] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Extrai todas as páginas de uma API paginada com concorrência adaptativa.
+
+    Não espera a página 1 para começar: enquanto o total de páginas é
+    desconhecido, as primeiras páginas são pedidas especulativamente até o
+    limite atual; páginas além do total são descartadas. As requisições usam
+    uma única sessão (pool keep-alive) em threads, sem dependências novas.
+    As páginas são entregues ao sink e à lista de saída sempre em ordem,
+    assim que a página anterior tiver chegado.
+
+    Args:
+        base_url (str): URL da API.
+        params (Dict[str, Any]): Parâmetros fixos (ex: year e month).
+        per_page (int): Registros por página.
+        sink (Optional[PageSink]): Função (ou corrotina) chamada com
+            (página, registros) em ordem de página.
+        collect (bool): Se False, não acumula os registros em memória.
+        limiter (Optional[AIMDLimiter]): Limitador (um novo por padrão).
+        max_retries (int): Tentativas por página em 429/5xx, erro de rede ou
+            timeout.
+        session (Optional[requests.Session]): Sessão reaproveitada.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, Any]]: Registros em ordem de
+        página (vazio se collect=False) e estatísticas da extração.
+
+    Raises:
+        requests.HTTPError: Se uma página falhar após max_retries tentativas.
+        requests.RequestException: Se a última tentativa falhar por conexão
+            ou timeout.
+    """
+    limiter = limiter or AIMDLimiter()
+    own_session = session is None
+    session = session or create_session(limiter.maximum)
+    executor = ThreadPoolExecutor(max_workers=limiter.maximum)
+    loop = asyncio.get_running_loop()
+
+    stats = {"requests": 0, "retries": 0, "records": 0, "wasted": 0}
+    state = {"total_pages": None}
+    ready: Dict[int, List[Dict[str, Any]]] = {}
+    records: List[Dict[str, Any]] = []
+    next_to_emit = 1
+    start_time = time.time()
+
+    def get(page: int) -> Tuple[requests.Response, Optional[Dict[str, Any]]]:
+        # O parse do JSON também roda na thread, fora do loop de eventos
+        query = dict(params, page=page, per_page=per_page)
+        response = session.get(base_url, params=query, timeout=30)
+        return response, response.json() if response.ok else None
+
+    async def fetch(page: int) -> None:
+        for attempt in range(max_retries + 1):
+            await limiter.acquire()
+            started = time.monotonic()
+            error = None
+            try:
+                response, body = await loop.run_in_executor(executor, get, page)
+                overloaded = response.status_code in RETRY_STATUSES
+            except RETRY_ERRORS as e:
+                # Timeout também é sinal de sobrecarga: reduz o limite e repete
+                response, body, overloaded, error = None, None, True, e
+            await limiter.release(time.monotonic() - started, overloaded)
+            stats["requests"] += 1
+
+            if not overloaded:
+                response.raise_for_status()
+                state["total_pages"] = body["total_pages"]
+                ready[page] = body["data"]
+                return
+
+            if attempt == max_retries:
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+            stats["retries"] += 1
+            retry_after = None
+            if response is not None:
+                retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after else 0.1 * 2**attempt
+            await asyncio.sleep(delay)
+
+    async def emit_ready() -> None:
+        nonlocal next_to_emit
+        while next_to_emit in ready:
+            total = state["total_pages"]
+            if total is not None and next_to_emit > total:
+                break
+            data = ready.pop(next_to_emit)
+            if sink is not None:
+                result = sink(next_to_emit, data)
+                if inspect.isawaitable(result):
+                    await result
+            if collect:
+                records.extend(data)
+            stats["records"] += len(data)
+            next_to_emit += 1
+
+    tasks: Dict[int, asyncio.Task] = {}
+    next_page = 1
+    try:
+        while True:
+            total = state["total_pages"]
+            # Sem o total, as páginas especulativas ficam dentro do limite
+            # atual; depois dele, a janela só limita o buffer de reordenação
+            if total is None:
+                window = max(1, int(limiter.limit))
+            else:
+                window = 2 * limiter.maximum
+            if (total is None or next_page <= total) and len(tasks) < window:
+                tasks[next_page] = asyncio.create_task(fetch(next_page))
+                next_page += 1
+                await asyncio.sleep(0)
+            elif tasks:
+                await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_COMPLETED)
+            else:
+                break
+
+            for page, task in list(tasks.items()):
+                if task.done():
+                    task.result()
+                    del tasks[page]
+            await emit_ready()
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if own_session:
+            session.close()
+
+    stats["wasted"] = len(ready)
+
+    elapsed = time.time() - start_time
+    stats.update(
+        {
+            "pages": state["total_pages"] or 0,
+            "elapsed": elapsed,
+            "records_per_second": stats["records"] / elapsed if elapsed else 0.0,
+            "final_limit": limiter.limit,
+            "peak_limit": limiter.peak_limit,
+            "decreases": limiter.decreases,
+        }
+    )
+    return records, stats
+
+
+def log_extraction_stats(stats: Dict[str, Any]) -> None:
+    """
+    Registra as estatísticas devolvidas por fetch_pages_async.
+
+    Args:
+        stats (Dict[str, Any]): Estatísticas da extração.
+    """
+    logger.info(
+        f"🌐 {stats['records']:,} registros em {stats['pages']} páginas, "
+        f"{stats['elapsed']:.2f}s ({stats['records_per_second']:,.0f} registros/s); "
+        f"{stats['requests']} requisições, {stats['retries']} repetidas, "
+        f"{stats['wasted']} especulativas descartadas"
+    )
+    logger.info(
+        f"🎚️  Concorrência AIMD: final {stats['final_limit']:.1f}, "
+        f"pico {stats['peak_limit']:.1f}, {stats['decreases']} reduções"
+    )
@@ -0,0 +1,210 @@
+import ast
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+# Linhas por bloco: blocos de 128 KB por coluna float64 mantêm os temporários no cache
+DEFAULT_BLOCK_SIZE = 16_384
+
+BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.mod,
+    ast.Pow: np.power,
+    ast.BitAnd: np.logical_and,
+    ast.BitOr: np.logical_or,
+}
+
+COMPARE_OPERATORS = {
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+FUNCTIONS = {
+    "where": np.where,
+    "round": np.round,
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "log": np.log,
+    "exp": np.exp,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+}
+
+Evaluator = Callable[[Mapping[str, Any]], Any]
+
+
+def compile_expression(expression: str) -> Evaluator:
+    """
+    Converte uma expressão de colunas (ex: "A * B + 1") em uma função avaliável.
+
+    São aceitos nomes de colunas ou parâmetros, constantes, operadores
+    aritméticos, comparações, and/or/not (ou &, |, ~) e as funções de
+    FUNCTIONS. A função gerada recebe um dicionário nome -> bloco/valor.
+
+    Args:
+        expression (str): Expressão a compilar.
+
+    Returns:
+        Evaluator: Função que avalia a expressão sobre um ambiente.
+
+    Raises:
+        ValueError: Se a expressão usar construções não suportadas.
+    """
+    return _compile_node(ast.parse(expression, mode="eval").body, expression)
+
+
+def expression_names(expression: str) -> set:
+    """
+    Lista os nomes (colunas ou parâmetros) referenciados por uma expressão.
+
+    Args:
+        expression (str): Expressão de colunas.
+
+    Returns:
+        set: Nomes usados, sem as funções de FUNCTIONS.
+    """
+    tree = ast.parse(expression, mode="eval")
+    names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    return names - set(FUNCTIONS)
+
+
+def _compile_node(node: ast.AST, expression: str) -> Evaluator:
+    """
+    Compila recursivamente um nó da árvore sintática.
+
+    Args:
+        node (ast.AST): Nó a compilar.
+        expression (str): Expressão original, usada nas mensagens de erro.
+
+    Returns:
+        Evaluator: Função que avalia o nó sobre um ambiente.
+
+    Raises:
+        ValueError: Se o nó não for suportado.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, bool)):
+        value = node.value
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda env: env[name]
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        op = BINARY_OPERATORS[type(node.op)]
+        left, right = _compile_node(node.left, expression), _compile_node(
+            node.right, expression
+        )
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile_node(node.operand, expression)
+        if isinstance(node.op, ast.USub):
+            return lambda env: np.negative(operand(env))
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(node.op, (ast.Not, ast.Invert)):
+            return lambda env: np.logical_not(operand(env))
+
+    if isinstance(node, ast.BoolOp):
+        op = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        values = [_compile_node(value, expression) for value in node.values]
+
+        def bool_op(env):
+            result = values[0](env)
+            for value in values[1:]:
+                result = op(result, value(env))
+            return result
+
+        return bool_op
+
+    if (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and type(node.ops[0]) in COMPARE_OPERATORS
+    ):
+        op = COMPARE_OPERATORS[type(node.ops[0])]
+        left = _compile_node(node.left, expression)
+        right = _compile_node(node.comparators[0], expression)
+        return lambda env: op(left(env), right(env))
+
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in FUNCTIONS
+        and not node.keywords
+    ):
+        func = FUNCTIONS[node.func.id]
+        args = [_compile_node(arg, expression) for arg in node.args]
+        return lambda env: func(*(arg(env) for arg in args))
+
+    raise ValueError(
+        f"Construção não suportada em '{expression}': {ast.dump(node)[:60]}"
+    )
+
+
+def evaluate_columns(
+    df: pd.DataFrame,
+    expressions: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> pd.DataFrame:
+    """
+    Avalia expressões de colunas em blocos e grava as saídas no DataFrame.
+
+    Cada expressão é avaliada bloco a bloco; os temporários de cada operador
+    têm o tamanho do bloco (e não do DataFrame) e o resultado é escrito
+    direto na coluna de saída pré-alocada. As expressões são processadas em
+    ordem, de modo que uma expressão pode usar as saídas declaradas antes dela.
+    O tipo de cada saída é o tipo comum de todos os blocos, como em um
+    cálculo sobre a coluna inteira.
+
+    Args:
+        df (pd.DataFrame): DataFrame de entrada; as colunas de saída são
+            adicionadas (ou substituídas) nele.
+        expressions (Dict[str, str]): Nome da coluna de saída -> expressão.
+        params (Optional[Dict[str, Any]]): Escalares usados nas expressões.
+        block_size (int): Linhas avaliadas por bloco.
+
+    Returns:
+        pd.DataFrame: O próprio DataFrame, com as colunas calculadas.
+    """
+    params = params or {}
+    n_rows = len(df)
+
+    for name, expression in expressions.items():
+        evaluator = compile_expression(expression)
+        inputs = {
+            column: df[column].to_numpy()
+            for column in expression_names(expression)
+            if column in df.columns and column not in params
+        }
+
+        output = None
+        for start in range(0, n_rows, block_size):
+            stop = min(start + block_size, n_rows)
+            env = dict(params)
+            env.update({col: values[start:stop] for col, values in inputs.items()})
+
+            block = np.asarray(evaluator(env))
+            if output is None:
+                output = np.empty(n_rows, dtype=block.dtype)
+            elif not np.can_cast(block.dtype, output.dtype, casting="safe"):
+                # Um bloco posterior pode exigir um tipo mais largo (ex: int
+                # no primeiro bloco e float em outro): promove o já calculado
+                output = output.astype(np.promote_types(output.dtype, block.dtype))
+            output[start:stop] = block
+
+        # Atribui antes da próxima expressão para liberar o buffer de saída
+        df[name] = output if output is not None else np.empty(0)
+        del output, inputs
+    return df
@@ -130,7 +130,8 @@ def save_sales_data_to_sqlite(db_path: str, csv_files: List[str]) -> None:
             conn.commit()
 
             df = pd.read_csv(file)
-            records = df.to_records(index=False)
+            # Tipos Python nativos: numpy.int64 seria gravado como BLOB
+            records = df.itertuples(index=False, name=None)
             cursor.executemany(
                 f"""
                 INSERT INTO {table_name} (date, product, quantity, price, total)
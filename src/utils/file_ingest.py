@@ -0,0 +1,167 @@
+import fnmatch
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+from utils.format_converter import detect_format
+
+# Tipo de uma coluna: tipo Arrow ou apelido ("int64", "float64", "string"...)
+ColumnType = Union[pa.DataType, str]
+
+
+def arrow_types(dtypes: Optional[Dict[str, ColumnType]]) -> Dict[str, pa.DataType]:
+    """
+    Normaliza os tipos pedidos para tipos Arrow.
+
+    Args:
+        dtypes (Optional[Dict[str, ColumnType]]): Coluna -> tipo ou apelido.
+
+    Returns:
+        Dict[str, pa.DataType]: Coluna -> tipo Arrow.
+    """
+    return {
+        column: pa.type_for_alias(dtype) if isinstance(dtype, str) else dtype
+        for column, dtype in (dtypes or {}).items()
+    }
+
+
+def list_input_files(
+    folder_path: str,
+    pattern: Optional[str] = None,
+    formats: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """
+    Lista, em ordem de nome, os arquivos de dados de uma pasta.
+
+    Arquivos de formato não reconhecido (ex: .DS_Store, _SUCCESS, .tmp) são
+    ignorados.
+
+    Args:
+        folder_path (str): Pasta de entrada.
+        pattern (Optional[str]): Filtro de nome no estilo glob (ex: "sales_2024_*").
+        formats (Optional[Sequence[str]]): Formatos aceitos (padrão: todos).
+
+    Returns:
+        List[str]: Caminhos dos arquivos selecionados.
+    """
+    paths = []
+    for name in sorted(os.listdir(folder_path)):
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        path = os.path.join(folder_path, name)
+        try:
+            file_format = detect_format(path)
+        except ValueError:
+            continue
+        if os.path.isfile(path) and (formats is None or file_format in formats):
+            paths.append(path)
+    return paths
+
+
+def read_table(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Dict[str, ColumnType]] = None,
+) -> pa.Table:
+    """
+    Lê um arquivo inteiro como tabela Arrow, só com as colunas pedidas.
+
+    No CSV, a projeção e os tipos são aplicados durante o parse, então
+    colunas descartadas nem chegam a ser convertidas.
+
+    Args:
+        path (str): Arquivo de entrada (csv, parquet, arrow ou ndjson).
+        columns (Optional[Sequence[str]]): Colunas a manter, nesta ordem.
+        dtypes (Optional[Dict[str, ColumnType]]): Tipos de colunas.
+
+    Returns:
+        pa.Table: Dados do arquivo.
+    """
+    file_format = detect_format(path)
+    types = arrow_types(dtypes)
+
+    if file_format == "csv":
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=list(columns) if columns else None,
+            column_types=types,
+        )
+        return pa_csv.read_csv(path, convert_options=convert_options)
+
+    if file_format == "parquet":
+        table = pq.read_table(path, columns=list(columns) if columns else None)
+    elif file_format == "arrow":
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+    else:
+        table = pa_json.read_json(path)
+
+    if columns:
+        table = table.select(list(columns))
+    for column, dtype in types.items():
+        index = table.schema.get_field_index(column)
+        if index >= 0 and table.schema.field(index).type != dtype:
+            table = table.set_column(index, column, table.column(index).cast(dtype))
+    return table
+
+
+def ingest_files(
+    paths: Sequence[str],
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Dict[str, ColumnType]] = None,
+    max_workers: Optional[int] = None,
+) -> pa.Table:
+    """
+    Lê vários arquivos em paralelo e os junta em uma única concatenação.
+
+    Os leitores do Arrow liberam o GIL, então threads bastam. A concatenação
+    de tabelas Arrow só junta as listas de blocos (sem copiar os dados), o que
+    mantém o custo linear no número de arquivos, ao contrário de chamar
+    pd.concat a cada arquivo lido.
+
+    Args:
+        paths (Sequence[str]): Arquivos de entrada; a ordem é preservada.
+        columns (Optional[Sequence[str]]): Colunas a manter.
+        dtypes (Optional[Dict[str, ColumnType]]): Tipos de colunas; sem eles,
+            tipos inferidos diferentes (ex: int64 e double) são promovidos.
+        max_workers (Optional[int]): Threads de leitura (padrão do executor).
+
+    Returns:
+        pa.Table: Todos os arquivos, na ordem de paths.
+    """
+    if not paths:
+        return pa.table({})
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tables = list(
+            executor.map(lambda path: read_table(path, columns, dtypes), paths)
+        )
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def ingest_folder(
+    folder_path: str,
+    pattern: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    dtypes: Optional[Dict[str, ColumnType]] = None,
+    max_workers: Optional[int] = None,
+) -> pa.Table:
+    """
+    Lê os arquivos de dados de uma pasta com ingest_files.
+
+    Args:
+        folder_path (str): Pasta de entrada.
+        pattern (Optional[str]): Filtro de nome no estilo glob.
+        columns (Optional[Sequence[str]]): Colunas a manter.
+        dtypes (Optional[Dict[str, ColumnType]]): Tipos de colunas.
+        max_workers (Optional[int]): Threads de leitura.
+
+    Returns:
+        pa.Table: Dados da pasta.
+    """
+    paths = list_input_files(folder_path, pattern)
+    return ingest_files(paths, columns, dtypes, max_workers)
@@ -0,0 +1,676 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.log_decorator import logger
+
+FORMATS = ("csv", "parquet", "arrow", "ndjson")
+
+EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "ndjson",
+}
+
+OUTPUT_EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+    "ndjson": ".ndjson",
+}
+
+# Codecs aceitos por formato; CSV e NDJSON são comprimidos como stream inteiro
+CODECS = {
+    "parquet": ("none", "snappy", "gzip", "zstd", "lz4", "brotli"),
+    "arrow": ("none", "lz4", "zstd"),
+    "csv": ("none", "gzip", "bz2", "zstd", "lz4"),
+    "ndjson": ("none", "gzip", "bz2", "zstd", "lz4"),
+}
+
+STREAM_SUFFIXES = {"gzip": ".gz", "bz2": ".bz2", "zstd": ".zst", "lz4": ".lz4"}
+
+DEFAULT_BATCH_SIZE = 65_536
+DEFAULT_ROW_GROUP_SIZE = 1_000_000
+
+# Tipos testados, em ordem de preferência, ao inferir um CSV pelo arquivo
+# inteiro; colunas que não aceitam nenhum deles ficam como string
+CSV_INFERENCE_TYPES = (
+    pa.int64(),
+    pa.float64(),
+    pa.bool_(),
+    pa.date32(),
+    pa.timestamp("s"),
+    pa.timestamp("ns"),
+)
+
+
+class ConversionResult(NamedTuple):
+    """
+    Resultado da conversão de um arquivo.
+
+    Attributes:
+        source (str): Arquivo de entrada.
+        target (str): Arquivo gerado.
+        rows (int): Linhas convertidas.
+        input_bytes (int): Tamanho do arquivo de entrada.
+        seconds (float): Duração da conversão.
+        error (Optional[str]): Mensagem de erro, se a conversão falhou.
+    """
+
+    source: str
+    target: str
+    rows: int
+    input_bytes: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def parse_column_types(text: str) -> Dict[str, pa.DataType]:
+    """
+    Converte "coluna:tipo,coluna:tipo" em tipos Arrow.
+
+    Args:
+        text (str): Pares separados por vírgula (ex: "quantity:int64,price:float64").
+
+    Returns:
+        Dict[str, pa.DataType]: Coluna -> tipo Arrow.
+
+    Raises:
+        ValueError: Se um par estiver malformado ou o tipo não existir.
+    """
+    types = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        column, sep, alias = item.rpartition(":")
+        if not sep or not column:
+            raise ValueError(f"Esperado coluna:tipo, recebido '{item}'")
+        types[column] = pa.type_for_alias(alias.strip())
+    return types
+
+
+def infer_csv_types(
+    path: str, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, pa.DataType]:
+    """
+    Infere os tipos de um CSV olhando o arquivo inteiro, em streaming.
+
+    O leitor em streaming do Arrow decide os tipos pelo primeiro bloco; uma
+    coluna que muda depois (int -> float, número -> texto) quebra a leitura.
+    Aqui o arquivo é lido como texto e, para cada coluna, fica o primeiro
+    tipo de CSV_INFERENCE_TYPES que aceita todos os valores.
+
+    Args:
+        path (str): Arquivo CSV.
+        batch_size (int): Bytes por bloco de leitura.
+
+    Returns:
+        Dict[str, pa.DataType]: Coluna -> tipo inferido.
+    """
+    names = pa_csv.open_csv(path).schema.names
+    convert_options = pa_csv.ConvertOptions(
+        column_types={name: pa.string() for name in names},
+        strings_can_be_null=True,
+    )
+    candidates = {name: list(CSV_INFERENCE_TYPES) for name in names}
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=max(batch_size, 1 << 20)),
+        convert_options=convert_options,
+    )
+    for batch in reader:
+        for name, column in zip(names, batch.columns):
+            surviving = []
+            for dtype in candidates[name]:
+                try:
+                    pc.cast(column, dtype)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    continue
+                surviving.append(dtype)
+            candidates[name] = surviving
+    return {
+        name: types[0] if types else pa.string() for name, types in candidates.items()
+    }
+
+
+def detect_format(path: str) -> str:
+    """
+    Descobre o formato de um arquivo pela extensão (ignorando .gz, .zst etc.).
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        str: Um dos FORMATS.
+
+    Raises:
+        ValueError: Se a extensão não for reconhecida.
+    """
+    root, ext = os.path.splitext(path.lower())
+    if ext in STREAM_SUFFIXES.values():
+        root, ext = os.path.splitext(root)
+    if ext not in EXTENSIONS:
+        raise ValueError(f"Formato não reconhecido para o arquivo: {path}")
+    return EXTENSIONS[ext]
+
+
+def read_batches(
+    path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    column_types: Optional[Dict[str, pa.DataType]] = None,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Lê um arquivo em record batches, sem carregá-lo inteiro na memória.
+
+    Args:
+        path (str): Arquivo de entrada (csv, parquet, arrow ou ndjson).
+        batch_size (int): Linhas por batch, quando o formato permite escolher.
+        column_types (Optional[Dict[str, pa.DataType]]): Tipos fixos de
+            colunas do CSV; as demais são inferidas pelo primeiro bloco.
+
+    Yields:
+        pa.RecordBatch: Próximo batch do arquivo.
+    """
+    file_format = detect_format(path)
+
+    if file_format == "parquet":
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+
+    elif file_format == "arrow":
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+
+    elif file_format == "csv":
+        convert_options = pa_csv.ConvertOptions(column_types=column_types or {})
+        yield from pa_csv.open_csv(path, convert_options=convert_options)
+
+    else:
+        with pa.input_stream(path) as source:
+            yield from pa_json.open_json(source)
+
+
+def temporal_as_string(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """
+    Converte colunas de data/hora em texto ISO, preservando o valor original.
+
+    Sem isso, o pandas transformaria datas (date32) em timestamps ao gerar JSON.
+
+    Args:
+        batch (pa.RecordBatch): Batch de entrada.
+
+    Returns:
+        pa.RecordBatch: Batch com colunas temporais como string.
+    """
+    columns = [
+        column.cast(pa.string()) if pa.types.is_temporal(column.type) else column
+        for column in batch.columns
+    ]
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+
+def json_value(value: Any) -> Any:
+    """
+    Ajusta um valor de to_pylist() para json.dumps.
+
+    NaN e infinito não existem em JSON e viram null; os demais valores passam
+    intactos (floats com todos os dígitos, inteiros como inteiros).
+
+    Args:
+        value (Any): Valor de uma célula.
+
+    Returns:
+        Any: Valor serializável.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def ndjson_lines(batch: pa.RecordBatch) -> str:
+    """
+    Serializa um batch como NDJSON, sem perda de precisão.
+
+    Diferente de DataFrame.to_json, não arredonda floats (double_precision)
+    nem transforma inteiros anuláveis em floats. Datas viram texto ISO;
+    decimais e outros tipos sem equivalente JSON viram str.
+
+    Args:
+        batch (pa.RecordBatch): Batch a serializar.
+
+    Returns:
+        str: Uma linha JSON por registro, cada uma terminada em \\n.
+    """
+    return "".join(
+        json.dumps(
+            {key: json_value(value) for key, value in row.items()},
+            ensure_ascii=False,
+            default=str,
+        )
+        + "\n"
+        for row in temporal_as_string(batch).to_pylist()
+    )
+
+
+class BatchWriter:
+    """
+    Escritor incremental de record batches para qualquer formato de saída.
+
+    No Parquet os batches são acumulados até row_group_size linhas para que
+    cada row group tenha o tamanho pedido, independente do tamanho do batch.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        file_format: str,
+        schema: pa.Schema,
+        compression: str = "none",
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ) -> None:
+        """
+        Args:
+            path (str): Arquivo de saída.
+            file_format (str): Um dos FORMATS.
+            schema (pa.Schema): Schema dos batches.
+            compression (str): Codec (ver CODECS).
+            row_group_size (int): Linhas por row group (apenas Parquet).
+
+        Raises:
+            ValueError: Se o codec não for suportado pelo formato.
+        """
+        if compression not in CODECS[file_format]:
+            raise ValueError(
+                f"Codec '{compression}' não suportado para {file_format}. "
+                f"Use um de: {', '.join(CODECS[file_format])}."
+            )
+
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._pending: List[pa.RecordBatch] = []
+        self._pending_rows = 0
+        self._stream = None
+        codec = None if compression == "none" else compression
+
+        if file_format == "parquet":
+            self._writer = pq.ParquetWriter(path, schema, compression=codec or "none")
+        elif file_format == "arrow":
+            options = pa.ipc.IpcWriteOptions(compression=codec)
+            self._writer = pa.ipc.new_file(path, schema, options=options)
+        else:
+            self._stream = pa.output_stream(path, compression=codec)
+            if file_format == "csv":
+                self._writer = pa_csv.CSVWriter(self._stream, schema)
+            else:
+                self._writer = None
+
+    def write(self, batch: pa.RecordBatch) -> None:
+        """
+        Grava (ou acumula, no caso do Parquet) um record batch.
+
+        Args:
+            batch (pa.RecordBatch): Batch a gravar.
+        """
+        self.rows += batch.num_rows
+
+        if self.file_format == "parquet":
+            self._pending.append(batch)
+            self._pending_rows += batch.num_rows
+            if self._pending_rows >= self.row_group_size:
+                self._flush_row_groups()
+        elif self.file_format == "ndjson":
+            self._stream.write(ndjson_lines(batch).encode("utf-8"))
+        else:
+            self._writer.write_batch(batch)
+
+    def _flush_row_groups(self) -> None:
+        """
+        Grava os batches acumulados em row groups de row_group_size linhas.
+        """
+        if not self._pending:
+            return
+        table = pa.Table.from_batches(self._pending)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self._pending, self._pending_rows = [], 0
+
+    def close(self) -> None:
+        """
+        Finaliza o arquivo de saída.
+        """
+        if self.file_format == "parquet":
+            self._flush_row_groups()
+        if self._writer is not None:
+            self._writer.close()
+        if self._stream is not None:
+            self._stream.close()
+
+
+def output_path_for(
+    source: str, output_dir: str, target_format: str, compression: str
+) -> str:
+    """
+    Monta o caminho de saída a partir do nome do arquivo de entrada.
+
+    Args:
+        source (str): Arquivo de entrada.
+        output_dir (str): Diretório de saída.
+        target_format (str): Formato de saída.
+        compression (str): Codec (CSV/NDJSON recebem sufixo como .gz).
+
+    Returns:
+        str: Caminho do arquivo de saída.
+    """
+    name = os.path.basename(source)
+    root, ext = os.path.splitext(name)
+    if ext.lower() in STREAM_SUFFIXES.values():
+        root = os.path.splitext(root)[0]
+
+    path = os.path.join(output_dir, root + OUTPUT_EXTENSIONS[target_format])
+    if target_format in ("csv", "ndjson") and compression != "none":
+        path += STREAM_SUFFIXES[compression]
+    return path
+
+
+def convert_file(
+    source: str,
+    target: str,
+    target_format: Optional[str] = None,
+    compression: str = "none",
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    column_types: Optional[Dict[str, pa.DataType]] = None,
+) -> ConversionResult:
+    """
+    Converte um arquivo entre formatos, em streaming de record batches.
+
+    O arquivo é gravado com sufixo .tmp e renomeado ao final, para que uma
+    conversão interrompida não deixe uma saída incompleta com o nome final.
+    Se um CSV muda o tipo de uma coluna depois do primeiro bloco, a
+    conversão é refeita com os tipos inferidos pelo arquivo inteiro
+    (infer_csv_types); column_types sempre prevalece.
+
+    Args:
+        source (str): Arquivo de entrada.
+        target (str): Arquivo de saída.
+        target_format (Optional[str]): Formato de saída (padrão: pela extensão).
+        compression (str): Codec de saída.
+        row_group_size (int): Linhas por row group (saída Parquet).
+        batch_size (int): Linhas por batch de leitura.
+        column_types (Optional[Dict[str, pa.DataType]]): Tipos fixos de
+            colunas de entrada CSV.
+
+    Returns:
+        ConversionResult: Linhas, bytes e duração da conversão.
+    """
+    start_time = time.perf_counter()
+    target_format = target_format or detect_format(target)
+    try:
+        rows = write_converted(
+            source,
+            target,
+            target_format,
+            compression,
+            row_group_size,
+            batch_size,
+            column_types,
+        )
+    except pa.ArrowInvalid as e:
+        if detect_format(source) != "csv":
+            raise
+        logger.warning(
+            f"⚠️ {os.path.basename(source)}: tipos mudaram ao longo do CSV ({e}); "
+            "inferindo pelo arquivo inteiro"
+        )
+        types = {**infer_csv_types(source), **(column_types or {})}
+        rows = write_converted(
+            source,
+            target,
+            target_format,
+            compression,
+            row_group_size,
+            batch_size,
+            types,
+        )
+
+    return ConversionResult(
+        source,
+        target,
+        rows,
+        os.path.getsize(source),
+        time.perf_counter() - start_time,
+    )
+
+
+def write_converted(
+    source: str,
+    target: str,
+    target_format: str,
+    compression: str,
+    row_group_size: int,
+    batch_size: int,
+    column_types: Optional[Dict[str, pa.DataType]],
+) -> int:
+    """
+    Faz uma tentativa de conversão, publicando a saída só se tudo der certo.
+
+    Args:
+        source (str): Arquivo de entrada.
+        target (str): Arquivo de saída.
+        target_format (str): Formato de saída.
+        compression (str): Codec de saída.
+        row_group_size (int): Linhas por row group (saída Parquet).
+        batch_size (int): Linhas por batch de leitura.
+        column_types (Optional[Dict[str, pa.DataType]]): Tipos fixos do CSV.
+
+    Returns:
+        int: Linhas gravadas.
+    """
+    tmp_target = target + ".tmp"
+    writer = None
+    try:
+        for batch in read_batches(source, batch_size, column_types):
+            if writer is None:
+                writer = BatchWriter(
+                    tmp_target, target_format, batch.schema, compression, row_group_size
+                )
+            writer.write(batch)
+
+        if writer is None:  # arquivo sem linhas: grava apenas o schema
+            schema = (
+                pq.read_schema(source) if detect_format(source) == "parquet" else None
+            )
+            writer = BatchWriter(
+                tmp_target, target_format, schema or pa.schema([]), compression
+            )
+        writer.close()
+        os.replace(tmp_target, target)
+    except Exception:
+        if os.path.exists(tmp_target):
+            os.remove(tmp_target)
+        raise
+    return writer.rows
+
+
+def convert_files(
+    sources: List[str],
+    output_dir: str,
+    target_format: str,
+    compression: str = "none",
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    n_workers: Optional[int] = None,
+    column_types: Optional[Dict[str, pa.DataType]] = None,
+) -> List[ConversionResult]:
+    """
+    Converte vários arquivos em paralelo, agendando os maiores primeiro.
+
+    Submeter os arquivos em ordem decrescente de tamanho evita que um arquivo
+    grande comece por último e segure o pool sozinho no final. Um arquivo que
+    falha não interrompe os demais: o erro é registrado e aparece no resumo.
+
+    Args:
+        sources (List[str]): Arquivos de entrada.
+        output_dir (str): Diretório de saída.
+        target_format (str): Formato de saída.
+        compression (str): Codec de saída.
+        row_group_size (int): Linhas por row group (saída Parquet).
+        n_workers (Optional[int]): Processos (padrão: núcleos disponíveis).
+        column_types (Optional[Dict[str, pa.DataType]]): Tipos fixos de
+            colunas de entrada CSV.
+
+    Returns:
+        List[ConversionResult]: Resultados na ordem de conclusão; os que
+        falharam têm error preenchido.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    ordered = sorted(sources, key=os.path.getsize, reverse=True)
+    results = []
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = {
+            executor.submit(
+                convert_file,
+                source,
+                output_path_for(source, output_dir, target_format, compression),
+                target_format,
+                compression,
+                row_group_size,
+                column_types=column_types,
+            ): source
+            for source in ordered
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"❌ Falha ao converter {source}: {e}")
+                results.append(
+                    ConversionResult(
+                        source, "", 0, os.path.getsize(source), 0.0, error=str(e)
+                    )
+                )
+                continue
+            results.append(result)
+            mb = result.input_bytes / 1024**2
+            logger.info(
+                f"📄 {os.path.basename(result.source)} → "
+                f"{os.path.basename(result.target)}: {result.rows:,} linhas, "
+                f"{mb:.1f} MB em {result.seconds:.2f}s "
+                f"({mb / max(result.seconds, 1e-9):.1f} MB/s)"
+            )
+    elapsed = time.perf_counter() - start_time
+
+    converted = [r for r in results if r.error is None]
+    failed = [r for r in results if r.error is not None]
+    total_mb = sum(r.input_bytes for r in converted) / 1024**2
+    total_rows = sum(r.rows for r in converted)
+    summary = (
+        f"{len(converted)} arquivos, {total_rows:,} linhas, "
+        f"{total_mb:.1f} MB em {elapsed:.2f}s ({total_mb / max(elapsed, 1e-9):.1f} MB/s, "
+        f"{total_rows / max(elapsed, 1e-9):,.0f} linhas/s)"
+    )
+    if failed:
+        logger.error(
+            f"Conversão concluída com {len(failed)} falha(s): {summary}. Falharam: "
+            + ", ".join(os.path.basename(r.source) for r in failed)
+        )
+    else:
+        logger.success(f"Conversão concluída: {summary}")
+    return results
+
+
+def collect_sources(paths: List[str]) -> List[str]:
+    """
+    Expande diretórios em arquivos de formato reconhecido.
+
+    Args:
+        paths (List[str]): Arquivos e/ou diretórios.
+
+    Returns:
+        List[str]: Arquivos de entrada.
+    """
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                full_path = os.path.join(path, name)
+                try:
+                    detect_format(full_path)
+                except ValueError:
+                    continue
+                sources.append(full_path)
+        else:
+            sources.append(path)
+    return sources
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Converte arquivos entre CSV, Parquet, Arrow IPC e NDJSON."
+    )
+    parser.add_argument("inputs", nargs="+", help="Arquivos ou diretórios de entrada")
+    parser.add_argument("-o", "--output-dir", required=True)
+    parser.add_argument("-t", "--to", required=True, choices=FORMATS)
+    parser.add_argument("-c", "--compression", default="none")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument(
+        "--schema",
+        default="",
+        help="Tipos de colunas do CSV de entrada (ex: quantity:int64,price:float64)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        column_types = parse_column_types(args.schema)
+    except (ValueError, KeyError) as e:
+        parser.error(f"--schema inválido: {e}")
+
+    if args.compression not in CODECS[args.to]:
+        parser.error(
+            f"Compressão '{args.compression}' não suportada para {args.to}. "
+            f"Use uma de: {', '.join(CODECS[args.to])}"
+        )
+
+    missing = [path for path in args.inputs if not os.path.exists(path)]
+    if missing:
+        parser.error(f"Entradas inexistentes: {', '.join(missing)}")
+
+    sources = collect_sources(args.inputs)
+    if not sources:
+        parser.error("Nenhum arquivo de entrada reconhecido.")
+
+    results = convert_files(
+        sources,
+        args.output_dir,
+        args.to,
+        compression=args.compression,
+        row_group_size=args.row_group_size,
+        n_workers=args.workers,
+        column_types=column_types or None,
+    )
+    return 1 if any(r.error is not None for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
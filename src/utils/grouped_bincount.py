@@ -0,0 +1,181 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.shared_arrays import (
+    SharedArraySpec,
+    attach_shared_array,
+    release_shared_blocks,
+    share_array,
+)
+
+DEFAULT_CHUNK_SIZE = 2_000_000
+
+
+def encode_groups(keys: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Converte as chaves de grupo em códigos inteiros.
+
+    Colunas categóricas reaproveitam os códigos já existentes (sem hashing);
+    as demais são fatoradas uma única vez.
+
+    Args:
+        keys (pd.Series): Coluna de grupos.
+
+    Returns:
+        Tuple[np.ndarray, pd.Index]: Códigos (0..n_grupos-1, -1 para nulos) e
+        rótulos de cada código.
+    """
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy(), keys.cat.categories
+    codes, uniques = pd.factorize(keys, sort=True)
+    return codes, pd.Index(uniques)
+
+
+def bincount_states(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Calcula (count, mean, M2) por grupo com reduções ponderadas de np.bincount.
+
+    Códigos negativos (chaves nulas) são ignorados, como no groupby do pandas.
+
+    Args:
+        codes (np.ndarray): Códigos inteiros dos grupos.
+        values (np.ndarray): Valores numéricos.
+        n_groups (int): Quantidade de grupos.
+
+    Returns:
+        np.ndarray: Matriz (3, n_groups) com count, mean e M2.
+    """
+    valid = codes >= 0
+    if not valid.all():
+        codes, values = codes[valid], values[valid]
+
+    count = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    total = np.bincount(codes, weights=values, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / count, 0.0)
+    deviation = values - mean[codes]
+    m2 = np.bincount(codes, weights=deviation * deviation, minlength=n_groups)
+    return np.vstack([count, mean, m2])
+
+
+def _shared_bincount_states(
+    codes_spec: SharedArraySpec,
+    values_spec: SharedArraySpec,
+    start: int,
+    stop: int,
+    n_groups: int,
+) -> np.ndarray:
+    """
+    Executa bincount_states sobre um bloco de arrays em memória compartilhada.
+
+    Args:
+        codes_spec (SharedArraySpec): Descritor dos códigos.
+        values_spec (SharedArraySpec): Descritor dos valores.
+        start (int): Primeira linha do bloco.
+        stop (int): Linha final (exclusiva) do bloco.
+        n_groups (int): Quantidade de grupos.
+
+    Returns:
+        np.ndarray: Matriz (3, n_groups) com count, mean e M2 do bloco.
+    """
+    codes_shm, codes = attach_shared_array(codes_spec)
+    values_shm, values = attach_shared_array(values_spec)
+    try:
+        return bincount_states(codes[start:stop], values[start:stop], n_groups)
+    finally:
+        del codes, values
+        codes_shm.close()
+        values_shm.close()
+
+
+def combine_bincount_states(partials: np.ndarray) -> np.ndarray:
+    """
+    Combina estados (count, mean, M2) de vários blocos pela fórmula de Chan.
+
+    Args:
+        partials (np.ndarray): Array (k, 3, n_groups) com os estados de k blocos.
+
+    Returns:
+        np.ndarray: Matriz (3, n_groups) com o estado combinado.
+    """
+    counts, means, m2s = partials[:, 0], partials[:, 1], partials[:, 2]
+    count = counts.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, (counts * means).sum(axis=0) / count, 0.0)
+    m2 = m2s.sum(axis=0) + (counts * (means - mean) ** 2).sum(axis=0)
+    return np.vstack([count, mean, m2])
+
+
+def bincount_groupby(
+    keys: pd.Series,
+    values: pd.Series,
+    n_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ddof: int = 1,
+) -> pd.DataFrame:
+    """
+    Agrega sum, count, mean e std por grupo com np.bincount, em blocos paralelos.
+
+    Indicado para chaves de baixa cardinalidade: em vez de fazer hashing de
+    strings, cada bloco soma pesos por código inteiro e os estados dos blocos
+    são combinados pela fórmula de Chan.
+
+    Args:
+        keys (pd.Series): Coluna de grupos (idealmente categórica).
+        values (pd.Series): Coluna numérica a agregar.
+        n_workers (Optional[int]): Processos; 1 executa tudo no processo atual.
+        chunk_size (int): Linhas por bloco.
+        ddof (int): Graus de liberdade descontados no desvio (1, como o pandas).
+
+    Returns:
+        pd.DataFrame: Colunas sum, count, mean e std indexadas pelo grupo.
+    """
+    codes, labels = encode_groups(keys)
+    data = values.to_numpy(dtype=np.float64)
+    n_groups = len(labels)
+    bounds = [
+        (start, min(start + chunk_size, len(data)))
+        for start in range(0, len(data), chunk_size)
+    ]
+
+    if n_workers == 1 or len(bounds) <= 1:
+        partials = [bincount_states(codes[a:b], data[a:b], n_groups) for a, b in bounds]
+    else:
+        codes_shm, codes_view, codes_spec = share_array(codes)
+        values_shm, values_view, values_spec = share_array(data)
+        del codes_view, values_view
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                partials = list(
+                    executor.map(
+                        _shared_bincount_states,
+                        [codes_spec] * len(bounds),
+                        [values_spec] * len(bounds),
+                        *zip(*bounds),
+                        [n_groups] * len(bounds),
+                    )
+                )
+        finally:
+            release_shared_blocks([codes_shm, values_shm])
+
+    if partials:
+        count, mean, m2 = combine_bincount_states(np.stack(partials))
+    else:
+        count = mean = m2 = np.zeros(n_groups)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(m2 / np.where(count > ddof, count - ddof, np.nan))
+
+    result = pd.DataFrame(
+        {
+            "sum": mean * count,
+            "count": count.astype(np.int64),
+            "mean": mean,
+            "std": std,
+        },
+        index=pd.Index(labels, name=keys.name),
+    )
+    return result[result["count"] > 0]
@@ -1,3 +1,4 @@
+import inspect
 import os
 import time
 from functools import wraps
@@ -29,6 +30,9 @@ def log_execution(func):
     """
     Decorador para registrar logs de execução de uma função.
 
+    Funções async também são aceitas: o tempo e os erros são medidos enquanto
+    a corrotina roda, e não na chamada que apenas a cria.
+
     Args:
         func (callable): Função a ser decorada.
 
@@ -36,6 +40,27 @@ def log_execution(func):
         callable: Função decorada com logs.
     """
 
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            logger.info(f"Iniciando execução da função: {func.__name__}")
+            logger.debug(f"Parâmetros: args={args}, kwargs={kwargs}")
+            start_time = time.time()
+
+            try:
+                result = await func(*args, **kwargs)
+                elapsed_time = time.time() - start_time
+                logger.success(
+                    f"Função {func.__name__} executada com sucesso em {elapsed_time:.2f} segundos"
+                )
+                return result
+            except Exception as e:
+                logger.exception(f"Erro ao executar a função {func.__name__}: {e}")
+                raise
+
+        return async_wrapper
+
     @wraps(func)
     def wrapper(*args, **kwargs):
         logger.info(f"Iniciando execução da função: {func.__name__}")
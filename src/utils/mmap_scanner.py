@@ -0,0 +1,183 @@
+import mmap
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Bytes lidos por tarefa; cada faixa termina logo após uma quebra de linha
+DEFAULT_RANGE_BYTES = 64 * 1024 * 1024
+# Bytes convertidos para minúsculas de uma vez dentro de uma faixa
+WINDOW_BYTES = 8 * 1024 * 1024
+
+# A-Z -> a-z e \r -> \n em uma única passada: \r sozinho também encerra uma
+# linha na leitura em modo texto, e \r\n vira uma linha vazia extra que nunca
+# contém o padrão
+_LOWER_TABLE = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZ\r", b"abcdefghijklmnopqrstuvwxyz\n"
+)
+
+# Faixa de um arquivo: (caminho, início, fim) em bytes
+ByteRange = Tuple[str, int, int]
+
+
+def encode_pattern(pattern: str) -> bytes:
+    """
+    Converte o padrão para os bytes comparados pelo scanner.
+
+    A busca compara bytes ASCII em minúsculas, o que coincide com
+    `pattern in line.lower()` para padrões ASCII; "i" e "k" são a exceção
+    teórica, pois İ (U+0130) e K (U+212A) viram "i" e "k" em str.lower().
+
+    Args:
+        pattern (str): Texto procurado.
+
+    Returns:
+        bytes: Padrão em minúsculas.
+
+    Raises:
+        ValueError: Se o padrão for vazio, não ASCII ou tiver quebra de linha.
+    """
+    if not pattern or not pattern.isascii() or "\n" in pattern or "\r" in pattern:
+        raise ValueError(f"Padrão inválido para busca em bytes: {pattern!r}")
+    return pattern.lower().encode("ascii")
+
+
+def next_line_start(mm: mmap.mmap, offset: int) -> int:
+    """
+    Avança um offset até o início da próxima linha.
+
+    Args:
+        mm (mmap.mmap): Arquivo mapeado.
+        offset (int): Posição qualquer.
+
+    Returns:
+        int: Posição logo após o próximo \\n (ou o tamanho do arquivo).
+    """
+    if offset <= 0:
+        return 0
+    newline = mm.find(b"\n", offset - 1)
+    return len(mm) if newline == -1 else newline + 1
+
+
+def split_ranges(path: str, range_bytes: int = DEFAULT_RANGE_BYTES) -> List[ByteRange]:
+    """
+    Divide um arquivo em faixas de bytes alinhadas a quebras de linha.
+
+    Args:
+        path (str): Arquivo de log.
+        range_bytes (int): Tamanho aproximado de cada faixa.
+
+    Returns:
+        List[ByteRange]: Faixas contíguas que cobrem o arquivo inteiro.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            bounds = [0]
+            while bounds[-1] < size:
+                bounds.append(next_line_start(mm, bounds[-1] + range_bytes))
+    return [(path, start, end) for start, end in zip(bounds, bounds[1:])]
+
+
+def count_matching_lines(
+    byte_range: ByteRange, pattern: bytes, window_bytes: int = WINDOW_BYTES
+) -> int:
+    """
+    Conta as linhas de uma faixa que contêm o padrão (sem diferenciar caixa).
+
+    Nenhuma linha vira objeto Python: cada janela é convertida para
+    minúsculas com bytes.translate e o laço só itera sobre as ocorrências,
+    pulando para a próxima linha a cada linha contada.
+
+    Args:
+        byte_range (ByteRange): Arquivo e faixa a ler.
+        pattern (bytes): Saída de encode_pattern.
+        window_bytes (int): Bytes convertidos por vez.
+
+    Returns:
+        int: Linhas da faixa com ao menos uma ocorrência.
+    """
+    path, start, end = byte_range
+    count = 0
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            while start < end:
+                stop = min(end, next_line_start(mm, start + window_bytes))
+                window = mm[start:stop].translate(_LOWER_TABLE)
+                position = window.find(pattern)
+                while position != -1:
+                    count += 1
+                    newline = window.find(b"\n", position + len(pattern))
+                    if newline == -1:
+                        break
+                    position = window.find(pattern, newline + 1)
+                start = stop
+    return count
+
+
+def _count_range(args: Tuple[ByteRange, bytes]) -> Tuple[str, int, int]:
+    """
+    Adapta count_matching_lines para Pool.imap_unordered.
+
+    Args:
+        args (Tuple[ByteRange, bytes]): Faixa e padrão.
+
+    Returns:
+        Tuple[str, int, int]: Arquivo, bytes lidos e linhas encontradas.
+    """
+    byte_range, pattern = args
+    path, start, end = byte_range
+    return path, end - start, count_matching_lines(byte_range, pattern)
+
+
+def scan_files(
+    paths: Sequence[str],
+    pattern: str,
+    processes: Optional[int] = None,
+    range_bytes: int = DEFAULT_RANGE_BYTES,
+) -> Tuple[Dict[str, int], Dict[str, float]]:
+    """
+    Conta, em paralelo, as linhas de cada arquivo que contêm o padrão.
+
+    Cada arquivo é dividido em faixas de range_bytes, então um único log
+    grande também usa todos os processos. As maiores faixas são despachadas
+    primeiro. Caminhos repetidos (inclusive grafias diferentes do mesmo
+    arquivo) são lidos uma única vez, sob a primeira grafia.
+
+    Args:
+        paths (Sequence[str]): Arquivos de log.
+        pattern (str): Texto procurado (ASCII, sem diferenciar caixa).
+        processes (Optional[int]): Processos do pool (padrão: núcleos).
+        range_bytes (int): Tamanho aproximado de cada faixa.
+
+    Returns:
+        Tuple[Dict[str, int], Dict[str, float]]: Linhas encontradas por
+        arquivo e estatísticas (bytes, ranges, seconds, gb_per_second).
+    """
+    needle = encode_pattern(pattern)
+    start_time = time.time()
+    unique: Dict[str, str] = {}
+    for path in paths:
+        unique.setdefault(os.path.realpath(path), path)
+    paths = list(unique.values())
+    ranges = [r for path in paths for r in split_ranges(path, range_bytes)]
+    ranges.sort(key=lambda r: r[2] - r[1], reverse=True)
+
+    counts = {path: 0 for path in paths}
+    total_bytes = 0
+    with multiprocessing.Pool(processes) as pool:
+        tasks = [(byte_range, needle) for byte_range in ranges]
+        for path, n_bytes, count in pool.imap_unordered(_count_range, tasks):
+            counts[path] += count
+            total_bytes += n_bytes
+
+    elapsed = time.time() - start_time
+    stats = {
+        "bytes": total_bytes,
+        "ranges": len(ranges),
+        "seconds": elapsed,
+        "gb_per_second": total_bytes / 1e9 / elapsed if elapsed else 0.0,
+    }
+    return counts, stats
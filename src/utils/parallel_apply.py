@@ -0,0 +1,305 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.log_decorator import logger
+from utils.shared_arrays import (
+    SharedArraySpec,
+    attach_shared_array,
+    create_shared_array,
+    release_shared_blocks,
+)
+
+# Quantidade mínima de linhas para que uma partição extra compense o overhead
+MIN_ROWS_PER_PARTITION = 50_000
+
+# Partições por worker: mais de uma ajuda a equilibrar partições lentas
+PARTITIONS_PER_WORKER = 2
+
+
+def auto_partitions(
+    n_rows: int,
+    n_workers: int,
+    min_rows_per_partition: int = MIN_ROWS_PER_PARTITION,
+) -> int:
+    """
+    Define o número de partições a partir do número de linhas e de núcleos.
+
+    Args:
+        n_rows (int): Linhas do DataFrame.
+        n_workers (int): Processos disponíveis.
+        min_rows_per_partition (int): Tamanho mínimo de cada partição.
+
+    Returns:
+        int: Número de partições (pelo menos 1).
+    """
+    by_size = math.ceil(n_rows / max(min_rows_per_partition, 1))
+    return max(1, min(by_size, n_workers * PARTITIONS_PER_WORKER))
+
+
+def partition_bounds(n_rows: int, n_parts: int) -> List[Tuple[int, int]]:
+    """
+    Divide [0, n_rows) em n_parts intervalos contíguos de tamanhos parecidos.
+
+    Args:
+        n_rows (int): Linhas do DataFrame.
+        n_parts (int): Número de partições.
+
+    Returns:
+        List[Tuple[int, int]]: Pares (início, fim) de cada partição.
+    """
+    edges = np.linspace(0, n_rows, n_parts + 1, dtype=np.int64)
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(n_parts)]
+
+
+def is_shareable(series: pd.Series) -> bool:
+    """
+    Indica se a coluna pode trafegar por memória compartilhada (numérica ou bool).
+
+    Args:
+        series (pd.Series): Coluna do DataFrame.
+
+    Returns:
+        bool: True se a coluna tem dtype NumPy numérico ou booleano.
+    """
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf"
+
+
+def export_numeric_columns(
+    df: pd.DataFrame,
+) -> Tuple[Dict[str, SharedArraySpec], pd.DataFrame, list]:
+    """
+    Copia as colunas numéricas de um DataFrame para blocos compartilhados.
+
+    Os blocos são criados por quem chama e devem ser liberados pelo
+    destinatário após a leitura (release_shared_blocks).
+
+    Args:
+        df (pd.DataFrame): DataFrame de origem.
+
+    Returns:
+        Tuple[Dict[str, SharedArraySpec], pd.DataFrame, list]: Descritores das
+        colunas numéricas, DataFrame com as demais colunas (e o índice) e
+        blocos criados.
+    """
+    specs: Dict[str, SharedArraySpec] = {}
+    blocks = []
+    for column in df.columns:
+        if is_shareable(df[column]):
+            values = df[column].to_numpy()
+            shm, view, spec = create_shared_array(values.shape, values.dtype.str)
+            view[...] = values
+            del view
+            specs[column] = spec
+            blocks.append(shm)
+
+    others = df[[c for c in df.columns if c not in specs]]
+    return specs, others, blocks
+
+
+def import_columns(
+    specs: Dict[str, SharedArraySpec],
+    others: pd.DataFrame,
+    columns: list,
+    start: int = 0,
+    stop: Optional[int] = None,
+    unlink: bool = False,
+) -> pd.DataFrame:
+    """
+    Remonta um DataFrame a partir de colunas compartilhadas e das demais colunas.
+
+    Args:
+        specs (Dict[str, SharedArraySpec]): Descritores das colunas numéricas.
+        others (pd.DataFrame): Colunas não numéricas, já fatiadas, com o índice.
+        columns (list): Ordem original das colunas.
+        start (int): Primeira linha das colunas compartilhadas.
+        stop (Optional[int]): Linha final (exclusiva) das colunas compartilhadas.
+        unlink (bool): Se True, remove os blocos após a leitura (uso único).
+
+    Returns:
+        pd.DataFrame: DataFrame com cópia local dos dados; as colunas que não
+        vieram da memória compartilhada mantêm o dtype original (ex:
+        category, Int64, string).
+    """
+    shared = {}
+    for column, spec in specs.items():
+        shm, array = attach_shared_array(spec)
+        shared[column] = array[start:stop].copy()
+        del array
+        if unlink:
+            release_shared_blocks([shm])
+        else:
+            shm.close()
+    df = pd.concat([others, pd.DataFrame(shared, index=others.index)], axis=1)
+    return df[columns]
+
+
+def discard_columns(specs: Dict[str, SharedArraySpec]) -> None:
+    """
+    Remove blocos compartilhados que não serão lidos (ex: após uma falha).
+
+    Args:
+        specs (Dict[str, SharedArraySpec]): Descritores das colunas.
+    """
+    for spec in specs.values():
+        shm, array = attach_shared_array(spec)
+        del array
+        release_shared_blocks([shm])
+
+
+def _apply_partition(
+    func: Callable,
+    mode: str,
+    specs: Dict[str, SharedArraySpec],
+    others: pd.DataFrame,
+    columns: list,
+    start: int,
+    stop: int,
+) -> Tuple[Dict[str, SharedArraySpec], pd.DataFrame, list, Dict[str, float], bool]:
+    """
+    Executa a função em uma partição dentro do worker.
+
+    Args:
+        func (Callable): Função aplicada por partição ou por linha.
+        mode (str): "partition" ou "row".
+        specs (Dict[str, SharedArraySpec]): Colunas numéricas de entrada.
+        others (pd.DataFrame): Demais colunas da partição, com o índice.
+        columns (list): Ordem original das colunas.
+        start (int): Primeira linha da partição.
+        stop (int): Linha final (exclusiva) da partição.
+
+    Returns:
+        Tuple[Dict[str, SharedArraySpec], pd.DataFrame, list, Dict[str, float], bool]:
+        Colunas numéricas do resultado em memória compartilhada, demais
+        colunas, ordem das colunas, tempos de transporte e cômputo e se a
+        função devolveu uma Series.
+    """
+    transport_start = time.perf_counter()
+    df_part = import_columns(specs, others, columns, start, stop)
+    transport = time.perf_counter() - transport_start
+
+    compute_start = time.perf_counter()
+    if mode == "row":
+        result = df_part.apply(func, axis=1)
+    else:
+        result = func(df_part)
+    is_series = isinstance(result, pd.Series)
+    if is_series:
+        result = result.to_frame(name=result.name)
+    compute = time.perf_counter() - compute_start
+
+    transport_start = time.perf_counter()
+    out_specs, out_others, blocks = export_numeric_columns(result)
+    for shm in blocks:
+        shm.close()
+    transport += time.perf_counter() - transport_start
+
+    timings = {"transport": transport, "compute": compute}
+    return out_specs, out_others, list(result.columns), timings, is_series
+
+
+def parallel_apply(
+    df: pd.DataFrame,
+    func: Callable,
+    mode: str = "partition",
+    n_workers: Optional[int] = None,
+    n_partitions: Optional[int] = None,
+    min_rows_per_partition: int = MIN_ROWS_PER_PARTITION,
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Aplica uma função em paralelo sobre partições de um DataFrame.
+
+    As colunas numéricas trafegam por memória compartilhada nos dois sentidos;
+    só as demais colunas e o índice passam por pickle. Cada resultado é
+    posicionado pelo número da sua partição, sem necessidade de sort_index.
+
+    Args:
+        df (pd.DataFrame): DataFrame de entrada.
+        func (Callable): Função de nível de módulo. Em mode="partition" recebe
+            um DataFrame e devolve DataFrame ou Series; em mode="row" recebe
+            cada linha (pd.Series), como em DataFrame.apply(axis=1).
+        mode (str): "partition" ou "row".
+        n_workers (Optional[int]): Processos (padrão: núcleos disponíveis).
+        n_partitions (Optional[int]): Partições; se None, calculado
+            automaticamente a partir de linhas e núcleos.
+        min_rows_per_partition (int): Tamanho mínimo de partição no modo automático.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, float]]: Resultado na ordem original
+        (Series se func devolver Series) e tempos (staging, transport, compute, collect, total) em segundos.
+
+    Raises:
+        ValueError: Se o modo não for suportado.
+    """
+    if mode not in ("partition", "row"):
+        raise ValueError("Modo inválido. Use 'partition' ou 'row'.")
+
+    total_start = time.perf_counter()
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_partitions is None:
+        n_partitions = auto_partitions(len(df), n_workers, min_rows_per_partition)
+    bounds = partition_bounds(len(df), n_partitions)
+
+    staging_start = time.perf_counter()
+    specs, others, in_blocks = export_numeric_columns(df)
+    columns = list(df.columns)
+    staging = time.perf_counter() - staging_start
+
+    results: List[Optional[tuple]] = [None] * len(bounds)
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = {
+                executor.submit(
+                    _apply_partition,
+                    func,
+                    mode,
+                    specs,
+                    others.iloc[start:stop],
+                    columns,
+                    start,
+                    stop,
+                ): idx
+                for idx, (start, stop) in enumerate(bounds)
+            }
+            try:
+                for future, idx in futures.items():
+                    results[idx] = future.result()
+            except BaseException:
+                # As saídas das partições que concluíram nunca serão lidas;
+                # sem remover os blocos, ficariam em /dev/shm até o reboot
+                executor.shutdown(wait=True, cancel_futures=True)
+                for future in futures:
+                    if not future.cancelled() and future.exception() is None:
+                        discard_columns(future.result()[0])
+                raise
+    finally:
+        release_shared_blocks(in_blocks)
+
+    collect_start = time.perf_counter()
+    parts = []
+    for out_specs, out_others, out_columns, _, _ in results:
+        parts.append(import_columns(out_specs, out_others, out_columns, unlink=True))
+    df_result = pd.concat(parts) if parts else df.iloc[0:0]
+    if results and results[0][4]:
+        df_result = df_result.iloc[:, 0]
+    collect = time.perf_counter() - collect_start
+
+    timings = {
+        "staging": staging,
+        "transport": sum(r[3]["transport"] for r in results),
+        "compute": sum(r[3]["compute"] for r in results),
+        "collect": collect,
+        "total": time.perf_counter() - total_start,
+    }
+    logger.info(
+        f"⚙️  parallel_apply: {n_partitions} partições | staging "
+        f"{timings['staging']:.2f}s | transporte nos workers "
+        f"{timings['transport']:.2f}s | cômputo {timings['compute']:.2f}s | "
+        f"coleta {timings['collect']:.2f}s | total {timings['total']:.2f}s"
+    )
+    return df_result, timings
@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.log_decorator import logger
+
+# Tamanho alvo de cada arquivo compactado
+DEFAULT_TARGET_BYTES = 128 * 1024 * 1024
+
+
+class ParquetWriterSettings(NamedTuple):
+    """
+    Opções de escrita Parquet usadas pelas saídas da ETL.
+
+    Attributes:
+        compression (str): Codec ("zstd", "snappy", "gzip", "lz4" ou "none").
+        compression_level (Optional[int]): Nível do codec (None = padrão).
+        row_group_size (int): Linhas por row group; grupos grandes reduzem
+            metadados, e as estatísticas por grupo permitem pular dados.
+        use_dictionary (bool): Codificação por dicionário (boa para colunas
+            repetitivas, como datas e produtos).
+        write_statistics (bool): Grava min/max por row group.
+    """
+
+    compression: str = "zstd"
+    compression_level: Optional[int] = None
+    row_group_size: int = 1_000_000
+    use_dictionary: bool = True
+    write_statistics: bool = True
+
+    def writer_options(self) -> Dict[str, Any]:
+        """
+        Converte as opções em argumentos de pq.ParquetWriter.
+
+        Returns:
+            Dict[str, Any]: Argumentos nomeados do writer.
+        """
+        return {
+            "compression": self.compression,
+            "compression_level": self.compression_level,
+            "use_dictionary": self.use_dictionary,
+            "write_statistics": self.write_statistics,
+        }
+
+
+def write_parquet_atomic(
+    table: pa.Table,
+    path: str,
+    settings: ParquetWriterSettings = ParquetWriterSettings(),
+) -> str:
+    """
+    Grava uma tabela em Parquet com as opções dadas, de forma atômica.
+
+    O arquivo temporário tem sufixo único por processo e thread, então
+    escritas concorrentes do mesmo destino não colidem; se a escrita falhar,
+    ele é apagado antes de o erro ser propagado.
+
+    Args:
+        table (pa.Table): Dados a gravar.
+        path (str): Caminho final.
+        settings (ParquetWriterSettings): Opções do writer.
+
+    Returns:
+        str: Caminho final.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with pq.ParquetWriter(
+            tmp_path, table.schema, **settings.writer_options()
+        ) as writer:
+            writer.write_table(table, row_group_size=settings.row_group_size)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def column_min(path: str, column: str) -> Any:
+    """
+    Lê o menor valor de uma coluna a partir das estatísticas do arquivo.
+
+    Args:
+        path (str): Arquivo Parquet.
+        column (str): Coluna.
+
+    Returns:
+        Any: Menor valor, ou None se não houver estatísticas.
+    """
+    metadata = pq.ParquetFile(path).metadata
+    index = metadata.schema.to_arrow_schema().get_field_index(column)
+    minimums = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(index).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        minimums.append(stats.min)
+    return min(minimums) if minimums else None
+
+
+def plan_compaction(
+    paths: Sequence[str],
+    target_bytes: int = DEFAULT_TARGET_BYTES,
+    sort_by: Optional[str] = None,
+) -> List[List[str]]:
+    """
+    Agrupa arquivos pequenos em lotes de até target_bytes.
+
+    Com sort_by, os arquivos são ordenados pelo menor valor da coluna antes
+    do agrupamento, então cada arquivo compactado cobre uma faixa contínua
+    (ex: um intervalo de datas) e os filtros pulam arquivos inteiros.
+
+    Args:
+        paths (Sequence[str]): Arquivos Parquet pequenos.
+        target_bytes (int): Tamanho alvo de cada lote (bytes em disco).
+        sort_by (Optional[str]): Coluna de ordenação.
+
+    Returns:
+        List[List[str]]: Lotes de arquivos a juntar.
+    """
+    paths = list(paths)
+    if sort_by:
+        keys = {path: column_min(path, sort_by) for path in paths}
+        paths.sort(key=lambda path: (keys[path] is None, keys[path] or "", path))
+
+    batches, current, current_bytes = [], [], 0
+    for path in paths:
+        size = os.path.getsize(path)
+        if current and current_bytes + size > target_bytes:
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(path)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def compact_parquet_files(
+    paths: Sequence[str],
+    output_dir: str,
+    target_bytes: int = DEFAULT_TARGET_BYTES,
+    sort_by: Optional[str] = None,
+    settings: ParquetWriterSettings = ParquetWriterSettings(),
+    remove_sources: bool = False,
+) -> List[str]:
+    """
+    Junta muitos arquivos Parquet pequenos em poucos arquivos do tamanho alvo.
+
+    Cada lote é lido, ordenado por sort_by e gravado atomicamente com as
+    opções de settings. Como o tamanho alvo é medido nos arquivos de origem,
+    a saída pode ficar menor se o codec comprimir melhor.
+
+    Args:
+        paths (Sequence[str]): Arquivos a compactar.
+        output_dir (str): Diretório dos arquivos compactados.
+        target_bytes (int): Tamanho alvo de cada arquivo.
+        sort_by (Optional[str]): Coluna de ordenação (ex: "date").
+        settings (ParquetWriterSettings): Opções do writer.
+        remove_sources (bool): Apaga os arquivos de origem após a compactação.
+
+    Returns:
+        List[str]: Arquivos compactados, em ordem.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = []
+    for i, batch in enumerate(plan_compaction(paths, target_bytes, sort_by)):
+        table = pa.concat_tables(
+            [pq.read_table(path) for path in batch], promote_options="default"
+        )
+        if sort_by:
+            table = table.sort_by(sort_by)
+
+        path = os.path.join(output_dir, f"compacted-{i:05d}.parquet")
+        outputs.append(write_parquet_atomic(table, path, settings))
+        logger.info(
+            f"🗜️  {len(batch)} arquivos -> {path} "
+            f"({table.num_rows:,} linhas, {os.path.getsize(path) / 1024:.0f} KB)"
+        )
+
+    if remove_sources:
+        for path in paths:
+            os.remove(path)
+    return outputs
+
+
+def benchmark_scan(
+    paths: Sequence[str],
+    filter_expression: Optional[ds.Expression] = None,
+    repeats: int = 5,
+) -> Dict[str, float]:
+    """
+    Mede o tempo de leitura de um conjunto de arquivos Parquet.
+
+    Args:
+        paths (Sequence[str]): Arquivos do conjunto.
+        filter_expression (Optional[ds.Expression]): Filtro opcional
+            (ex: ds.field("date") >= "2024-06-01").
+        repeats (int): Repetições; vale o melhor tempo.
+
+    Returns:
+        Dict[str, float]: files, rows, bytes e seconds (melhor tempo).
+    """
+    best = float("inf")
+    rows = 0
+    for _ in range(repeats):
+        start_time = time.time()
+        table = ds.dataset(list(paths), format="parquet").to_table(
+            filter=filter_expression
+        )
+        best = min(best, time.time() - start_time)
+        rows = table.num_rows
+    return {
+        "files": len(paths),
+        "rows": rows,
+        "bytes": sum(os.path.getsize(path) for path in paths),
+        "seconds": best,
+    }
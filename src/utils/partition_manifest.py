@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.log_decorator import logger
+
+# Tamanho do bloco lido ao calcular o hash de um arquivo
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_hash(path: str, block_size: int = HASH_BLOCK_SIZE) -> str:
+    """
+    Calcula o hash BLAKE2b do conteúdo de um arquivo, lendo em blocos.
+
+    Args:
+        path (str): Caminho do arquivo.
+        block_size (int): Bytes lidos por vez.
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """
+    Captura tamanho, mtime e hash de um arquivo.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        Dict[str, Any]: Chaves size, mtime_ns e hash.
+    """
+    stat = os.stat(path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": file_hash(path),
+    }
+
+
+def write_json_atomic(data: Any, path: str) -> None:
+    """
+    Grava um JSON de forma atômica (arquivo temporário + os.replace).
+
+    Args:
+        data (Any): Conteúdo serializável.
+        path (str): Caminho final.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class PartitionManifest:
+    """
+    Manifesto de marca d'água para ETLs incrementais por partição.
+
+    Para cada arquivo de origem guarda a impressão digital (tamanho, mtime e
+    hash do conteúdo) vista no último processamento bem-sucedido, além do
+    caminho e da versão da saída gerada. Uma partição só precisa ser
+    reprocessada quando é nova, mudou de conteúdo, perdeu a saída ou foi
+    processada por outra versão da transformação.
+
+    O hash só é recalculado quando tamanho ou mtime mudam; assim, uma execução
+    sobre um datalake sem alterações custa apenas um os.stat por arquivo.
+    """
+
+    def __init__(self, path: str, transform_version: str = "1") -> None:
+        """
+        Args:
+            path (str): Caminho do arquivo JSON do manifesto.
+            transform_version (str): Versão da lógica de transformação; ao
+                mudar, todas as partições são reprocessadas.
+        """
+        self.path = path
+        self.transform_version = transform_version
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self.entries = json.load(file).get("partitions", {})
+
+    @staticmethod
+    def _key(source_path: str) -> str:
+        """
+        Normaliza o caminho usado como chave do manifesto.
+
+        Args:
+            source_path (str): Arquivo de origem.
+
+        Returns:
+            str: Chave normalizada.
+        """
+        return os.path.normpath(source_path)
+
+    def is_current(self, source_path: str) -> bool:
+        """
+        Verifica se a saída registrada para uma partição ainda é válida.
+
+        Quando apenas o mtime mudou e o hash continua igual (ex: arquivo
+        copiado ou "tocado"), a entrada é atualizada sem reprocessamento.
+
+        Args:
+            source_path (str): Arquivo de origem.
+
+        Returns:
+            bool: True se a partição pode ser pulada.
+        """
+        entry = self.entries.get(self._key(source_path))
+        if entry is None or entry.get("transform_version") != self.transform_version:
+            return False
+        if not os.path.exists(entry["output_path"]):
+            return False
+
+        stat = os.stat(source_path)
+        if stat.st_size == entry["size"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        if stat.st_size != entry["size"] or file_hash(source_path) != entry["hash"]:
+            return False
+
+        with self._lock:
+            entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    def plan(self, source_paths: Iterable[str]) -> List[str]:
+        """
+        Seleciona as partições novas ou alteradas.
+
+        Args:
+            source_paths (Iterable[str]): Arquivos de origem atuais.
+
+        Returns:
+            List[str]: Arquivos que precisam ser processados.
+        """
+        return [path for path in source_paths if not self.is_current(path)]
+
+    def record(
+        self,
+        source_path: str,
+        output_path: str,
+        fingerprint: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Registra o processamento bem-sucedido de uma partição.
+
+        A impressão digital deve ser capturada antes da leitura da origem:
+        se o arquivo mudar durante o processamento, a próxima execução
+        detecta a diferença e o reprocessa.
+
+        Args:
+            source_path (str): Arquivo de origem.
+            output_path (str): Saída gerada.
+            fingerprint (Optional[Dict[str, Any]]): Saída de file_fingerprint
+                (capturada agora se omitida).
+
+        Returns:
+            Dict[str, Any]: Entrada gravada no manifesto.
+        """
+        key = self._key(source_path)
+        entry = dict(fingerprint or file_fingerprint(source_path))
+        entry.update(
+            {
+                "output_path": output_path,
+                "transform_version": self.transform_version,
+                "processed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+        )
+        with self._lock:
+            previous = self.entries.get(key, {}).get("output_version", 0)
+            entry["output_version"] = previous + 1
+            self.entries[key] = entry
+        return entry
+
+    def prune(
+        self, source_paths: Iterable[str], remove_outputs: bool = True
+    ) -> List[str]:
+        """
+        Remove do manifesto as partições cuja origem não existe mais.
+
+        Args:
+            source_paths (Iterable[str]): Arquivos de origem atuais.
+            remove_outputs (bool): Apaga também as saídas dessas partições.
+
+        Returns:
+            List[str]: Origens removidas.
+        """
+        current = {self._key(path) for path in source_paths}
+        with self._lock:
+            removed = [key for key in self.entries if key not in current]
+            for key in removed:
+                entry = self.entries.pop(key)
+                if remove_outputs and os.path.exists(entry["output_path"]):
+                    os.remove(entry["output_path"])
+        for key in removed:
+            logger.info(f"🗑️  Partição removida da origem: {key}")
+        return removed
+
+    def save(self) -> None:
+        """
+        Grava o manifesto em disco de forma atômica.
+        """
+        with self._lock:
+            data = {
+                "transform_version": self.transform_version,
+                "partitions": self.entries,
+            }
+            write_json_atomic(data, self.path)
@@ -0,0 +1,214 @@
+import math
+import os
+import statistics
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from utils.log_decorator import logger
+
+# Uma tarefa é considerada lenta quando passa deste múltiplo da mediana
+SPECULATION_FACTOR = 2.0
+# Intervalo, em segundos, entre as verificações de tarefas lentas
+POLL_INTERVAL = 0.05
+
+
+def make_executor(kind: str, max_workers: int):
+    """
+    Cria o executor de threads ou de processos.
+
+    Threads bastam quando a tarefa libera o GIL (E/S, compressão); parse de
+    CSV e transformações em pandas costumam segurá-lo, e aí processos escalam
+    melhor.
+
+    Args:
+        kind (str): "thread" ou "process".
+        max_workers (int): Quantidade de workers.
+
+    Returns:
+        Executor: ThreadPoolExecutor ou ProcessPoolExecutor.
+
+    Raises:
+        ValueError: Se kind não for reconhecido.
+    """
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Executor desconhecido: {kind} (use 'thread' ou 'process')")
+
+
+def plan_tasks(
+    tasks: List[Hashable],
+    weight: Callable[[Any], float],
+    max_workers: int,
+    split: Optional[Callable[[Any, int], List[Any]]] = None,
+    max_task_weight: Optional[float] = None,
+) -> List[Tuple[float, Any]]:
+    """
+    Divide tarefas grandes demais e ordena todas da maior para a menor.
+
+    Sem divisão, o tempo total nunca fica abaixo do tempo da maior tarefa;
+    por padrão, qualquer tarefa acima da fatia justa (peso total / workers)
+    é quebrada em partes de até esse tamanho.
+
+    Args:
+        tasks (List[Hashable]): Tarefas originais.
+        weight (Callable[[Any], float]): Custo estimado de uma tarefa (ex: bytes).
+        max_workers (int): Quantidade de workers.
+        split (Optional[Callable[[Any, int], List[Any]]]): Divide uma tarefa
+            em n partes; None desativa a divisão.
+        max_task_weight (Optional[float]): Peso máximo por tarefa.
+
+    Returns:
+        List[Tuple[float, Any]]: Pares (peso, tarefa), do maior para o menor.
+    """
+    weighted = [(weight(task), task) for task in tasks]
+    if split is not None and weighted:
+        total = sum(w for w, _ in weighted)
+        limit = max_task_weight or total / max_workers
+        planned = []
+        for task_weight, task in weighted:
+            if limit > 0 and task_weight > limit:
+                parts = split(task, math.ceil(task_weight / limit))
+                planned.extend((weight(part), part) for part in parts)
+            else:
+                planned.append((task_weight, task))
+        weighted = planned
+    return sorted(weighted, key=lambda item: item[0], reverse=True)
+
+
+def run_scheduled(
+    func: Callable[[Any], Any],
+    tasks: List[Hashable],
+    kind: str = "process",
+    max_workers: Optional[int] = None,
+    weight: Callable[[Any], float] = os.path.getsize,
+    split: Optional[Callable[[Any, int], List[Any]]] = None,
+    max_task_weight: Optional[float] = None,
+    speculate: bool = True,
+    speculation_factor: float = SPECULATION_FACTOR,
+) -> Tuple[Dict[Any, Any], Dict[str, Any]]:
+    """
+    Executa func sobre as tarefas com escalonamento "maior primeiro".
+
+    Apenas max_workers tarefas ficam submetidas por vez, então a ordem de
+    despacho é respeitada e o instante da submissão aproxima o início real.
+    Depois que a fila esvazia, uma tarefa em execução há mais de
+    speculation_factor × a mediana das concluídas ganha uma cópia
+    especulativa em um worker ocioso; vale o resultado que terminar
+    primeiro. func precisa ser idempotente (ex: gravar a saída de forma
+    atômica), pois as duas cópias podem chegar ao fim; a função só retorna
+    depois que as cópias perdedoras em execução terminam.
+
+    Args:
+        func (Callable[[Any], Any]): Função aplicada a cada tarefa.
+        tasks (List[Hashable]): Tarefas (ex: caminhos de arquivos).
+        kind (str): "thread" ou "process".
+        max_workers (Optional[int]): Workers (padrão: núcleos disponíveis).
+        weight (Callable[[Any], float]): Custo estimado de uma tarefa.
+        split (Optional[Callable[[Any, int], List[Any]]]): Divide tarefas grandes.
+        max_task_weight (Optional[float]): Peso máximo antes de dividir.
+        speculate (bool): Ativa a reexecução especulativa de tarefas lentas.
+        speculation_factor (float): Múltiplo da mediana que define "lenta".
+
+    Returns:
+        Tuple[Dict[Any, Any], Dict[str, Any]]: Resultado por tarefa executada
+        (já divididas) e estatísticas do escalonamento.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    queue = plan_tasks(tasks, weight, max_workers, split, max_task_weight)
+    pending = [task for _, task in queue]
+    stats = {
+        "tasks": len(pending),
+        "split": len(pending) - len(tasks),
+        "total_weight": sum(w for w, _ in queue),
+        "speculative": 0,
+        "speculative_wins": 0,
+        "failed": 0,
+    }
+
+    results: Dict[Any, Any] = {}
+    running: Dict[Future, Tuple[Any, float, bool]] = {}
+    durations: List[float] = []
+    speculated = set()
+    start_time = time.time()
+
+    executor = make_executor(kind, max_workers)
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                task = pending.pop(0)
+                running[executor.submit(func, task)] = (task, time.time(), False)
+
+            done, _ = wait(running, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                task, started, is_copy = running.pop(future)
+                if task in results:
+                    continue  # a outra cópia já terminou
+                try:
+                    results[task] = future.result()
+                except Exception as e:
+                    if any(t == task for t, _, _ in running.values()):
+                        continue  # a outra cópia ainda pode concluir
+                    stats["failed"] += 1
+                    logger.error(f"Erro ao processar {task}: {e}")
+                    results[task] = None
+                    continue
+                durations.append(time.time() - started)
+                stats["speculative_wins"] += is_copy
+                # A cópia perdedora deixa de ser acompanhada; se já estiver
+                # rodando, o shutdown abaixo espera por ela, então nenhuma
+                # cópia continua gravando depois que run_scheduled retorna
+                for other, (other_task, _, _) in list(running.items()):
+                    if other_task == task:
+                        other.cancel()
+                        running.pop(other)
+
+            # Reexecuta tarefas lentas quando sobram workers ociosos
+            if speculate and not pending and durations:
+                threshold = speculation_factor * statistics.median(durations)
+                now = time.time()
+                for task, started, _ in list(running.values()):
+                    if len(running) >= max_workers:
+                        break
+                    if task not in speculated and now - started > threshold:
+                        speculated.add(task)
+                        stats["speculative"] += 1
+                        logger.warning(f"🐢 Reexecutando tarefa lenta: {task}")
+                        future = executor.submit(func, task)
+                        running[future] = (task, time.time(), True)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    stats["elapsed"] = time.time() - start_time
+    return results, stats
+
+
+def log_schedule_stats(
+    stats: Dict[str, Any], max_workers: Optional[int] = None
+) -> None:
+    """
+    Registra as estatísticas de run_scheduled.
+
+    Args:
+        stats (Dict[str, Any]): Estatísticas devolvidas por run_scheduled.
+        max_workers (Optional[int]): Workers usados (padrão: núcleos disponíveis).
+    """
+    workers = max_workers or os.cpu_count() or 1
+    mb = stats["total_weight"] / 1024**2
+    logger.info(
+        f"📦 {stats['tasks']} tarefas ({stats['split']} vindas de divisões), "
+        f"{mb:.1f} MB em {stats['elapsed']:.2f}s "
+        f"({mb / stats['elapsed']:.1f} MB/s, {workers} workers)"
+    )
+    logger.info(
+        f"🐢 Especulativas: {stats['speculative']} "
+        f"(venceram {stats['speculative_wins']}), falhas: {stats['failed']}"
+    )
@@ -0,0 +1,168 @@
+from functools import reduce
+from typing import Iterable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# Colunas do estado parcial por grupo
+GROUP_STATE_COLUMNS = ("count", "sum", "mean", "m2", "min", "max")
+
+
+class Moments(NamedTuple):
+    """
+    Estado parcial combinável para média e variância (algoritmo de Chan/Welford).
+
+    Attributes:
+        count (int): Quantidade de elementos.
+        mean (float): Média dos elementos.
+        m2 (float): Soma dos quadrados dos desvios em relação à média.
+    """
+
+    count: int
+    mean: float
+    m2: float
+
+
+def chunk_moments(values: np.ndarray) -> Moments:
+    """
+    Calcula o estado parcial (count, mean, M2) de um bloco de valores.
+
+    Os acumuladores são sempre float64, mesmo para entradas float32.
+
+    Args:
+        values (np.ndarray): Bloco de valores.
+
+    Returns:
+        Moments: Estado parcial do bloco.
+    """
+    count = values.size
+    if count == 0:
+        return Moments(0, 0.0, 0.0)
+
+    mean = float(values.mean(dtype=np.float64))
+    deviations = values.astype(np.float64, copy=False) - mean
+    return Moments(count, mean, float(np.dot(deviations, deviations)))
+
+
+def merge_moments(left: Moments, right: Moments) -> Moments:
+    """
+    Combina dois estados parciais com a fórmula paralela de Chan et al.
+
+    Args:
+        left (Moments): Primeiro estado.
+        right (Moments): Segundo estado.
+
+    Returns:
+        Moments: Estado equivalente ao dos dois blocos concatenados.
+    """
+    if left.count == 0:
+        return right
+    if right.count == 0:
+        return left
+
+    count = left.count + right.count
+    delta = right.mean - left.mean
+    mean = left.mean + delta * right.count / count
+    m2 = left.m2 + right.m2 + delta * delta * left.count * right.count / count
+    return Moments(count, mean, m2)
+
+
+def combine_moments(partials: Iterable[Moments]) -> Moments:
+    """
+    Combina uma sequência de estados parciais.
+
+    Args:
+        partials (Iterable[Moments]): Estados parciais de cada bloco.
+
+    Returns:
+        Moments: Estado combinado.
+    """
+    return reduce(merge_moments, partials, Moments(0, 0.0, 0.0))
+
+
+def moments_std(moments: Moments, ddof: int = 0) -> float:
+    """
+    Calcula o desvio padrão a partir de um estado combinado.
+
+    Args:
+        moments (Moments): Estado combinado.
+        ddof (int): Graus de liberdade descontados (0 = populacional, como np.std).
+
+    Returns:
+        float: Desvio padrão, ou NaN se não houver elementos suficientes.
+    """
+    if moments.count - ddof <= 0:
+        return float("nan")
+    return float(np.sqrt(moments.m2 / (moments.count - ddof)))
+
+
+def partial_group_states(
+    df: pd.DataFrame, group_col: str, value_col: str
+) -> pd.DataFrame:
+    """
+    Calcula, por grupo, o estado parcial combinável de uma partição.
+
+    Args:
+        df (pd.DataFrame): Partição dos dados.
+        group_col (str): Coluna de agrupamento.
+        value_col (str): Coluna de valores.
+
+    Returns:
+        pd.DataFrame: Colunas count, sum, mean, m2, min e max indexadas pelo grupo.
+    """
+    states = df.groupby(group_col, observed=True)[value_col].agg(
+        ["count", "sum", "mean", "var", "min", "max"]
+    )
+    states["m2"] = (states["var"] * (states["count"] - 1)).fillna(0.0)
+    return states[list(GROUP_STATE_COLUMNS)]
+
+
+def combine_group_states(partials: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combina estados parciais por grupo com a forma generalizada de Chan.
+
+    Para k partições: n = Σnᵢ, média = Σsomaᵢ / n e
+    M2 = ΣM2ᵢ + Σnᵢ(médiaᵢ - média)², o que é exato mesmo quando as
+    partições têm quantidades diferentes de linhas por grupo.
+
+    Args:
+        partials (Iterable[pd.DataFrame]): Saídas de partial_group_states.
+
+    Returns:
+        pd.DataFrame: Estado combinado por grupo (mesmas colunas).
+    """
+    stacked = pd.concat(list(partials))
+    stacked = stacked[stacked["count"] > 0]
+    grouped = stacked.groupby(level=0, observed=True)
+
+    combined = grouped[["count", "sum"]].sum()
+    combined["mean"] = combined["sum"] / combined["count"]
+    deviation = (
+        stacked["mean"].to_numpy() - combined["mean"].reindex(stacked.index).to_numpy()
+    )
+    between = (stacked["count"] * deviation * deviation).groupby(level=0).sum()
+    combined["m2"] = grouped["m2"].sum() + between
+    combined["min"] = grouped["min"].min()
+    combined["max"] = grouped["max"].max()
+    return combined[list(GROUP_STATE_COLUMNS)]
+
+
+def finalize_group_states(states: pd.DataFrame, ddof: int = 1) -> pd.DataFrame:
+    """
+    Converte estados combinados em sum, mean e std (como groupby().agg).
+
+    Args:
+        states (pd.DataFrame): Estado combinado por grupo.
+        ddof (int): Graus de liberdade descontados no desvio (1, como o pandas).
+
+    Returns:
+        pd.DataFrame: Colunas sum, mean e std indexadas pelo grupo.
+    """
+    denominator = (states["count"] - ddof).where(states["count"] > ddof)
+    return pd.DataFrame(
+        {
+            "sum": states["sum"],
+            "mean": states["mean"],
+            "std": np.sqrt(states["m2"] / denominator),
+        }
+    )
@@ -0,0 +1,116 @@
+import sys
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows não possui o módulo resource
+    resource = None
+
+
+class SharedArraySpec(NamedTuple):
+    """
+    Descritor de um array em memória compartilhada.
+
+    É o único objeto que precisa atravessar a fronteira entre processos: o
+    worker usa o nome do bloco, o formato e o dtype para remontar o array sem
+    copiar os dados.
+    """
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def create_shared_array(
+    shape: Tuple[int, ...], dtype: str = "float64"
+) -> Tuple[shared_memory.SharedMemory, np.ndarray, SharedArraySpec]:
+    """
+    Aloca um array vazio em um bloco de memória compartilhada.
+
+    Args:
+        shape (Tuple[int, ...]): Formato do array.
+        dtype (str): Tipo dos elementos.
+
+    Returns:
+        Tuple[shared_memory.SharedMemory, np.ndarray, SharedArraySpec]: Bloco
+        alocado, visão NumPy sobre ele e descritor para os workers.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return shm, array, SharedArraySpec(shm.name, tuple(shape), dtype.str)
+
+
+def share_array(
+    source: np.ndarray,
+) -> Tuple[shared_memory.SharedMemory, np.ndarray, SharedArraySpec]:
+    """
+    Copia um array existente para a memória compartilhada.
+
+    Args:
+        source (np.ndarray): Array de origem.
+
+    Returns:
+        Tuple[shared_memory.SharedMemory, np.ndarray, SharedArraySpec]: Bloco
+        alocado, visão NumPy com a cópia e descritor para os workers.
+    """
+    shm, array, spec = create_shared_array(source.shape, source.dtype.str)
+    array[...] = source
+    return shm, array, spec
+
+
+def attach_shared_array(
+    spec: SharedArraySpec,
+) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Remonta, em outro processo, um array a partir do seu descritor.
+
+    O bloco devolvido precisa ser mantido vivo enquanto o array for usado e
+    fechado (close, não unlink) ao final.
+
+    Args:
+        spec (SharedArraySpec): Descritor do array compartilhado.
+
+    Returns:
+        Tuple[shared_memory.SharedMemory, np.ndarray]: Bloco anexado e array.
+    """
+    shm = shared_memory.SharedMemory(name=spec.name)
+    array = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+    return shm, array
+
+
+def release_shared_blocks(blocks: List[shared_memory.SharedMemory]) -> None:
+    """
+    Fecha e remove os blocos de memória compartilhada criados pelo processo dono.
+
+    Args:
+        blocks (List[shared_memory.SharedMemory]): Blocos a liberar.
+    """
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
+
+
+def peak_rss_mb(children: bool = False) -> float:
+    """
+    Retorna o pico de memória residente (RSS) em MB.
+
+    Args:
+        children (bool): Se True, mede o maior pico entre os processos filhos
+            já finalizados em vez do processo atual.
+
+    Returns:
+        float: Pico de RSS em MB, ou 0.0 se a plataforma não expõe a métrica.
+    """
+    if resource is None:
+        return 0.0
+
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    max_rss = resource.getrusage(who).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return max_rss / divisor
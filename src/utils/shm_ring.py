@@ -0,0 +1,242 @@
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Registro padrão: produtor, sequência, valor e instante (32 bytes alinhados)
+RECORD_DTYPE = np.dtype(
+    [
+        ("producer", "<u4"),
+        ("seq", "<u8"),
+        ("value", "<f8"),
+        ("timestamp", "<f8"),
+    ],
+    align=True,
+)
+
+# Cabeçalho em palavras de 8 bytes: head, tail e fechado ficam em linhas de
+# cache diferentes (64 bytes) para o produtor e os consumidores não disputarem
+# a mesma linha
+_HEAD, _TAIL, _CLOSED = 0, 8, 16
+_HEADER_WORDS = 24
+
+
+class RingSpec(NamedTuple):
+    """
+    Descritor de um ShmRingChannel, enviado aos processos consumidores.
+
+    Attributes:
+        name (str): Nome do bloco de memória compartilhada.
+        capacity (int): Quantidade de registros no anel.
+        dtype (np.dtype): Formato fixo de cada registro.
+        lock (Any): Lock entre processos que protege os contadores.
+    """
+
+    name: str
+    capacity: int
+    dtype: np.dtype
+    lock: Any
+
+
+def _backoff(attempt: int) -> None:
+    """
+    Espera crescente enquanto o anel está cheio ou vazio.
+
+    As primeiras tentativas só cedem a CPU; depois a espera dobra até ~1 ms.
+
+    Args:
+        attempt (int): Tentativas já feitas.
+    """
+    if attempt < 16:
+        time.sleep(0)
+    else:
+        time.sleep(1e-5 * 2 ** min(attempt - 16, 7))
+
+
+class ShmRingChannel:
+    """
+    Canal de um produtor e vários consumidores sobre um anel em memória
+    compartilhada.
+
+    Os registros têm largura fixa (um dtype estruturado do NumPy), então nada
+    é serializado: o produtor copia os bytes para o slot head % capacity e os
+    consumidores copiam de tail % capacity. head só é escrito pelo produtor e
+    tail só avança sob o lock; o lock cobre apenas a publicação de head e a
+    cópia feita pelo consumidor, e get_many/put_many o amortizam sobre lotes
+    inteiros. O lock também funciona como barreira de memória entre os
+    processos, o que garante que um consumidor nunca veja head antes dos
+    dados do slot.
+
+    O produtor chama close() ao terminar; get() e get_many() devolvem None
+    quando o canal está fechado e vazio.
+    """
+
+    def __init__(
+        self, spec: RingSpec, shm: shared_memory.SharedMemory, owner: bool
+    ) -> None:
+        """
+        Args:
+            spec (RingSpec): Descritor do canal.
+            shm (shared_memory.SharedMemory): Bloco com cabeçalho e slots.
+            owner (bool): True no processo que criou (e libera) o bloco.
+        """
+        self.spec = spec
+        self.capacity = spec.capacity
+        self.lock = spec.lock
+        self.owner = owner
+        self.waits = 0
+        self._shm = shm
+        self._header = np.ndarray((_HEADER_WORDS,), dtype="<u8", buffer=shm.buf)
+        self._slots = np.ndarray(
+            (spec.capacity,),
+            dtype=spec.dtype,
+            buffer=shm.buf,
+            offset=_HEADER_WORDS * 8,
+        )
+
+    @classmethod
+    def create(
+        cls, capacity: int = 65_536, dtype: np.dtype = RECORD_DTYPE
+    ) -> "ShmRingChannel":
+        """
+        Aloca um canal novo; o processo que o cria é o produtor.
+
+        Args:
+            capacity (int): Registros no anel.
+            dtype (np.dtype): Formato fixo de cada registro.
+
+        Returns:
+            ShmRingChannel: Canal pronto para uso.
+        """
+        dtype = np.dtype(dtype)
+        size = _HEADER_WORDS * 8 + capacity * dtype.itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        np.ndarray((_HEADER_WORDS,), dtype="<u8", buffer=shm.buf)[:] = 0
+        return cls(RingSpec(shm.name, capacity, dtype, mp.Lock()), shm, owner=True)
+
+    @classmethod
+    def attach(cls, spec: RingSpec) -> "ShmRingChannel":
+        """
+        Remonta, em outro processo, um canal a partir do seu descritor.
+
+        Args:
+            spec (RingSpec): Descritor recebido do produtor.
+
+        Returns:
+            ShmRingChannel: Canal anexado.
+        """
+        return cls(spec, shared_memory.SharedMemory(name=spec.name), owner=False)
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: Registros publicados e ainda não consumidos.
+        """
+        return int(self._header[_HEAD]) - int(self._header[_TAIL])
+
+    def _reserve(self, wanted: int) -> Tuple[int, int]:
+        """
+        Espera espaço livre no anel para o produtor.
+
+        Args:
+            wanted (int): Registros que o produtor quer escrever.
+
+        Returns:
+            Tuple[int, int]: head atual e quantos registros cabem (>= 1).
+        """
+        head = int(self._header[_HEAD])
+        attempt = 0
+        while True:
+            # tail lido sem lock: um valor atrasado só faz o produtor esperar
+            free = self.capacity - (head - int(self._header[_TAIL]))
+            if free > 0:
+                return head, min(free, wanted)
+            self.waits += 1
+            _backoff(attempt)
+            attempt += 1
+
+    def put(self, record: Tuple) -> None:
+        """
+        Publica um registro, esperando se o anel estiver cheio.
+
+        Args:
+            record (Tuple): Valores dos campos, na ordem do dtype.
+        """
+        head, _ = self._reserve(1)
+        self._slots[head % self.capacity] = record
+        with self.lock:
+            self._header[_HEAD] = head + 1
+
+    def put_many(self, records: np.ndarray) -> None:
+        """
+        Publica um array de registros em lotes contíguos.
+
+        Args:
+            records (np.ndarray): Registros com o dtype do canal.
+        """
+        written = 0
+        while written < len(records):
+            head, count = self._reserve(len(records) - written)
+            start = head % self.capacity
+            count = min(count, self.capacity - start)  # sem dar a volta no anel
+            self._slots[start : start + count] = records[written : written + count]
+            with self.lock:
+                self._header[_HEAD] = head + count
+            written += count
+
+    def get_many(self, max_items: int = 4096) -> Optional[np.ndarray]:
+        """
+        Retira até max_items registros, esperando se o anel estiver vazio.
+
+        Args:
+            max_items (int): Máximo de registros retirados de uma vez.
+
+        Returns:
+            Optional[np.ndarray]: Cópia dos registros, ou None se o canal foi
+            fechado e não há mais nada a ler.
+        """
+        attempt = 0
+        while True:
+            with self.lock:
+                tail = int(self._header[_TAIL])
+                available = int(self._header[_HEAD]) - tail
+                if available > 0:
+                    start = tail % self.capacity
+                    count = min(available, max_items, self.capacity - start)
+                    records = self._slots[start : start + count].copy()
+                    self._header[_TAIL] = tail + count
+                    return records
+                if self._header[_CLOSED]:
+                    return None
+            self.waits += 1
+            _backoff(attempt)
+            attempt += 1
+
+    def get(self) -> Optional[Tuple]:
+        """
+        Retira um registro, esperando se o anel estiver vazio.
+
+        Returns:
+            Optional[Tuple]: Valores do registro, ou None se o canal foi
+            fechado e não há mais nada a ler.
+        """
+        records = self.get_many(1)
+        return None if records is None else records[0].item()
+
+    def close(self) -> None:
+        """
+        Sinaliza o fim da produção aos consumidores.
+        """
+        with self.lock:
+            self._header[_CLOSED] = 1
+
+    def release(self) -> None:
+        """
+        Desanexa o bloco; no processo dono, também o remove.
+        """
+        del self._header, self._slots
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
@@ -0,0 +1,142 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from utils.log_decorator import logger
+
+
+class SQLiteReadPool:
+    """
+    Pool de conexões SQLite somente leitura, com uma conexão fixa por thread.
+
+    Cada thread abre sua conexão na primeira consulta e a reaproveita nas
+    seguintes, evitando o custo de sqlite3.connect a cada chamada. Um semáforo
+    limita quantas threads consultam ao mesmo tempo; as esperas nesse limite
+    são contabilizadas nas estatísticas do pool.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_concurrency: int = 8,
+        mmap_size: int = 256 * 1024 * 1024,
+        cached_statements: int = 256,
+    ) -> None:
+        """
+        Args:
+            db_path (str): Caminho do arquivo do banco SQLite.
+            max_concurrency (int): Máximo de threads consultando simultaneamente.
+            mmap_size (int): Bytes mapeados em memória por conexão (PRAGMA mmap_size).
+            cached_statements (int): Tamanho do cache de prepared statements.
+        """
+        self.uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+
+        self._local = threading.local()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._stats = {
+            "opened": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+        }
+
+    def _open(self) -> sqlite3.Connection:
+        """
+        Abre uma nova conexão somente leitura já configurada.
+
+        check_same_thread=False apenas permite que close() feche todas as
+        conexões a partir da thread principal; cada conexão continua sendo
+        usada somente pela thread dona dela.
+
+        Returns:
+            sqlite3.Connection: Conexão aberta.
+        """
+        conn = sqlite3.connect(
+            self.uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA query_only = ON")
+
+        with self._lock:
+            self._reap()
+            self._connections.append((threading.current_thread(), conn))
+            self._stats["opened"] += 1
+        return conn
+
+    def _reap(self) -> None:
+        """
+        Fecha as conexões de threads que já terminaram (chamar com _lock).
+        """
+        alive = []
+        for owner, owned_conn in self._connections:
+            if owner.is_alive():
+                alive.append((owner, owned_conn))
+            else:
+                owned_conn.close()
+        self._connections = alive
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Entrega a conexão da thread atual, abrindo-a na primeira utilização.
+
+        Yields:
+            sqlite3.Connection: Conexão somente leitura da thread atual.
+        """
+        if not self._slots.acquire(blocking=False):
+            start_wait = time.perf_counter()
+            self._slots.acquire()
+            with self._lock:
+                self._stats["waits"] += 1
+                self._stats["wait_time"] += time.perf_counter() - start_wait
+
+        try:
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._open()
+                self._local.conn = conn
+
+            with self._lock:
+                self._stats["checkouts"] += 1
+            yield conn
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retorna as estatísticas de uso do pool.
+
+        Returns:
+            Dict[str, float]: Conexões abertas (só de threads vivas),
+            reaproveitamentos e esperas.
+        """
+        with self._lock:
+            self._reap()
+            stats = dict(self._stats)
+            stats["open_connections"] = len(self._connections)
+        stats["reuses"] = stats["checkouts"] - stats["opened"]
+        return stats
+
+    def close(self) -> None:
+        """
+        Fecha todas as conexões abertas pelo pool.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+
+        for _, conn in connections:
+            conn.close()
+
+        # Conexões presas em thread-locals de threads vivas ficam inválidas
+        self._local = threading.local()
+        logger.info(f"🔒 Pool SQLite fechado ({len(connections)} conexões)")
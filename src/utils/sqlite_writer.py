@@ -0,0 +1,315 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.log_decorator import logger
+
+# Uma submissão: comando, linhas e o futuro confirmado após o COMMIT
+Submission = Tuple[str, Sequence[Sequence[Any]], Future]
+
+
+class SQLiteBatchWriter:
+    """
+    Escritor SQLite com uma única thread dona da conexão.
+
+    Corrotinas e threads apenas enfileiram (comando, linhas); a thread
+    escritora junta o que estiver na fila, até max_batch_rows linhas, em uma
+    só transação e confirma cada submissão depois do COMMIT. Como só existe
+    uma conexão de escrita, não há disputa pelo lock do banco ("database is
+    locked"), e o modo WAL deixa leitores (ex: SQLiteReadPool) consultarem
+    enquanto ela grava.
+
+    Se uma transação agrupada falhar, ela é desfeita e cada submissão é
+    repetida na sua própria transação, então o erro chega só a quem enviou a
+    linha problemática. Submissões canceladas antes do início da transação
+    (ex: write() interrompido por asyncio.wait_for) são descartadas; se a
+    thread escritora falhar de forma inesperada, todas as submissões
+    pendentes e futuras recebem o erro em vez de ficarem esperando.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        setup_script: Optional[str] = None,
+        max_batch_rows: int = 100_000,
+        max_linger: float = 0.005,
+        synchronous: str = "NORMAL",
+        busy_timeout_ms: int = 30_000,
+    ) -> None:
+        """
+        Args:
+            db_path (str): Caminho do arquivo do banco SQLite.
+            setup_script (Optional[str]): SQL executado ao abrir (ex: CREATE TABLE).
+            max_batch_rows (int): Linhas máximas por transação.
+            max_linger (float): Segundos que a thread espera por mais
+                submissões antes de gravar uma transação pequena.
+            synchronous (str): PRAGMA synchronous (NORMAL é seguro com WAL).
+            busy_timeout_ms (int): Espera por locks de outros processos.
+        """
+        self.db_path = db_path
+        self.setup_script = setup_script
+        self.max_batch_rows = max_batch_rows
+        self.max_linger = max_linger
+        self.synchronous = synchronous
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._queue: "queue.Queue[Optional[Submission]]" = queue.Queue()
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._state_lock = threading.Lock()
+        self._in_flight: List[Submission] = []
+        self._stats = {
+            "submissions": 0,
+            "rows": 0,
+            "transactions": 0,
+            "failed": 0,
+            "write_time": 0.0,
+        }
+        self._thread = threading.Thread(
+            target=self._run, name="sqlite-writer", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _open(self) -> sqlite3.Connection:
+        """
+        Abre a conexão de escrita (na thread escritora) já configurada.
+
+        Returns:
+            sqlite3.Connection: Conexão em autocommit; as transações são
+            abertas explicitamente com BEGIN.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if self.setup_script:
+            conn.executescript(self.setup_script)
+        return conn
+
+    def submit(self, sql: str, rows: Sequence[Sequence[Any]]) -> Future:
+        """
+        Enfileira linhas para gravação; pode ser chamado de qualquer thread.
+
+        Args:
+            sql (str): Comando com parâmetros (ex: INSERT ... VALUES (?, ?)).
+            rows (Sequence[Sequence[Any]]): Linhas a gravar.
+
+        Returns:
+            Future: Resolvido com a quantidade de linhas após o COMMIT.
+
+        Raises:
+            RuntimeError: Se o escritor já foi fechado ou a thread falhou.
+        """
+        future: Future = Future()
+        with self._state_lock:
+            if self._error is not None:
+                raise RuntimeError(
+                    "Thread do SQLiteBatchWriter falhou"
+                ) from self._error
+            if self._closed:
+                raise RuntimeError("SQLiteBatchWriter já foi fechado")
+            self._queue.put((sql, rows, future))
+        return future
+
+    async def write(self, sql: str, rows: Sequence[Sequence[Any]]) -> int:
+        """
+        Versão assíncrona de submit: aguarda a confirmação sem bloquear o loop.
+
+        Args:
+            sql (str): Comando com parâmetros.
+            rows (Sequence[Sequence[Any]]): Linhas a gravar.
+
+        Returns:
+            int: Linhas gravadas.
+        """
+        return await asyncio.wrap_future(self.submit(sql, rows))
+
+    def _collect(self, first: Submission) -> Tuple[List[Submission], bool]:
+        """
+        Junta submissões pendentes à primeira até o limite de linhas.
+
+        Args:
+            first (Submission): Submissão que acordou a thread.
+
+        Returns:
+            Tuple[List[Submission], bool]: Lote e se o fechamento foi pedido.
+        """
+        # Guardado no objeto para _run rejeitar o lote se algo falhar
+        batch = self._in_flight = [first]
+        n_rows = len(first[1])
+        deadline = time.monotonic() + self.max_linger
+        while n_rows < self.max_batch_rows:
+            try:
+                timeout = deadline - time.monotonic()
+                item = (
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            n_rows += len(item[1])
+        return batch, False
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Submission]) -> None:
+        """
+        Grava um lote de submissões em uma única transação.
+
+        Submissões seguidas com o mesmo comando viram um só executemany.
+
+        Args:
+            conn (sqlite3.Connection): Conexão de escrita.
+            batch (List[Submission]): Submissões a gravar.
+        """
+        conn.execute("BEGIN")
+        try:
+            i = 0
+            while i < len(batch):
+                sql = batch[i][0]
+                rows: List[Sequence[Any]] = []
+                while i < len(batch) and batch[i][0] == sql:
+                    rows.extend(batch[i][1])
+                    i += 1
+                conn.executemany(sql, rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._stats["transactions"] += 1
+
+    def _write(self, conn: sqlite3.Connection, batch: List[Submission]) -> None:
+        """
+        Grava um lote e confirma (ou rejeita) o futuro de cada submissão.
+
+        Args:
+            conn (sqlite3.Connection): Conexão de escrita.
+            batch (List[Submission]): Submissões a gravar.
+        """
+        # Submissões canceladas enquanto esperavam ficam de fora; as aceitas
+        # passam a "em execução" e não podem mais ser canceladas
+        batch = [s for s in batch if s[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        start_time = time.perf_counter()
+        try:
+            self._commit(conn, batch)
+            done = [(submission, None) for submission in batch]
+        except sqlite3.Error:
+            # Isola a submissão problemática repetindo uma a uma
+            done = []
+            for submission in batch:
+                try:
+                    self._commit(conn, [submission])
+                    done.append((submission, None))
+                except sqlite3.Error as e:
+                    done.append((submission, e))
+        self._stats["write_time"] += time.perf_counter() - start_time
+
+        for (_, rows, future), error in done:
+            self._stats["submissions"] += 1
+            if future.done():
+                continue
+            if error is None:
+                self._stats["rows"] += len(rows)
+                future.set_result(len(rows))
+            else:
+                self._stats["failed"] += 1
+                future.set_exception(error)
+
+    def _run(self) -> None:
+        """
+        Laço da thread escritora: abre a conexão e grava até o fechamento.
+        """
+        try:
+            conn = self._open()
+        except BaseException as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        try:
+            closing = False
+            while not closing:
+                first = self._queue.get()
+                if first is None:
+                    break
+                batch, closing = self._collect(first)
+                self._write(conn, batch)
+                self._in_flight = []
+        except BaseException as e:
+            logger.error(f"❌ Thread do escritor SQLite falhou: {e}")
+            self._fail_pending(self._in_flight, e)
+        finally:
+            conn.close()
+
+    def _fail_pending(self, batch: List[Submission], error: BaseException) -> None:
+        """
+        Rejeita o lote em andamento e tudo o que estiver na fila.
+
+        Depois disso submit() passa a levantar erro, então nenhuma submissão
+        fica esperando uma thread que não existe mais.
+
+        Args:
+            batch (List[Submission]): Lote que estava sendo gravado.
+            error (BaseException): Erro que encerrou a thread.
+        """
+        with self._state_lock:
+            self._error = error
+            pending = list(batch)
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    pending.append(item)
+        for _, _, future in pending:
+            if not future.done() and (
+                future.running() or future.set_running_or_notify_cancel()
+            ):
+                future.set_exception(error)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retorna as estatísticas de escrita.
+
+        Returns:
+            Dict[str, float]: Submissões, linhas, transações, falhas e tempo.
+        """
+        stats = dict(self._stats)
+        stats["rows_per_transaction"] = stats["rows"] / max(1, stats["transactions"])
+        return stats
+
+    def close(self) -> None:
+        """
+        Grava o que estiver pendente, encerra a thread e fecha a conexão.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        stats = self.stats()
+        logger.info(
+            f"🔒 Escritor SQLite fechado: {stats['rows']:,} linhas em "
+            f"{stats['transactions']:,} transações "
+            f"({stats['rows_per_transaction']:,.0f} linhas/transação)"
+        )
+
+    def __enter__(self) -> "SQLiteBatchWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
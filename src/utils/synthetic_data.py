@@ -0,0 +1,268 @@
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.log_decorator import logger
+from utils.shared_arrays import (
+    SharedArraySpec,
+    attach_shared_array,
+    create_shared_array,
+    release_shared_blocks,
+)
+
+# Linhas por stream aleatório: define a reprodutibilidade, não o paralelismo
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def group_categories(n_groups: int) -> List[str]:
+    """
+    Retorna os rótulos dos grupos ("A", "B", ...).
+
+    Args:
+        n_groups (int): Quantidade de grupos (de 1 a 26).
+
+    Returns:
+        List[str]: Rótulos dos grupos.
+
+    Raises:
+        ValueError: Se n_groups estiver fora de 1..26.
+    """
+    if not 1 <= n_groups <= len(string.ascii_uppercase):
+        raise ValueError(
+            f"n_groups deve estar entre 1 e {len(string.ascii_uppercase)}; recebido {n_groups}"
+        )
+    return list(string.ascii_uppercase[:n_groups])
+
+
+def chunk_streams(
+    seed: int, n_rows: int, chunk_size: int
+) -> List[np.random.SeedSequence]:
+    """
+    Cria um SeedSequence independente para cada bloco de chunk_size linhas.
+
+    Como o bloco i sempre usa o i-ésimo filho de SeedSequence(seed), os dados
+    gerados não dependem de quantos workers participam.
+
+    Args:
+        seed (int): Semente raiz.
+        n_rows (int): Total de linhas.
+        chunk_size (int): Linhas por bloco.
+
+    Returns:
+        List[np.random.SeedSequence]: Uma sequência por bloco.
+    """
+    n_chunks = -(-n_rows // chunk_size)
+    return np.random.SeedSequence(seed).spawn(n_chunks)
+
+
+def generate_chunk(stream: np.random.SeedSequence, n_rows: int, n_groups: int) -> tuple:
+    """
+    Gera os códigos de grupo e os valores de um bloco.
+
+    Args:
+        stream (np.random.SeedSequence): Stream do bloco.
+        n_rows (int): Linhas do bloco.
+        n_groups (int): Quantidade de grupos.
+
+    Returns:
+        tuple: Códigos (int8) e valores (float64 em [0, 100)).
+    """
+    rng = np.random.default_rng(stream)
+    codes = rng.integers(0, n_groups, size=n_rows, dtype=np.int8)
+    values = rng.random(n_rows) * 100
+    return codes, values
+
+
+def _fill_shared_chunk(
+    codes_spec: SharedArraySpec,
+    values_spec: SharedArraySpec,
+    stream: np.random.SeedSequence,
+    start: int,
+    stop: int,
+    n_groups: int,
+) -> None:
+    """
+    Gera um bloco direto nos arrays compartilhados de saída.
+
+    Args:
+        codes_spec (SharedArraySpec): Descritor do array de códigos.
+        values_spec (SharedArraySpec): Descritor do array de valores.
+        stream (np.random.SeedSequence): Stream do bloco.
+        start (int): Primeira linha do bloco.
+        stop (int): Linha final (exclusiva) do bloco.
+        n_groups (int): Quantidade de grupos.
+    """
+    codes_shm, codes = attach_shared_array(codes_spec)
+    values_shm, values = attach_shared_array(values_spec)
+    try:
+        codes[start:stop], values[start:stop] = generate_chunk(
+            stream, stop - start, n_groups
+        )
+    finally:
+        del codes, values
+        codes_shm.close()
+        values_shm.close()
+
+
+def generate_synthetic_data(
+    n_rows: int = 10_000_000,
+    n_groups: int = 5,
+    seed: int = 42,
+    n_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Gera um DataFrame sintético (group, value) em blocos paralelos.
+
+    Cada bloco usa um stream filho de SeedSequence(seed).spawn, e os workers
+    escrevem direto em memória compartilhada; o resultado é idêntico para
+    qualquer n_workers. A coluna group é categórica.
+
+    Args:
+        n_rows (int): Número de linhas do DataFrame.
+        n_groups (int): Quantidade de grupos.
+        seed (int): Semente raiz.
+        n_workers (Optional[int]): Processos; 1 gera tudo no processo atual.
+        chunk_size (int): Linhas por stream aleatório.
+
+    Returns:
+        pd.DataFrame: DataFrame com colunas de grupo e valores numéricos.
+    """
+    streams = chunk_streams(seed, n_rows, chunk_size)
+    bounds = [
+        (i * chunk_size, min((i + 1) * chunk_size, n_rows)) for i in range(len(streams))
+    ]
+
+    if n_workers == 1 or len(streams) <= 1:
+        parts = [
+            generate_chunk(stream, stop - start, n_groups)
+            for stream, (start, stop) in zip(streams, bounds)
+        ]
+        codes = np.concatenate([p[0] for p in parts]) if parts else np.empty(0, np.int8)
+        values = np.concatenate([p[1] for p in parts]) if parts else np.empty(0)
+    else:
+        codes_shm, codes_view, codes_spec = create_shared_array((n_rows,), "int8")
+        values_shm, values_view, values_spec = create_shared_array((n_rows,))
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                list(
+                    executor.map(
+                        _fill_shared_chunk,
+                        [codes_spec] * len(streams),
+                        [values_spec] * len(streams),
+                        streams,
+                        *zip(*bounds),
+                        [n_groups] * len(streams),
+                    )
+                )
+            codes, values = codes_view.copy(), values_view.copy()
+        finally:
+            del codes_view, values_view
+            release_shared_blocks([codes_shm, values_shm])
+
+    groups = pd.Categorical.from_codes(codes, categories=group_categories(n_groups))
+    return pd.DataFrame({"group": groups, "value": values})
+
+
+def _write_partition(
+    path: str,
+    streams: List[np.random.SeedSequence],
+    start: int,
+    stop: int,
+    chunk_size: int,
+    n_groups: int,
+) -> int:
+    """
+    Gera os blocos de uma partição e grava um arquivo Parquet.
+
+    Cada bloco vira um row group, então a memória do worker fica limitada a
+    chunk_size linhas.
+
+    Args:
+        path (str): Arquivo Parquet da partição.
+        streams (List[np.random.SeedSequence]): Streams dos blocos da partição.
+        start (int): Primeira linha global da partição.
+        stop (int): Linha global final (exclusiva) da partição.
+        chunk_size (int): Linhas por bloco.
+        n_groups (int): Quantidade de grupos.
+
+    Returns:
+        int: Linhas gravadas.
+    """
+    categories = pa.array(group_categories(n_groups))
+    schema = pa.schema(
+        [("group", pa.dictionary(pa.int8(), pa.string())), ("value", pa.float64())]
+    )
+    tmp_path = path + ".tmp"
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for stream, chunk_start in zip(streams, range(start, stop, chunk_size)):
+            codes, values = generate_chunk(
+                stream, min(chunk_start + chunk_size, stop) - chunk_start, n_groups
+            )
+            groups = pa.DictionaryArray.from_arrays(pa.array(codes), categories)
+            writer.write_table(
+                pa.table({"group": groups, "value": values}, schema=schema)
+            )
+    os.replace(tmp_path, path)
+    return stop - start
+
+
+def write_synthetic_partitions(
+    output_dir: str,
+    n_rows: int = 1_000_000_000,
+    rows_per_partition: int = 10_000_000,
+    n_groups: int = 5,
+    seed: int = 42,
+    n_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[str]:
+    """
+    Gera um conjunto sintético grande (até bilhões de linhas) em partições Parquet.
+
+    Os dados nunca ficam inteiros na memória: cada worker gera e grava uma
+    partição por vez. Os streams são os mesmos de generate_synthetic_data,
+    então as partições concatenadas reproduzem o mesmo conjunto.
+
+    Args:
+        output_dir (str): Diretório das partições.
+        n_rows (int): Total de linhas.
+        rows_per_partition (int): Linhas por arquivo (arredondado para múltiplo
+            de chunk_size).
+        n_groups (int): Quantidade de grupos.
+        seed (int): Semente raiz.
+        n_workers (Optional[int]): Processos (padrão: núcleos disponíveis).
+        chunk_size (int): Linhas por stream aleatório.
+
+    Returns:
+        List[str]: Caminhos das partições, em ordem.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    streams = chunk_streams(seed, n_rows, chunk_size)
+    chunks_per_partition = max(1, rows_per_partition // chunk_size)
+    rows_per_partition = chunks_per_partition * chunk_size
+
+    tasks = []
+    for i, first_chunk in enumerate(range(0, len(streams), chunks_per_partition)):
+        start = first_chunk * chunk_size
+        stop = min(start + rows_per_partition, n_rows)
+        path = os.path.join(output_dir, f"part-{i:05d}.parquet")
+        partition_streams = streams[first_chunk : first_chunk + chunks_per_partition]
+        tasks.append((path, partition_streams, start, stop))
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(
+                _write_partition, path, part_streams, start, stop, chunk_size, n_groups
+            )
+            for path, part_streams, start, stop in tasks
+        ]
+        total = sum(future.result() for future in futures)
+
+    logger.info(f"🧪 {total:,} linhas sintéticas gravadas em {len(tasks)} partições")
+    return [task[0] for task in tasks]